@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# Harnais multi-processus du reload partagé (ConfigManager.reload_on_change(shared=True)).
+# Lance N workers sur une arborescence synthétique : un seul devient leader, les autres
+# suivent par socket Unix. Le processus parent modifie des config.yml de service et
+# mesure, pour chaque worker, le délai de propagation et le nombre de parsings YAML
+# effectués localement (0 attendu chez les followers). Avec --failover, le leader est
+# arrêté en cours de route et un follower doit prendre le relais.
+#
+# Usage :
+#   python benchmarks/broadcast.py --workers 8 --changes 5 [--failover] [--output report.json]
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import multiprocessing as mp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import synthetic  # noqa: E402
+
+MARKER = 'broadcast_marker'
+
+
+def worker(config_dir: str, events, commands) -> None:
+    """Processus worker : suit les changements et rapporte chaque génération reçue."""
+    sys.path.insert(0, ROOT)
+    from src.core.config_manager import ConfigCache, ConfigManager
+
+    ConfigManager.set_config_dir(config_dir)
+    ConfigManager.snapshot()
+    baseline = ConfigCache.stats()['parses']
+
+    def changed(event):
+        snapshot = ConfigManager.snapshot()
+        service = event.services[0] if event.services else None
+        value = snapshot.get(f"{service}.{MARKER}") if service else None
+        events.put({'pid': os.getpid(), 'role': watch.role, 'generation': snapshot.generation,
+                    'value': value, 'received': time.time(),
+                    'parses': ConfigCache.stats()['parses'] - baseline})
+
+    watch = ConfigManager.reload_on_change(changed, debounce=0.05, shared=True)
+    events.put({'pid': os.getpid(), 'role': watch.role, 'ready': True})
+    commands.get()
+    watch.stop(timeout=2)
+
+
+def wait_roles(events, count: int, timeout: float):
+    """Attend que les workers soient démarrés ; retourne pid -> rôle initial."""
+    ready = {}
+    deadline = time.time() + timeout
+    while len(ready) < count and time.time() < deadline:
+        try:
+            message = events.get(timeout=0.5)
+        except Exception:
+            continue
+        if message.get('ready'):
+            ready[message['pid']] = message['role']
+    return ready
+
+
+def collect(events, expected: int, value: int, timeout: float):
+    """Attend `expected` accusés portant `value` ; retourne les accusés reçus."""
+    received = {}
+    deadline = time.time() + timeout
+    while len(received) < expected and time.time() < deadline:
+        try:
+            message = events.get(timeout=0.2)
+        except Exception:
+            continue
+        if message.get('value') == value:
+            received[message['pid']] = message
+    return list(received.values())
+
+
+def run(workers: int, changes: int, failover: bool, spec: synthetic.TreeSpec,
+        timeout: float = 10.0):
+    """
+    Exécute le scénario et retourne le rapport.
+    Args:
+        workers (int): Nombre de processus.
+        changes (int): Nombre de modifications successives.
+        failover (bool): Arrêter le leader après la première moitié des modifications.
+        spec (TreeSpec): Dimensions de l'arborescence synthétique.
+        timeout (float): Attente maximale d'une propagation (secondes).
+    Returns:
+        dict: Rapport (latences, parsings par rôle, propagations manquées).
+    """
+    from src.core.config_manager import ConfigManager
+    from src.utils import serialization
+
+    workdir = tempfile.mkdtemp(prefix='memapp-bcast-')
+    config_dir = synthetic.generate(os.path.join(workdir, 'config'), spec)
+    ConfigManager.set_config_dir(config_dir)
+    ConfigManager.update_full_config()
+    ctx = mp.get_context('spawn')
+    events = ctx.Queue()
+    procs = []
+    for _ in range(workers):
+        commands = ctx.Queue()
+        proc = ctx.Process(target=worker, args=(config_dir, events, commands), daemon=True)
+        proc.start()
+        procs.append((proc, commands))
+    rows = []
+    missed = 0
+    try:
+        roles = wait_roles(events, workers, timeout * 3)
+        time.sleep(1.0)  # les followers se connectent au leader
+        service = spec.service_names()[0]
+        path = os.path.join(config_dir, service, 'config.yml')
+        alive = workers
+        for i in range(changes):
+            if failover and i == changes // 2:
+                leader = next((pid for pid, role in roles.items() if role == 'leader'), None)
+                for proc, commands in procs:
+                    if proc.pid == leader:
+                        commands.put('stop')
+                        proc.join(5)
+                        alive -= 1
+                time.sleep(1.5)  # un follower reprend le verrou
+            tree = serialization.load_file(path)
+            tree[service][MARKER] = i
+            start = time.time()
+            serialization.dump_file(tree, path)
+            acks = collect(events, alive, i, timeout)
+            missed += alive - len(acks)
+            for ack in acks:
+                rows.append({'change': i, 'role': ack['role'], 'latency_s': ack['received'] - start,
+                             'parses': ack['parses'], 'generation': ack['generation']})
+    finally:
+        for proc, commands in procs:
+            if proc.is_alive():
+                commands.put('stop')
+        for proc, _ in procs:
+            proc.join(5)
+            if proc.is_alive():
+                proc.terminate()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    def summary(role):
+        selected = [r for r in rows if r['role'] == role]
+        latencies = sorted(r['latency_s'] for r in selected)
+        return {
+            'acks': len(selected),
+            'latency_median_s': statistics.median(latencies) if latencies else None,
+            'latency_max_s': latencies[-1] if latencies else None,
+            'max_parses': max((r['parses'] for r in selected), default=None),
+        }
+
+    return {
+        'workers': workers,
+        'changes': changes,
+        'failover': failover,
+        'roles': sorted(r['role'] for r in rows if r['change'] == 0),
+        'missed': missed,
+        'leader': summary('leader'),
+        'follower': summary('follower'),
+        'generations_consistent': all(
+            len({r['generation'] for r in rows if r['change'] == i}) <= 1 for i in range(changes)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Harnais multi-processus du reload partagé")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--changes', type=int, default=4)
+    parser.add_argument('--services', type=int, default=20)
+    parser.add_argument('--failover', action='store_true', help='Arrêter le leader à mi-parcours')
+    parser.add_argument('--output', help='Fichier JSON de sortie (stdout par défaut)')
+    args = parser.parse_args(argv)
+
+    report = run(args.workers, args.changes, args.failover,
+                 synthetic.TreeSpec(services=args.services))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    ok = (report['missed'] == 0 and report['generations_consistent']
+          and report['roles'].count('leader') == 1)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+# Suite de benchmarks des sous-systèmes configuration et événements.
+# Génère une arborescence synthétique (voir synthetic.py) dans un répertoire
+# temporaire, mesure chaque cas (meilleur/médiane sur plusieurs tours) et
+# écrit un rapport JSON. En mode comparaison, échoue (code 1) si un cas est plus
+# lent que la référence au-delà du seuil.
+#
+# Usage :
+#   python benchmarks/config_bench.py --output baseline.json
+#   python benchmarks/config_bench.py --compare baseline.json [--threshold 0.15]
+#   python benchmarks/config_bench.py --services 100 --depth 2 --filter get_config
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import synthetic  # noqa: E402
+from src.core.config_manager import (ConfigCache, ConfigManager, ConfigMerge,  # noqa: E402
+                                     ConfigValidation)
+from src.core.config_manager import merkle  # noqa: E402
+from src.core.event_manager import EventJournal, EventManager  # noqa: E402
+from src.utils import serialization  # noqa: E402
+from src.utils.frozen import FrozenDict, freeze  # noqa: E402
+
+FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.15
+
+
+class Case:
+    """
+    Cas mesuré : `fn` est appelée `number` fois par tour. `prepare`, si fourni,
+    est exécuté avant chaque appel, hors chronométrage.
+    """
+    def __init__(self, name: str, fn: Callable[[], object],
+                 prepare: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.fn = fn
+        self.prepare = prepare
+
+    def _round(self, number: int) -> float:
+        fn, prepare = self.fn, self.prepare
+        if prepare is None:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            return time.perf_counter() - start
+        total = 0.0
+        for _ in range(number):
+            prepare()
+            start = time.perf_counter()
+            fn()
+            total += time.perf_counter() - start
+        return total
+
+    def run(self, rounds: int, min_time: float) -> Dict[str, float]:
+        """
+        Calibre le nombre d'appels par tour pour atteindre `min_time`, puis mesure.
+        Returns:
+            dict: Temps par appel (secondes) et débit.
+        """
+        number = 1
+        while True:
+            elapsed = self._round(number)
+            if elapsed >= min_time or number >= 1 << 20:
+                break
+            number *= 10 if elapsed < min_time / 10 else 2
+        samples = [self._round(number) / number for _ in range(rounds)]
+        median = statistics.median(samples)
+        return {
+            'median_s': median,
+            'best_s': min(samples),
+            'mean_s': statistics.fmean(samples),
+            'stdev_s': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            'ops_per_sec': 1.0 / median if median else float('inf'),
+            'rounds': rounds,
+            'number': number,
+        }
+
+
+def build_cases(spec: synthetic.TreeSpec, workdir: Optional[str] = None) -> List[Case]:
+    """Cas de la suite, sur l'arborescence déjà installée via ConfigManager.set_config_dir()."""
+    names = spec.service_names()
+    first = names[0]
+    ConfigManager.update_full_config()
+
+    tree_a = synthetic.service_tree(spec, 0)[first]
+    second = min(1, spec.services - 1)
+    tree_b = synthetic.service_tree(spec, second)[names[second]]
+    frozen_a, frozen_b = freeze(tree_a), freeze(tree_b)
+    sources = [freeze(synthetic.service_tree(spec, i)) for i in range(spec.services)]
+    merged = ConfigMerge.merge_many(sources)
+    # Génération suivante : une seule clé modifiée, le reste partagé
+    section = FrozenDict(merged[first]['section0'], key0='bench-changed')
+    changed = FrozenDict(merged, **{first: FrozenDict(merged[first], section0=section)})
+    merkle.digest(merged)
+    schema = ConfigValidation.compile_tree_schema(synthetic.service_schema(spec, 0))
+    document = synthetic.service_tree(spec, 0)
+
+    def cold_merge():
+        ConfigCache.invalidate()
+        ConfigMerge.engine.reset()
+
+    toggle = {'value': 0}
+
+    def set_arg():
+        toggle['value'] ^= 1
+        return ConfigManager.set_service_config_arg(first, first, 'bench_toggle', toggle['value'])
+
+    events = EventManager()
+    sink = []
+    for i in range(8):
+        events.subscribe(f"bench.{i}.changed", sink.append)
+    events.subscribe('bench.*.changed', lambda data: None)
+    events.subscribe('bench.#', lambda data: None)
+
+    def publish():
+        events.publish('bench.3.changed', 1)
+        sink.clear()
+
+    # Même publication, journalisée (group commit et fsync hors du chemin de publication)
+    journal_dir = os.path.join(workdir or tempfile.mkdtemp(), 'journal')
+    journaled = EventManager(journal=EventJournal(journal_dir))
+    journaled.router = events.router
+
+    def publish_journaled():
+        journaled.publish('bench.3.changed', 1)
+        sink.clear()
+
+    return [
+        Case('get_config.full', lambda: ConfigManager.get_config()),
+        Case('get_config.section', lambda: ConfigManager.get_config(section=first)),
+        Case('get_config.keys', lambda: ConfigManager.get_config(
+            keys=[f"{first}.section0.key0", 'section1'])),
+        Case('get_config.multi_sections',
+             lambda: ConfigManager.get_config(multi_sections=names[:3])),
+        Case('get_config.service_keys', lambda: ConfigManager.get_config(
+            service=first, section=first, keys=['section0', 'section1'])),
+        Case('merge_configs.warm', ConfigManager.merge_configs),
+        Case('merge_configs.cold', ConfigManager.merge_configs, prepare=cold_merge),
+        Case('deep_merge_dicts', lambda: ConfigMerge.deep_merge_dicts(tree_a, tree_b)),
+        Case('deep_merge_dicts.frozen', lambda: ConfigMerge.deep_merge_dicts(frozen_a, frozen_b)),
+        Case('merge_many.services', lambda: ConfigMerge.merge_many(sources)),
+        Case('merkle.diff.one_key', lambda: merkle.diff(merged, changed)),
+        Case('update_full_config.unchanged', ConfigManager.update_full_config),
+        Case('update_full_config.one_file_changed', ConfigManager.update_full_config,
+             prepare=set_arg),
+        Case('set_service_config_arg', set_arg),
+        Case('validate_config', lambda: ConfigValidation.validate_config(document, schema)),
+        Case('event_manager.publish', publish),
+        Case('event_manager.publish.journal', publish_journaled),
+    ]
+
+
+def run_suite(spec: synthetic.TreeSpec, rounds: int = 5, min_time: float = 0.1,
+              only: Optional[str] = None, keep: bool = False) -> Dict[str, object]:
+    """
+    Génère l'arborescence, exécute les cas et retourne le rapport.
+    Args:
+        spec (TreeSpec): Dimensions de l'arborescence.
+        rounds (int): Tours mesurés par cas.
+        min_time (float): Durée minimale d'un tour (secondes).
+        only (str): Ne garder que les cas dont le nom contient cette chaîne.
+        keep (bool): Conserver le répertoire généré.
+    Returns:
+        dict: Rapport (métadonnées et résultats par cas).
+    """
+    workdir = tempfile.mkdtemp(prefix='memapp-bench-')
+    config_dir = synthetic.generate(os.path.join(workdir, 'config'), spec)
+    saved_env = {k: os.environ.get(k) for k in synthetic.environment(spec)}
+    os.environ.update(synthetic.environment(spec))
+    previous = ConfigManager.set_config_dir(config_dir)
+    results = {}
+    try:
+        for case in build_cases(spec, workdir):
+            if only and only not in case.name:
+                continue
+            results[case.name] = case.run(rounds, min_time)
+            median_us = results[case.name]['median_s'] * 1e6
+            print(f"{case.name:40s} {median_us:12.1f} us", file=sys.stderr)
+    finally:
+        ConfigManager.set_config_dir(previous)
+        for k, v in saved_env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+        if not keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        'format': FORMAT_VERSION,
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'serialization': serialization.backend_info(),
+            'spec': asdict(spec),
+            'rounds': rounds,
+            'min_time': min_time,
+            'workdir': workdir if keep else None,
+        },
+        'results': results,
+    }
+
+
+def compare(report: Dict[str, object], baseline: Dict[str, object],
+            threshold: float) -> List[Dict[str, object]]:
+    """
+    Compare les médianes à une référence.
+    Args:
+        report (dict): Rapport courant.
+        baseline (dict): Rapport de référence.
+        threshold (float): Ralentissement relatif toléré (0.15 = +15 %).
+    Returns:
+        list: Une ligne par cas commun (ratio, statut regression/improvement/ok).
+    """
+    rows = []
+    for name, current in report['results'].items():
+        ref = baseline.get('results', {}).get(name)
+        if not ref:
+            continue
+        ratio = current['median_s'] / ref['median_s'] if ref['median_s'] else float('inf')
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({'case': name, 'baseline_s': ref['median_s'], 'current_s': current['median_s'],
+                     'ratio': round(ratio, 3), 'status': status})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks configuration et événements")
+    for name, default in asdict(synthetic.TreeSpec()).items():
+        parser.add_argument('--' + name.replace('_', '-'), type=type(default), default=default)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.1, help='Durée minimale d\'un tour (s)')
+    parser.add_argument('--filter', dest='only', help='Sous-chaîne du nom des cas à exécuter')
+    parser.add_argument('--output', help='Fichier JSON de sortie (stdout par défaut)')
+    parser.add_argument('--compare', help='Rapport JSON de référence')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Ralentissement relatif toléré en mode comparaison')
+    parser.add_argument('--keep', action='store_true', help="Conserver l'arborescence générée")
+    args = parser.parse_args(argv)
+
+    spec = synthetic.TreeSpec(**{k: getattr(args, k) for k in asdict(synthetic.TreeSpec())})
+    report = run_suite(spec, args.rounds, args.min_time, args.only, args.keep)
+
+    status = 0
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('spec') != report['meta']['spec']:
+            print("warning: baseline was produced with a different tree spec", file=sys.stderr)
+        rows = compare(report, baseline, args.threshold)
+        report['comparison'] = {'baseline': args.compare, 'threshold': args.threshold,
+                                'cases': rows}
+        for row in rows:
+            print(f"{row['case']:40s} x{row['ratio']:<7} {row['status']}", file=sys.stderr)
+        if any(row['status'] == 'regression' for row in rows):
+            status = 1
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
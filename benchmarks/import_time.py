@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# Benchmark de non-régression du temps d'import à froid de src.core.
+# Mesure via `python -X importtime` dans un sous-processus neuf (meilleur de N essais),
+# vérifie qu'aucune dépendance lourde n'est importée eagerly et échoue (code 1)
+# si le budget est dépassé.
+#
+# Usage : python benchmarks/import_time.py [--budget-ms 150] [--runs 5] [--json]
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ['src.core.config_manager', 'src.core.event_manager', 'src.core.exceptions']
+
+# Dépendances qui ne doivent être chargées qu'à la première utilisation
+LAZY = ['cerberus', 'pydantic', 'rich', 'watchdog', 'dotenv', 'flask', 'asyncio']
+
+DEFAULT_BUDGET_MS = 150.0
+
+
+def measure_once(modules):
+    """
+    Importe les modules dans un interpréteur neuf.
+    Returns:
+        tuple: (temps cumulé en ms, modules paresseux chargés à tort)
+    """
+    code = (
+        "import sys\n"
+        + "".join(f"import {m}\n" for m in modules)
+        + f"print(','.join(m for m in {LAZY!r} if m in sys.modules))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = line.split('|')
+        name = parts[2]
+        # Seuls les imports de premier niveau : leur temps cumulé couvre les imports imbriqués
+        if name.startswith(' ') and not name.startswith('  '):
+            try:
+                total_us += int(parts[1].strip())
+            except ValueError:
+                continue
+    eager = [m for m in proc.stdout.strip().split(',') if m]
+    return total_us / 1000.0, eager
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Budget du temps d'import à froid de src.core")
+    parser.add_argument('--budget-ms', type=float,
+                        default=float(os.environ.get('MEMAPP_IMPORT_BUDGET_MS', DEFAULT_BUDGET_MS)))
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='Sortie JSON')
+    args = parser.parse_args(argv)
+
+    samples = []
+    eager = set()
+    for _ in range(args.runs):
+        ms, loaded = measure_once(MODULES)
+        samples.append(ms)
+        eager.update(loaded)
+    best = min(samples)
+    ok = best <= args.budget_ms and not eager
+    report = {
+        'modules': MODULES,
+        'best_ms': round(best, 2),
+        'samples_ms': [round(s, 2) for s in samples],
+        'budget_ms': args.budget_ms,
+        'eager_heavy_imports': sorted(eager),
+        'ok': ok,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"cold import: {best:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        if eager:
+            print(f"heavy dependencies imported eagerly: {', '.join(sorted(eager))}")
+        print('OK' if ok else 'FAIL')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
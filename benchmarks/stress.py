@@ -0,0 +1,383 @@
+#!/usr/bin/env python
+# Harnais de stress concurrent de ConfigManager : lecteurs, écrivains et rechargeurs
+# simultanés (threads et/ou processus) sur une arborescence synthétique temporaire.
+# - écrivains : set_service_config_arg() d'une valeur auto-vérifiable {seq, check}
+#   dans une section qui leur est propre, delete_service_config_section() périodique ;
+#   plusieurs écrivains partagent un même config.yml de service (contention des verrous)
+# - rechargeurs : update_full_config() en boucle (et, avec --watch, un reload_on_change
+#   par processus dont les callbacks sont comptés)
+# - lecteurs : get_config() complet ou par section, avec vérification des invariants
+# Invariants vérifiés :
+#   torn_reads          section de service manquante ou valeur {seq, check} incohérente
+#   read_errors         exception pendant une lecture (fichier partiel, YAML invalide...)
+#   inconsistent_reads  retour en arrière (seq d'un écrivain ou génération) vu par un lecteur
+#   lost_writes         écriture absente à la relecture du fichier par l'écrivain, ou
+#                       dernière écriture absente de la configuration finale
+# Le rapport JSON donne p50/p99/p999/max et le débit de chaque opération ; code 1 si un
+# invariant est violé.
+#
+# Usage :
+#   python benchmarks/stress.py --duration 10 --readers 4 --writers 4 --reloaders 1 \
+#       --process-readers 2 --process-writers 2 [--watch] [--output report.json]
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import multiprocessing as mp
+from collections import defaultdict
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import synthetic  # noqa: E402
+
+SECTION_PREFIX = 'stress_w'
+CHECK_FACTOR = 7
+MAX_SAMPLES = 200_000
+
+VIOLATIONS = ('torn_reads', 'read_errors', 'inconsistent_reads', 'lost_writes')
+
+
+class Recorder:
+    """Latences par opération et compteurs d'invariants d'un processus (partagé par ses threads)."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.examples: List[str] = []
+
+    def time(self, op: str, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            samples = self.samples[op]
+            if len(samples) < MAX_SAMPLES:
+                samples.append(elapsed)
+            self.counters['ops.' + op] += 1
+
+    def count(self, name: str, detail: str = None) -> None:
+        with self.lock:
+            self.counters[name] += 1
+            if detail and len(self.examples) < 20:
+                self.examples.append(f"{name}: {detail}")
+
+    def export(self) -> Dict[str, Any]:
+        with self.lock:
+            return {'samples': dict(self.samples), 'counters': dict(self.counters),
+                    'examples': list(self.examples)}
+
+
+def section_name(writer: int) -> str:
+    return f"{SECTION_PREFIX}{writer}"
+
+
+def writer_loop(manager, rec: Recorder, writer: int, service: str, stop: float, delete_every: int,
+                results: Dict[int, int]) -> None:
+    """
+    Écrit seq = 1, 2, ... dans sa section ; relit le fichier pour détecter les écritures
+    perdues.
+    """
+    section = section_name(writer)
+    seq = 0
+    while time.time() < stop:
+        seq += 1
+        started = time.perf_counter()
+        try:
+            manager.set_service_config_arg(service, section, 'state',
+                                           {'seq': seq, 'check': seq * CHECK_FACTOR})
+        except Exception as e:
+            rec.count('write_errors', f"w{writer} seq={seq}: {e}")
+            continue
+        rec.time('set_service_config_arg', started)
+        results[writer] = seq
+        state = manager.get_service_config(service).get(section, {}).get('state')
+        if not isinstance(state, dict) or state.get('seq', 0) < seq:
+            rec.count('lost_writes', f"w{writer} wrote {seq}, file has {state}")
+        if delete_every and seq % delete_every == 0 and time.time() < stop:
+            started = time.perf_counter()
+            try:
+                manager.delete_service_config_section(service, section)
+                rec.time('delete_service_config_section', started)
+            except Exception as e:
+                rec.count('write_errors', f"w{writer} delete: {e}")
+
+
+def check_state(rec: Recorder, section: str, state: Any, seen: Dict[str, int]) -> None:
+    if not isinstance(state, dict) or state.get('check') != state.get('seq', 0) * CHECK_FACTOR:
+        rec.count('torn_reads', f"{section}: {state}")
+        return
+    if state['seq'] < seen.get(section, 0):
+        rec.count('inconsistent_reads', f"{section}: seq {state['seq']} < {seen[section]}")
+    seen[section] = max(seen.get(section, 0), state['seq'])
+
+
+def reader_loop(manager, rec: Recorder, services: List[str], writers: List[int], stop: float,
+                seed: int) -> None:
+    """Lit la configuration complète ou une section et vérifie les invariants."""
+    rng = random.Random(seed)
+    seen: Dict[str, int] = {}
+    generation = 0
+    while time.time() < stop:
+        full = rng.random() < 0.5 or not writers
+        started = time.perf_counter()
+        try:
+            if full:
+                config = manager.get_config()
+                rec.time('get_config.full', started)
+            else:
+                section = section_name(rng.choice(writers))
+                config = manager.get_config(section=section)
+                rec.time('get_config.section', started)
+            current = manager.generation()
+        except Exception as e:
+            rec.count('read_errors', f"{type(e).__name__}: {e}")
+            continue
+        if current < generation:
+            rec.count('inconsistent_reads', f"generation {current} < {generation}")
+        generation = max(generation, current)
+        if full:
+            missing = [s for s in services if s not in config]
+            if missing:
+                rec.count('torn_reads', f"services manquants: {missing[:3]}")
+            for name, sect in config.items():
+                if name.startswith(SECTION_PREFIX) and isinstance(sect, dict) and 'state' in sect:
+                    check_state(rec, name, sect['state'], seen)
+        else:
+            for name, sect in config.items():
+                if isinstance(sect, dict) and 'state' in sect:
+                    check_state(rec, name, sect['state'], seen)
+
+
+def reloader_loop(manager, rec: Recorder, stop: float, interval: float) -> None:
+    """Régénère config_full.yml en boucle."""
+    while time.time() < stop:
+        started = time.perf_counter()
+        try:
+            manager.update_full_config()
+            rec.time('update_full_config', started)
+        except Exception as e:
+            rec.count('reload_errors', f"{e}")
+        if interval:
+            time.sleep(interval)
+
+
+def run_roles(config_dir: str, roles: Dict[str, Any], stop: float) -> Dict[str, Any]:
+    """
+    Exécute les rôles d'un processus dans des threads jusqu'à `stop`.
+    Args:
+        config_dir (str): Répertoire de configuration.
+        roles (dict): readers (int), writers ([(id, service)]), reloaders (int), watch (bool),
+            services / writer_ids (invariants), delete_every, interval, seed.
+        stop (float): Échéance (time.time()).
+    Returns:
+        dict: Mesures exportées (Recorder.export()) et dernières écritures par écrivain.
+    """
+    from src.core.config_manager import ConfigManager
+
+    ConfigManager.set_config_dir(config_dir)
+    rec = Recorder()
+    last_writes: Dict[int, int] = {}
+    watcher = None
+    if roles.get('watch'):
+        watcher = ConfigManager.reload_on_change(lambda: rec.count('reload_callbacks'),
+                                                 debounce=0.05)
+    threads = []
+    for i in range(roles.get('readers', 0)):
+        threads.append(threading.Thread(target=reader_loop, args=(
+            ConfigManager, rec, roles['services'], roles['writer_ids'], stop,
+            roles.get('seed', 0) * 1000 + i)))
+    for writer, service in roles.get('writers', []):
+        threads.append(threading.Thread(target=writer_loop, args=(
+            ConfigManager, rec, writer, service, stop, roles.get('delete_every', 0), last_writes)))
+    for _ in range(roles.get('reloaders', 0)):
+        threads.append(threading.Thread(target=reloader_loop, args=(
+            ConfigManager, rec, stop, roles.get('interval', 0))))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if watcher is not None:
+        watcher.stop()
+    out = rec.export()
+    out['last_writes'] = last_writes
+    return out
+
+
+def _process_main(config_dir: str, roles: Dict[str, Any], stop: float, queue) -> None:
+    sys.path.insert(0, ROOT)
+    try:
+        queue.put(run_roles(config_dir, roles, stop))
+    except Exception as e:
+        queue.put({'samples': {}, 'counters': {'process_errors': 1}, 'examples': [repr(e)],
+                   'last_writes': {}})
+
+
+def percentiles(samples: List[float]) -> Dict[str, Any]:
+    data = sorted(samples)
+    if not data:
+        return {'count': 0}
+
+    def pick(q):
+        return data[min(len(data) - 1, int(q * len(data)))] * 1e6
+
+    return {'count': len(data), 'p50_us': pick(0.50), 'p99_us': pick(0.99), 'p999_us': pick(0.999),
+            'max_us': data[-1] * 1e6}
+
+
+def final_check(config_dir: str, writers: List[tuple], last_writes: Dict[int, int],
+                delete_every: int) -> List[str]:
+    """
+    Dernière écriture de chaque écrivain présente dans son fichier et dans la configuration
+    fusionnée.
+    """
+    from src.core.config_manager import ConfigManager
+
+    ConfigManager.set_config_dir(config_dir)
+    ConfigManager.update_full_config()
+    full = ConfigManager.get_full_config()
+    lost = []
+    for writer, service in writers:
+        seq = last_writes.get(writer)
+        if not seq:
+            continue
+        section = section_name(writer)
+        for label, tree in (('file', ConfigManager.get_service_config(service)), ('merged', full)):
+            state = tree.get(section, {}).get('state')
+            deleted = delete_every and seq % delete_every == 0 and state is None
+            if not deleted and (not isinstance(state, dict) or state.get('seq') != seq):
+                lost.append(f"w{writer} {label}: attendu {seq}, lu {state}")
+    return lost
+
+
+def run(args) -> Dict[str, Any]:
+    """
+    Exécute le scénario et retourne le rapport.
+    Args:
+        args (argparse.Namespace): Paramètres (voir main()).
+    Returns:
+        dict: Rapport JSON.
+    """
+    spec = synthetic.TreeSpec(services=args.services, sections=args.sections, keys=args.keys,
+                              depth=args.depth)
+    workdir = tempfile.mkdtemp(prefix='memapp-stress-')
+    config_dir = synthetic.generate(os.path.join(workdir, 'config'), spec)
+    services = spec.service_names()
+    os.environ.update(synthetic.environment(spec))
+    total_writers = args.writers + args.process_writers
+    shared = min(len(services), args.shared_files or len(services))
+    writers = [(i, services[i % shared]) for i in range(total_writers)]
+    common = {'services': services, 'writer_ids': [w for w, _ in writers],
+              'delete_every': args.delete_every, 'interval': args.reload_interval}
+    from src.core.config_manager import ConfigManager
+    ConfigManager.set_config_dir(config_dir)
+    ConfigManager.update_full_config()
+
+    stop = time.time() + args.duration
+    ctx = mp.get_context('spawn')
+    queue = ctx.Queue()
+    procs = []
+    process_roles = [dict(common, readers=1, seed=100 + i) for i in range(args.process_readers)]
+    process_roles += [dict(common, writers=[writers[args.writers + i]])
+                      for i in range(args.process_writers)]
+    process_roles += [dict(common, reloaders=1, watch=args.watch)
+                      for _ in range(args.process_reloaders)]
+    # Les processus démarrent plus lentement : l'échéance est décalée de leur temps de lancement
+    for roles in process_roles:
+        proc = ctx.Process(target=_process_main, args=(config_dir, roles, stop + 1.0, queue),
+                           daemon=True)
+        proc.start()
+        procs.append(proc)
+    local = dict(common, readers=args.readers, writers=writers[:args.writers],
+                 reloaders=args.reloaders, watch=args.watch, seed=0)
+    results = [run_roles(config_dir, local, stop)]
+    for _ in procs:
+        try:
+            results.append(queue.get(timeout=args.duration + 60))
+        except Exception:
+            results.append({'samples': {}, 'counters': {'process_errors': 1},
+                            'examples': ['timeout'], 'last_writes': {}})
+    for proc in procs:
+        proc.join(10)
+        if proc.is_alive():
+            proc.terminate()
+
+    samples: Dict[str, List[float]] = defaultdict(list)
+    counters: Dict[str, int] = defaultdict(int)
+    examples: List[str] = []
+    last_writes: Dict[int, int] = {}
+    for result in results:
+        for op, values in result['samples'].items():
+            samples[op].extend(values)
+        for name, value in result['counters'].items():
+            counters[name] += value
+        examples.extend(result['examples'])
+        last_writes.update({int(k): v for k, v in result['last_writes'].items()})
+    lost_final = final_check(config_dir, writers, last_writes, args.delete_every)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    elapsed = args.duration
+    operations = {}
+    for op in sorted(samples):
+        stats = percentiles(samples[op])
+        stats['ops'] = counters.get('ops.' + op, stats['count'])
+        stats['ops_per_s'] = stats['ops'] / elapsed
+        operations[op] = stats
+    invariants = {name: counters.get(name, 0) for name in VIOLATIONS}
+    invariants['lost_writes_final'] = len(lost_final)
+    errors = {name: counters.get(name, 0)
+              for name in ('write_errors', 'reload_errors', 'process_errors')}
+    return {
+        'parameters': {k: v for k, v in vars(args).items() if k != 'output'},
+        'operations': operations,
+        'invariants': invariants,
+        'errors': errors,
+        'reload_callbacks': counters.get('reload_callbacks', 0),
+        'examples': (examples + lost_final)[:20],
+        'ok': not any(invariants.values()) and not any(errors.values()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Stress concurrent lecture/écriture/reload de ConfigManager")
+    parser.add_argument('--duration', type=float, default=5.0, help='Durée (secondes)')
+    parser.add_argument('--readers', type=int, default=4, help='Threads lecteurs')
+    parser.add_argument('--writers', type=int, default=2, help='Threads écrivains')
+    parser.add_argument('--reloaders', type=int, default=1, help='Threads rechargeurs')
+    parser.add_argument('--process-readers', type=int, default=0)
+    parser.add_argument('--process-writers', type=int, default=0)
+    parser.add_argument('--process-reloaders', type=int, default=0)
+    parser.add_argument('--watch', action='store_true',
+                        help='reload_on_change dans chaque processus')
+    parser.add_argument('--reload-interval', type=float, default=0.01,
+                        help='Pause entre deux update_full_config()')
+    parser.add_argument('--delete-every', type=int, default=10,
+                        help='Suppression de section toutes les N écritures')
+    parser.add_argument('--shared-files', type=int, default=2,
+                        help='Nombre de config.yml partagés par les écrivains')
+    parser.add_argument('--services', type=int, default=10)
+    parser.add_argument('--sections', type=int, default=3)
+    parser.add_argument('--keys', type=int, default=5)
+    parser.add_argument('--depth', type=int, default=1)
+    parser.add_argument('--output', help='Fichier JSON de sortie (stdout par défaut)')
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0 if report['ok'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
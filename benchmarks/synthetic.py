@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# Générateur d'arborescences de configuration synthétiques pour les benchmarks.
+# Chaque service `svcNNN` reçoit un config.yml suivant la convention du projet
+# (section racine = nom du service), un schema.yml et un defaults.yml.
+#
+# Usage : python benchmarks/synthetic.py DEST [--services 20] [--sections 5] [--keys 10]
+#                                             [--depth 1] [--var-density 0.1] [--seed 0]
+
+import os
+import sys
+import random
+import argparse
+from dataclasses import dataclass, asdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.utils import serialization  # noqa: E402
+
+VAR_PREFIX = 'MEMAPP_BENCH_VAR'
+
+
+@dataclass
+class TreeSpec:
+    """
+    Dimensions de l'arborescence générée.
+    - services × sections × keys feuilles par niveau
+    - depth : niveaux de dictionnaires imbriqués sous chaque clé (0 = feuilles directes)
+    - var_density : proportion de chaînes contenant une variable `${VAR:-défaut}`
+    """
+    services: int = 20
+    sections: int = 5
+    keys: int = 10
+    depth: int = 1
+    var_density: float = 0.1
+    seed: int = 0
+
+    def service_names(self):
+        return [f"svc{i:03d}" for i in range(self.services)]
+
+
+def _leaf(rng: random.Random, spec: TreeSpec, n: int):
+    kind = n % 4
+    if kind == 0:
+        return n
+    if kind == 1:
+        return n % 3 == 0
+    if kind == 2:
+        return [n, n + 1, n + 2]
+    if rng.random() < spec.var_density:
+        return f"${{{VAR_PREFIX}_{n % 16}:-value{n}}}"
+    return f"value{n}"
+
+
+def _branch(rng: random.Random, spec: TreeSpec, depth: int, start: int):
+    node = {}
+    for k in range(spec.keys):
+        n = start + k
+        node[f"key{k}"] = (_leaf(rng, spec, n) if depth == 0
+                           else _branch(rng, spec, depth - 1, n * spec.keys))
+    return node
+
+
+def _rules(spec: TreeSpec, depth: int):
+    rules = {}
+    for k in range(spec.keys):
+        if depth:
+            rules[f"key{k}"] = {'type': 'dict', 'schema': _rules(spec, depth - 1)}
+        else:
+            rules[f"key{k}"] = {'type': ['integer', 'boolean', 'list', 'string']}
+    return rules
+
+
+def service_tree(spec: TreeSpec, index: int) -> dict:
+    """
+    Configuration d'un service (section racine = nom du service).
+    Args:
+        spec (TreeSpec): Dimensions.
+        index (int): Rang du service.
+    Returns:
+        dict: Arbre du config.yml.
+    """
+    rng = random.Random(spec.seed * 1000003 + index)
+    name = spec.service_names()[index]
+    return {name: {f"section{j}": _branch(rng, spec, spec.depth, j * 1000)
+                   for j in range(spec.sections)}}
+
+
+def service_schema(spec: TreeSpec, index: int) -> dict:
+    """Schéma (arbre service -> section -> clé -> règles) d'un service généré."""
+    name = spec.service_names()[index]
+    return {name: {f"section{j}": _rules(spec, spec.depth) for j in range(spec.sections)}}
+
+
+def environment(spec: TreeSpec) -> dict:
+    """Variables d'environnement référencées par les arbres générés (la moitié définies)."""
+    return {f"{VAR_PREFIX}_{i}": f"env{i}" for i in range(0, 16, 2)}
+
+
+def generate(dest: str, spec: TreeSpec) -> str:
+    """
+    Écrit l'arborescence synthétique sous `dest` (créé si besoin).
+    Args:
+        dest (str): Répertoire de configuration à produire.
+        spec (TreeSpec): Dimensions.
+    Returns:
+        str: Chemin absolu du répertoire produit.
+    """
+    dest = os.path.abspath(dest)
+    for i, name in enumerate(spec.service_names()):
+        folder = os.path.join(dest, name)
+        os.makedirs(folder, exist_ok=True)
+        tree = service_tree(spec, i)
+        serialization.dump_file(tree, os.path.join(folder, 'config.yml'))
+        serialization.dump_file(tree, os.path.join(folder, 'defaults.yml'))
+        serialization.dump_file(service_schema(spec, i), os.path.join(folder, 'schema.yml'))
+    return dest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Génère une arborescence de configuration synthétique")
+    parser.add_argument('dest')
+    for name, default in asdict(TreeSpec()).items():
+        parser.add_argument('--' + name.replace('_', '-'), type=type(default), default=default)
+    args = parser.parse_args(argv)
+    spec = TreeSpec(**{k: getattr(args, k) for k in asdict(TreeSpec())})
+    print(generate(args.dest, spec))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,14 @@
+from .broadcast import ConfigBroadcast
+from .cache import ConfigCache
+from .index import ConfigIndex
+from .layers import EnvOverrides, LayeredConfig, LayeredView
 from .manager import ConfigManager
 from .merge import ConfigMerge
-from .reload import ConfigReload
+from .merkle import ConfigChange, ConfigSubscription
+from .models import ConfigModels
+from .reload import ConfigReload, ConfigWatcher, ConfigChangeEvent
+from .server import ConfigServer
+from .snapshot import ConfigSnapshot
+from .storage import ConfigStorage, SqliteStorage, YamlDirStorage
+from .transaction import ConfigCommit, ConfigTransaction
 from .validation import ConfigValidation
@@ -0,0 +1,371 @@
+import os
+import mmap
+import struct
+import threading
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from src.core.exceptions import ConfigException
+from src.utils.file_tools import atomic_write, file_lock
+
+# Format du snapshot binaire (little-endian) :
+# - en-tête : magic, version, génération, position/nombre de la table de chaînes,
+#   position de la racine
+# - nœuds typés : null/false/true, int64, float64, chaîne (id), liste (offsets),
+#   dict (paires id de clé/offset, triées par octets de clé pour la recherche dichotomique)
+# - table de chaînes : (offset, longueur) par chaîne puis les octets UTF-8
+# Les lecteurs mappent le fichier en lecture seule (pages partagées entre processus)
+# et ne décodent que les nœuds visités.
+
+MAGIC = b'MEMCFGB\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sHHQIII')
+
+T_NULL, T_FALSE, T_TRUE, T_INT, T_FLOAT, T_STR, T_LIST, T_DICT, T_BIGINT = range(9)
+
+_U8 = struct.Struct('<B')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+_PAIR = struct.Struct('<II')
+
+MISSING = object()
+
+Path = Union[str, Tuple[Any, ...], List[Any]]
+
+
+class _Writer:
+    def __init__(self):
+        self.buf = bytearray(HEADER.size)
+        self.strings: Dict[str, int] = {}
+        self.encoded: List[bytes] = []
+
+    def intern(self, value: str) -> int:
+        sid = self.strings.get(value)
+        if sid is None:
+            sid = len(self.encoded)
+            self.strings[value] = sid
+            self.encoded.append(value.encode('utf-8'))
+        return sid
+
+    def emit(self, value: Any) -> int:
+        if isinstance(value, dict):
+            items = []
+            for k, v in value.items():
+                if not isinstance(k, str):
+                    raise ConfigException(
+                        f"Clé non textuelle non supportée par le snapshot binaire: {k!r}")
+                items.append((k.encode('utf-8'), self.intern(k), self.emit(v)))
+            items.sort(key=lambda item: item[0])
+            offset = len(self.buf)
+            self.buf += _U8.pack(T_DICT) + _U32.pack(len(items))
+            for _, sid, child in items:
+                self.buf += _PAIR.pack(sid, child)
+            return offset
+        if isinstance(value, (list, tuple)):
+            children = [self.emit(v) for v in value]
+            offset = len(self.buf)
+            self.buf += _U8.pack(T_LIST) + _U32.pack(len(children))
+            for child in children:
+                self.buf += _U32.pack(child)
+            return offset
+        offset = len(self.buf)
+        if value is None:
+            self.buf += _U8.pack(T_NULL)
+        elif value is True:
+            self.buf += _U8.pack(T_TRUE)
+        elif value is False:
+            self.buf += _U8.pack(T_FALSE)
+        elif isinstance(value, int):
+            if -(1 << 63) <= value < (1 << 63):
+                self.buf += _U8.pack(T_INT) + _I64.pack(value)
+            else:
+                self.buf += _U8.pack(T_BIGINT) + _U32.pack(self.intern(str(value)))
+        elif isinstance(value, float):
+            self.buf += _U8.pack(T_FLOAT) + _F64.pack(value)
+        elif isinstance(value, str):
+            self.buf += _U8.pack(T_STR) + _U32.pack(self.intern(value))
+        else:
+            raise ConfigException(
+                f"Type non supporté par le snapshot binaire: {type(value).__name__}")
+        return offset
+
+    def finish(self, tree: Any, generation: int) -> bytes:
+        root = self.emit(tree)
+        strtab = len(self.buf)
+        data_start = strtab + _PAIR.size * len(self.encoded)
+        pos = data_start
+        for raw in self.encoded:
+            self.buf += _PAIR.pack(pos, len(raw))
+            pos += len(raw)
+        for raw in self.encoded:
+            self.buf += raw
+        HEADER.pack_into(self.buf, 0, MAGIC, VERSION, 0, generation, strtab, len(self.encoded),
+                         root)
+        return bytes(self.buf)
+
+
+def encode(tree: Any, generation: int) -> bytes:
+    """
+    Encode un arbre de configuration au format snapshot binaire.
+    Args:
+        tree (Any): Arbre (dict/list/scalaires, clés textuelles).
+        generation (int): Génération inscrite dans l'en-tête.
+    Returns:
+        bytes: Contenu du snapshot.
+    Raises:
+        ConfigException: si l'arbre contient un type non supporté.
+    """
+    return _Writer().finish(tree, generation)
+
+
+def read_generation(path: str) -> int:
+    """Génération inscrite dans l'en-tête d'un snapshot, 0 s'il est absent ou invalide."""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read(HEADER.size)
+        magic, version, _, generation, _, _, _ = HEADER.unpack(raw)
+    except (OSError, struct.error):
+        return 0
+    return generation if magic == MAGIC and version == VERSION else 0
+
+
+def write_snapshot(tree: Any, path: str, generation: Optional[int] = None) -> int:
+    """
+    Écrit atomiquement un snapshot.
+    La génération inscrite est celle fournie (génération publiée par le SnapshotStore),
+    portée au-delà de celle du fichier en place si un autre processus l'a dépassée :
+    elle ne recule jamais, même si le fichier a disparu entre-temps.
+    Args:
+        tree (Any): Configuration fusionnée.
+        path (str): Chemin du snapshot.
+        generation (int): Génération du snapshot publié ; à défaut, celle du fichier + 1.
+    Returns:
+        int: Génération écrite.
+    """
+    with file_lock(path):
+        on_disk = read_generation(path) + 1
+        generation = on_disk if generation is None else max(generation, on_disk)
+        atomic_write(path, encode(tree, generation))
+    return generation
+
+
+class _Image:
+    """Fichier snapshot mappé en mémoire ; partagé par les vues qui en sont issues."""
+    __slots__ = ('mm', 'generation', 'strtab', 'count', 'root', 'identity')
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            self.identity = (st.st_ino, st.st_mtime_ns, st.st_size)
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, generation, strtab, count, root = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ConfigException(f"Snapshot binaire invalide: {path}")
+        self.generation = generation
+        self.strtab = strtab
+        self.count = count
+        self.root = root
+
+    def raw_string(self, sid: int) -> bytes:
+        start, length = _PAIR.unpack_from(self.mm, self.strtab + sid * _PAIR.size)
+        return self.mm[start:start + length]
+
+    def string(self, sid: int) -> str:
+        return self.raw_string(sid).decode('utf-8')
+
+    def value(self, offset: int) -> Any:
+        tag = self.mm[offset]
+        if tag == T_DICT:
+            return SnapshotMapping(self, offset)
+        if tag == T_LIST:
+            return SnapshotSequence(self, offset)
+        if tag == T_STR:
+            return self.string(_U32.unpack_from(self.mm, offset + 1)[0])
+        if tag == T_INT:
+            return _I64.unpack_from(self.mm, offset + 1)[0]
+        if tag == T_FLOAT:
+            return _F64.unpack_from(self.mm, offset + 1)[0]
+        if tag == T_TRUE:
+            return True
+        if tag == T_FALSE:
+            return False
+        if tag == T_BIGINT:
+            return int(self.string(_U32.unpack_from(self.mm, offset + 1)[0]))
+        return None
+
+    def find(self, offset: int, key: str) -> int:
+        """Recherche dichotomique d'une clé dans un nœud dict ; -1 si absente."""
+        count = _U32.unpack_from(self.mm, offset + 1)[0]
+        target = key.encode('utf-8')
+        base = offset + 5
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            sid, child = _PAIR.unpack_from(self.mm, base + mid * _PAIR.size)
+            current = self.raw_string(sid)
+            if current == target:
+                return child
+            if current < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return -1
+
+
+class SnapshotMapping(Mapping):
+    """Vue paresseuse en lecture seule d'un nœud dict du snapshot."""
+    __slots__ = ('_image', '_offset')
+
+    def __init__(self, image: _Image, offset: int):
+        self._image = image
+        self._offset = offset
+
+    def __getitem__(self, key):
+        if not isinstance(key, str):
+            raise KeyError(key)
+        child = self._image.find(self._offset, key)
+        if child < 0:
+            raise KeyError(key)
+        return self._image.value(child)
+
+    def __len__(self) -> int:
+        return _U32.unpack_from(self._image.mm, self._offset + 1)[0]
+
+    def __iter__(self) -> Iterator[str]:
+        base = self._offset + 5
+        for i in range(len(self)):
+            sid, _ = _PAIR.unpack_from(self._image.mm, base + i * _PAIR.size)
+            yield self._image.string(sid)
+
+    def to_python(self) -> Dict[str, Any]:
+        """Matérialise le sous-arbre en dict Python."""
+        return {k: _to_python(v) for k, v in self.items()}
+
+
+class SnapshotSequence(Sequence):
+    """Vue paresseuse en lecture seule d'un nœud liste du snapshot."""
+    __slots__ = ('_image', '_offset')
+
+    def __init__(self, image: _Image, offset: int):
+        self._image = image
+        self._offset = offset
+
+    def __len__(self) -> int:
+        return _U32.unpack_from(self._image.mm, self._offset + 1)[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError(index)
+        child = _U32.unpack_from(self._image.mm, self._offset + 5 + index * _U32.size)[0]
+        return self._image.value(child)
+
+    def to_python(self) -> List[Any]:
+        """Matérialise le sous-arbre en liste Python."""
+        return [_to_python(v) for v in self]
+
+
+def _to_python(value: Any) -> Any:
+    return value.to_python() if isinstance(value, (SnapshotMapping, SnapshotSequence)) else value
+
+
+class BinarySnapshot:
+    """
+    Lecteur d'un snapshot binaire mappé en mémoire.
+    - get() interroge un chemin sans construire le dict complet
+    - refresh() détecte (par stat) un fichier remplacé et remappe atomiquement ;
+      les vues déjà obtenues restent valides sur l'ancienne image
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._image = _Image(path)
+
+    @property
+    def generation(self) -> int:
+        return self._image.generation
+
+    def refresh(self) -> bool:
+        """
+        Remappe le fichier s'il a été remplacé (inode, mtime ou taille différents).
+        Le fichier en place fait foi, quelle que soit sa génération.
+        Returns:
+            bool: True si une nouvelle image a été chargée.
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        if (st.st_ino, st.st_mtime_ns, st.st_size) == self._image.identity:
+            return False
+        with self._lock:
+            image = _Image(self.path)
+            if image.identity == self._image.identity:
+                return False
+            self._image = image
+            return True
+
+    def get(self, path: Path = (), default: Any = MISSING) -> Any:
+        """
+        Retourne la valeur à un chemin (`memApp.database.port` ou tuple de clés/indices).
+        Les dicts et listes sont retournés sous forme de vues paresseuses.
+        Raises:
+            KeyError: si le chemin n'existe pas et qu'aucun défaut n'est fourni.
+        """
+        parts = path.split('.') if isinstance(path, str) else list(path)
+        image = self._image
+        offset = image.root
+        for part in parts:
+            tag = image.mm[offset]
+            if tag == T_DICT and isinstance(part, str):
+                offset = image.find(offset, part)
+            elif tag == T_LIST:
+                try:
+                    index = int(part)
+                except (TypeError, ValueError):
+                    offset = -1
+                else:
+                    count = _U32.unpack_from(image.mm, offset + 1)[0]
+                    if index < 0:
+                        index += count
+                    offset = (_U32.unpack_from(image.mm, offset + 5 + index * _U32.size)[0]
+                              if 0 <= index < count else -1)
+            else:
+                offset = -1
+            if offset < 0:
+                if default is MISSING:
+                    raise KeyError(path)
+                return default
+        return image.value(offset)
+
+    def to_python(self, path: Path = ()) -> Any:
+        """Matérialise la valeur d'un chemin en objets Python."""
+        return _to_python(self.get(path))
+
+
+_readers: Dict[str, BinarySnapshot] = {}
+_readers_lock = threading.Lock()
+
+
+def attach(path: str) -> Optional[BinarySnapshot]:
+    """
+    Retourne le lecteur partagé du processus pour un snapshot, rafraîchi si besoin.
+    Returns:
+        BinarySnapshot: lecteur, ou None si le fichier n'existe pas.
+    """
+    reader = _readers.get(path)
+    if reader is not None:
+        reader.refresh()
+        return reader
+    if not os.path.exists(path):
+        return None
+    with _readers_lock:
+        reader = _readers.get(path)
+        if reader is None:
+            reader = BinarySnapshot(path)
+            _readers[path] = reader
+    return reader
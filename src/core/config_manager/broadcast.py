@@ -0,0 +1,440 @@
+import os
+import json
+import socket
+import struct
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+from src.core.exceptions import ConfigException
+from src.utils import metrics
+from .reload import ConfigChangeEvent, ConfigWatcher, DEFAULT_DEBOUNCE, DEFAULT_MAX_WAIT
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas d'élection, chaque processus surveille seul
+    fcntl = None
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), '../../config')
+
+SOCKET_NAME = '.memapp-reload.sock'
+LOCK_NAME = '.memapp-reload.lock'
+RETRY_DELAY = 0.5
+SEND_TIMEOUT = 5.0
+MAX_PENDING = 64
+MAX_MESSAGE = 256 << 20
+
+# Trame : longueur (uint32 big-endian) puis document JSON UTF-8
+_LENGTH = struct.Struct('>I')
+
+_MESSAGES = metrics.counter('memapp_config_broadcast_messages_total',
+                            'Notifications de changement diffusées (leader) '
+                            'ou appliquées (follower)', ('role',))
+_DROPPED = metrics.counter('memapp_config_broadcast_dropped_total',
+                           "Followers déconnectés car trop lents (file d'envoi pleine)")
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """
+    Encode une notification en trame (longueur + JSON).
+    Args:
+        message (dict): Notification.
+    Returns:
+        bytes: Trame prête à envoyer.
+    """
+    body = json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return _LENGTH.pack(len(body)) + body
+
+
+def _read_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def read_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """
+    Lit une trame complète.
+    Returns:
+        dict: Notification, ou None si la connexion est fermée.
+    Raises:
+        ConfigException: si la trame est invalide.
+    """
+    header = _read_exact(sock, _LENGTH.size)
+    if header is None:
+        return None
+    size, = _LENGTH.unpack(header)
+    if size > MAX_MESSAGE:
+        raise ConfigException(f"Notification trop volumineuse: {size} octets")
+    body = _read_exact(sock, size)
+    if body is None:
+        return None
+    try:
+        message = json.loads(body.decode('utf-8'))
+    except ValueError as e:
+        raise ConfigException(f"Notification invalide: {e}")
+    _check_message(message)
+    return message
+
+
+_EVENT_FIELDS = (('paths', dict), ('services', list), ('sections', list), ('generation', int))
+
+
+def _check_message(message: Any) -> None:
+    """
+    Vérifie la forme d'une notification : `snapshot` (dict avec une génération entière)
+    et `event` (None ou dict paths/services/sections/generation).
+    Raises:
+        ConfigException: si un champ manque ou n'a pas le type attendu.
+    """
+    if not isinstance(message, dict):
+        raise ConfigException("Notification invalide: objet JSON attendu")
+    snapshot = message.get('snapshot')
+    if not isinstance(snapshot, dict) or type(snapshot.get('generation')) is not int:
+        raise ConfigException("Notification invalide: snapshot ou génération manquant")
+    event = message.get('event')
+    if event is None:
+        return
+    if not isinstance(event, dict):
+        raise ConfigException("Notification invalide: événement mal formé")
+    for name, kind in _EVENT_FIELDS:
+        value = event.get(name)
+        if not isinstance(value, kind) or isinstance(value, bool):
+            raise ConfigException(f"Notification invalide: champ d'événement '{name}'")
+
+
+class _Follower:
+    """
+    Connexion d'un follower côté leader : file d'envoi bornée et thread d'envoi dédié.
+    Un follower lent ne bloque ni les autres ni le callback du leader ; si sa file
+    déborde, il est déconnecté (les trames incrémentales ne peuvent pas être sautées)
+    et recevra le snapshot complet à sa reconnexion.
+    """
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='memapp-config-broadcast-send',
+                                        daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def send(self, frame: bytes) -> bool:
+        """
+        Met une trame en file sans bloquer.
+        Returns:
+            bool: False si le follower est (ou vient d'être) déconnecté.
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._queue) < MAX_PENDING:
+                self._queue.append(frame)
+                self._cond.notify()
+                return True
+        _DROPPED.inc()
+        print("Config broadcast: follower trop lent, déconnecté")
+        self.close()
+        return False
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                frame = self._queue.popleft()
+            try:
+                self.sock.sendall(frame)
+            except OSError:
+                self.close()
+                return
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.clear()
+            self._cond.notify()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)  # débloque un sendall() en cours
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class ConfigBroadcast:
+    """
+    Reload partagé entre les processus d'un même hôte (mode leader/follower).
+    - le leader (verrou flock sur .memapp-reload.lock) est le seul à surveiller CONFIG_DIR
+      (ConfigWatcher), à fusionner et à écrire config_full.yml
+    - après chaque lot, il diffuse sur un socket Unix une notification compacte :
+      génération, fichiers touchés, sections modifiées et le nouveau snapshot
+      (configuration fusionnée, arbres et signatures des services modifiés)
+    - un follower applique le snapshot reçu sans relire ni re-parser les fichiers, puis
+      appelle son callback avec le même ConfigChangeEvent ; à la connexion, il reçoit
+      le snapshot complet courant
+    - si le leader disparaît, un follower prend le verrou et devient leader
+    Chaque follower a sa propre file et son thread d'envoi côté leader ; la trame de
+    rattrapage (snapshot complet) n'est construite qu'une fois par génération.
+    L'export et l'application des snapshots sont fournis par ConfigManager.
+    """
+    def __init__(self, callback: Optional[Callable] = None, debounce: float = DEFAULT_DEBOUNCE,
+                 merge: Optional[Callable[[], Dict[str, Any]]] = None,
+                 export: Optional[Callable[[Optional[List[str]]], Dict[str, Any]]] = None,
+                 apply: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 config_dir: Optional[str] = None, max_wait: float = DEFAULT_MAX_WAIT):
+        if export is None or apply is None:
+            raise ConfigException("ConfigBroadcast : export et apply sont requis")
+        self.callback = callback
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.merge = merge
+        self.export = export
+        self.apply = apply
+        self.config_dir = os.path.abspath(config_dir or CONFIG_DIR)
+        self.socket_path = os.path.join(self.config_dir, SOCKET_NAME)
+        self.lock_path = os.path.join(self.config_dir, LOCK_NAME)
+        self.generation = 0
+        self._pass_event = ConfigWatcher._accepts_event(callback)
+        self._stopping = threading.Event()
+        self._role: Optional[str] = None
+        self._lock_handle = None
+        self._watcher: Optional[ConfigWatcher] = None
+        self._server: Optional[socket.socket] = None
+        self._conn: Optional[socket.socket] = None
+        self._clients: List[_Follower] = []
+        self._clients_lock = threading.Lock()
+        self._catch_up: Optional[bytes] = None
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def role(self) -> Optional[str]:
+        """'leader', 'follower' ou None (en attente de connexion / arrêté)."""
+        return self._role
+
+    def start(self) -> 'ConfigBroadcast':
+        """
+        Tente de devenir leader ; sinon suit le leader courant depuis un thread dédié.
+        Returns:
+            ConfigBroadcast: l'instance démarrée.
+        Raises:
+            ConfigException: en cas d'erreur d'initialisation du leader.
+        """
+        self._stopping.clear()
+        if not self._acquire():
+            self._spawn(self._follow, 'memapp-config-follower')
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Arrête la surveillance (leader) ou l'écoute (follower) et libère le verrou.
+        Args:
+            timeout (float): Délai maximal d'attente de chaque thread.
+        """
+        self._stopping.set()
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            conn.close()
+        self._resign()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+        self._threads = []
+        self._role = None
+
+    def __enter__(self) -> 'ConfigBroadcast':
+        return self.start() if self._role is None and not self._threads else self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _spawn(self, target: Callable[[], None], name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    # --- leader ---
+
+    def _acquire(self) -> bool:
+        """Prend le verrou de leader s'il est libre, puis démarre le rôle de leader."""
+        handle = None
+        if fcntl is not None:
+            os.makedirs(self.config_dir, exist_ok=True)
+            handle = open(self.lock_path, 'a')
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                return False
+        self._lock_handle = handle
+        try:
+            self._lead()
+        except Exception as e:
+            self._resign()
+            raise ConfigException(f"Erreur démarrage du leader de reload: {e}")
+        return True
+
+    def _lead(self) -> None:
+        if fcntl is not None:
+            # Le verrou est détenu : un socket existant est celui d'un leader disparu
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(self.socket_path)
+            os.chmod(self.socket_path, 0o600)
+            server.listen(64)
+            self._server = server
+            self._spawn(self._accept, 'memapp-config-broadcast')
+        self._role = 'leader'
+        self._catch_up = None
+        self._watcher = ConfigWatcher(self._changed, debounce=self.debounce, merge=self.merge,
+                                      config_dir=self.config_dir,
+                                      max_wait=self.max_wait).start()
+        self.generation = self.export(None)['generation']
+
+    def _resign(self) -> None:
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.stop()
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.shutdown(socket.SHUT_RDWR)  # débloque accept()
+            except OSError:
+                pass
+            server.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        with self._clients_lock:
+            clients, self._clients = self._clients, []
+            self._catch_up = None
+        for client in clients:
+            client.close()
+        handle, self._lock_handle = self._lock_handle, None
+        if handle is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            handle.close()
+
+    def _accept(self) -> None:
+        server = self._server
+        while not self._stopping.is_set() and server is not None:
+            try:
+                client, _ = server.accept()
+            except OSError:
+                return
+            client.settimeout(SEND_TIMEOUT)
+            follower = _Follower(client)
+            try:
+                # Rattrapage : le nouveau follower reçoit d'abord le snapshot complet courant ;
+                # l'inscription sous le même verrou que la diffusion préserve l'ordre des trames
+                with self._clients_lock:
+                    follower.send(self._catch_up_frame())
+                    self._clients.append(follower)
+            except ConfigException as e:
+                print(f"Config broadcast: follower ignoré ({e})")
+                follower.close()
+                continue
+            follower.start()
+
+    def _catch_up_frame(self) -> bytes:
+        """Trame du snapshot complet, construite une fois par génération (sous _clients_lock)."""
+        if self._catch_up is None:
+            self._catch_up = encode_message({'event': None, 'snapshot': self.export(None)})
+        return self._catch_up
+
+    def _changed(self, event: ConfigChangeEvent) -> None:
+        """Callback du watcher du leader : diffuse le lot puis appelle le callback local."""
+        snapshot = self.export(self._services(event.paths))
+        event.generation = self.generation = snapshot['generation']
+        frame = encode_message({
+            'event': {'paths': event.paths, 'services': event.services,
+                      'sections': event.sections, 'generation': event.generation},
+            'snapshot': snapshot,
+        })
+        with self._clients_lock:
+            self._catch_up = None
+            self._clients = [client for client in self._clients if client.send(frame)]
+        _MESSAGES.inc(1, 'leader')
+        self._notify(event)
+
+    def _services(self, paths: Dict[str, str]) -> Optional[List[str]]:
+        """Services dont le config.yml a changé ; None (snapshot complet) sinon."""
+        names = []
+        for path in paths:
+            rel = os.path.relpath(os.path.abspath(path), self.config_dir)
+            if (os.path.basename(rel) != 'config.yml' or rel.startswith('..')
+                    or os.path.dirname(rel) == ''):
+                return None
+            names.append(os.path.dirname(rel))
+        return sorted(set(names))
+
+    # --- follower ---
+
+    def _follow(self) -> None:
+        while not self._stopping.is_set():
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                conn.connect(self.socket_path)
+            except OSError:
+                conn.close()
+                conn = None
+            if conn is not None:
+                self._conn = conn
+                self._role = 'follower'
+                try:
+                    self._receive(conn)
+                except (OSError, ConfigException) as e:
+                    if not self._stopping.is_set():
+                        print(f"Config broadcast: connexion au leader perdue ({e})")
+                finally:
+                    conn.close()
+                    self._conn = None
+                    self._role = None
+            if self._stopping.is_set():
+                return
+            try:
+                if self._acquire():
+                    return
+            except ConfigException as e:
+                print(f"Config broadcast: {e}")
+            self._stopping.wait(RETRY_DELAY)
+
+    def _receive(self, conn: socket.socket) -> None:
+        while not self._stopping.is_set():
+            message = read_message(conn)
+            if message is None:
+                return
+            try:
+                self.apply(message['snapshot'])
+            except (KeyError, TypeError, ValueError) as e:
+                raise ConfigException(f"Snapshot invalide: {e!r}")
+            self.generation = message['snapshot']['generation']
+            _MESSAGES.inc(1, 'follower')
+            if message.get('event'):
+                data = message['event']
+                self._notify(ConfigChangeEvent(dict(data['paths']), list(data['services']),
+                                               list(data['sections']), data['generation']))
+
+    def _notify(self, event: ConfigChangeEvent) -> None:
+        if not self.callback:
+            return
+        try:
+            if self._pass_event:
+                self.callback(event)
+            else:
+                self.callback()
+        except Exception as e:
+            print(f"Config reload callback error: {e}")
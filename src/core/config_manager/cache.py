@@ -0,0 +1,213 @@
+import os
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from src.utils import metrics, serialization
+from src.utils.frozen import freeze
+
+_READ_SECONDS = metrics.histogram('memapp_config_read_seconds',
+                                  'Lecture disque des fichiers YAML modifiés (par fichier)')
+_PARSE_SECONDS = metrics.histogram('memapp_config_parse_seconds',
+                                   'Parsing des fichiers YAML modifiés (par lot)')
+
+
+class CacheEntry:
+    """
+    Entrée du cache : arbre parsé d'un fichier et sa signature disque.
+    """
+    __slots__ = ('signature', 'digest', 'data', 'generation')
+
+    def __init__(self, signature: Tuple[int, int, int], digest: str, data: Any, generation: int):
+        self.signature = signature
+        self.digest = digest
+        self.data = data
+        self.generation = generation
+
+
+class ConfigCache:
+    """
+    Cache mémoire process-wide des fichiers YAML parsés.
+    - Conserve l'arbre parsé de chaque fichier (config.yml, config_full.yml, ...)
+    - Détecte l'obsolescence par stat (mtime, taille, inode), sans relire le fichier
+    - Ne re-parse que si le contenu (empreinte SHA-1) a réellement changé
+    - Expose des compteurs hits/misses/parses/invalidations
+    Les arbres sont stockés gelés (FrozenDict/FrozenList) : partagés sans copie,
+    ils ne peuvent pas être modifiés par un appelant (voir frozen.thaw()).
+    """
+    _lock = threading.RLock()
+    _entries: Dict[str, CacheEntry] = {}
+    _generation = 0
+    _stats = {'hits': 0, 'misses': 0, 'parses': 0, 'invalidations': 0}
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    @staticmethod
+    def _signature(path: str) -> Tuple[int, int, int]:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    @classmethod
+    def load(cls, path: str) -> Any:
+        """
+        Retourne l'arbre parsé d'un fichier YAML, depuis le cache si à jour.
+        Args:
+            path (str): Chemin du fichier YAML.
+        Returns:
+            Any: Contenu parsé et gelé ({} si fichier vide).
+        Raises:
+            OSError: si le fichier est absent ou illisible.
+            yaml.YAMLError: si le contenu est invalide.
+        """
+        return cls.get_entry(path).data
+
+    @classmethod
+    def get_entry(cls, path: str) -> CacheEntry:
+        """
+        Retourne l'entrée de cache à jour d'un fichier (données, empreinte, génération).
+        Args:
+            path (str): Chemin du fichier YAML.
+        Returns:
+            CacheEntry: Entrée à jour.
+        """
+        key = cls._key(path)
+        entry = cls._entries.get(key)
+        if entry is not None and entry.signature == cls._signature(key):
+            with cls._lock:
+                cls._stats['hits'] += 1
+            return entry
+        return cls.load_many([key])[0]
+
+    @classmethod
+    def load_many(cls, paths: List[str], workers: Optional[int] = None) -> List[CacheEntry]:
+        """
+        Retourne les entrées à jour de plusieurs fichiers ; les fichiers à re-parser
+        le sont en parallèle (voir serialization.load_many). L'ordre est conservé.
+        Args:
+            paths (list): Chemins des fichiers YAML.
+            workers (int): Taille du pool de parsing.
+        Returns:
+            list: CacheEntry, dans l'ordre des chemins.
+        Raises:
+            OSError: si un fichier est absent ou illisible.
+            yaml.YAMLError: si un contenu est invalide.
+        """
+        entries: List[Optional[CacheEntry]] = [None] * len(paths)
+        pending = []
+        hits = misses = 0
+        for i, path in enumerate(paths):
+            key = cls._key(path)
+            signature = cls._signature(key)
+            entry = cls._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                entries[i] = entry
+                hits += 1
+                continue
+            misses += 1
+            with _READ_SECONDS.time():
+                with open(key, 'rb') as f:
+                    raw = f.read()
+            digest = hashlib.sha1(raw).hexdigest()
+            if entry is not None and entry.digest == digest:
+                # Fichier touché sans changement de contenu : pas de re-parse
+                entry.signature = signature
+                entries[i] = entry
+                continue
+            pending.append((i, key, signature, raw, digest))
+        if pending:
+            with _PARSE_SECONDS.time():
+                items = [(raw, key, digest) for _, key, _, raw, digest in pending]
+                parsed = serialization.load_many(items, workers)
+        else:
+            parsed = []
+        with cls._lock:
+            cls._stats['hits'] += hits
+            cls._stats['misses'] += misses
+            cls._stats['parses'] += len(pending)
+            for (i, key, signature, _, digest), data in zip(pending, parsed):
+                cls._generation += 1
+                entry = CacheEntry(signature, digest, freeze(data or {}), cls._generation)
+                cls._entries[key] = entry
+                entries[i] = entry
+        return entries
+
+    @classmethod
+    def store(cls, path: str, signature: Tuple[int, int, int], digest: str,
+              data: Any) -> CacheEntry:
+        """
+        Enregistre un arbre déjà parsé ailleurs (autre processus) pour un fichier dont la
+        signature disque et l'empreinte sont connues : aucune lecture ni parsing local.
+        Args:
+            path (str): Chemin du fichier YAML.
+            signature (tuple): stat (mtime, taille, inode) du fichier correspondant à `data`.
+            digest (str): Empreinte SHA-1 du contenu.
+            data (Any): Contenu parsé.
+        Returns:
+            CacheEntry: Entrée enregistrée.
+        """
+        key = cls._key(path)
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is not None and entry.digest == digest:
+                entry.signature = signature
+                return entry
+            cls._generation += 1
+            entry = CacheEntry(signature, digest, freeze(data or {}), cls._generation)
+            cls._entries[key] = entry
+        return entry
+
+    @classmethod
+    def invalidate(cls, path: Optional[str] = None) -> None:
+        """
+        Invalide l'entrée d'un fichier, ou tout le cache si aucun chemin n'est fourni.
+        Args:
+            path (str): Chemin du fichier à invalider.
+        """
+        with cls._lock:
+            if path is None:
+                cls._entries.clear()
+            else:
+                cls._entries.pop(cls._key(path), None)
+            cls._stats['invalidations'] += 1
+            cls._generation += 1
+
+    @classmethod
+    def generation(cls) -> int:
+        """Compteur incrémenté à chaque parse ou invalidation."""
+        return cls._generation
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """
+        Retourne les compteurs du cache.
+        Returns:
+            dict: hits, misses, parses, invalidations, entries, generation.
+        """
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats['entries'] = len(cls._entries)
+            stats['generation'] = cls._generation
+        return stats
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        """Remet les compteurs à zéro (les entrées sont conservées)."""
+        with cls._lock:
+            for k in cls._stats:
+                cls._stats[k] = 0
+
+    @classmethod
+    def collect_metrics(cls):
+        """Collecteur de métriques : expose les compteurs du cache à l'export."""
+        stats = cls.stats()
+        for name in ('hits', 'misses', 'parses', 'invalidations'):
+            yield (f"memapp_config_cache_{name}_total", 'counter', f"ConfigCache : {name}",
+                   stats[name])
+        yield ('memapp_config_cache_entries', 'gauge', 'ConfigCache : fichiers en cache',
+               stats['entries'])
+        yield ('memapp_config_cache_generation', 'gauge', 'ConfigCache : génération',
+               stats['generation'])
+
+
+metrics.REGISTRY.register_collector(ConfigCache.collect_metrics)
@@ -0,0 +1,94 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class ConfigFiles:
+    """
+    Fichiers découverts sous le répertoire de configuration, dans l'ordre de fusion.
+    - config : config.yml des services (hors racine)
+    - schema : schema.yml, racine comprise
+    - defaults : defaults.yml, racine comprise
+    """
+    config: List[str] = field(default_factory=list)
+    schema: List[str] = field(default_factory=list)
+    defaults: List[str] = field(default_factory=list)
+
+
+class ConfigDiscovery:
+    """
+    Découverte des fichiers de configuration en un seul parcours du répertoire.
+    Les répertoires sont visités par ordre alphabétique : l'ordre de fusion ne
+    dépend pas du système de fichiers.
+    cached() réutilise le dernier parcours tant que les répertoires visités n'ont pas
+    changé (un ajout, une suppression ou un renommage modifie le mtime du parent).
+    """
+    _NAMES = {'config.yml': 'config', 'schema.yml': 'schema', 'defaults.yml': 'defaults'}
+    _cache: Dict[str, Tuple[Tuple[Tuple[str, int], ...], ConfigFiles]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def scan(config_dir: str) -> ConfigFiles:
+        """
+        Parcourt l'arborescence une fois et classe les fichiers par type.
+        Args:
+            config_dir (str): Répertoire racine de la configuration.
+        Returns:
+            ConfigFiles: Listes de chemins par type de fichier.
+        """
+        return ConfigDiscovery._walk(config_dir)[1]
+
+    @staticmethod
+    def _walk(config_dir: str) -> Tuple[Tuple[Tuple[str, int], ...], ConfigFiles]:
+        """Parcours en profondeur ; le mtime de chaque répertoire est relevé avant sa lecture."""
+        found = ConfigFiles()
+        stamps = []
+        stack = [config_dir]
+        while stack:
+            root = stack.pop()
+            stamps.append((root, ConfigDiscovery._mtime(root)))
+            try:
+                entries = sorted(os.scandir(root), key=lambda e: e.name)
+            except OSError:
+                continue
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir():
+                    # Comme os.walk : un lien vers un répertoire n'est pas suivi (cycles)
+                    if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.'):
+                        subdirs.append(entry.path)
+                    continue
+                kind = ConfigDiscovery._NAMES.get(entry.name)
+                if kind is None or (kind == 'config' and root == config_dir):
+                    continue
+                getattr(found, kind).append(os.path.join(root, entry.name))
+            stack.extend(reversed(subdirs))
+        return tuple(stamps), found
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def cached(config_dir: str) -> ConfigFiles:
+        """
+        Résultat de scan() mis en cache, revalidé par un stat de chaque répertoire visité.
+        Le même objet est retourné tant que l'arborescence n'a pas changé : ne pas le modifier.
+        Args:
+            config_dir (str): Répertoire racine de la configuration.
+        Returns:
+            ConfigFiles: Listes de chemins par type de fichier.
+        """
+        key = os.path.abspath(config_dir)
+        cached = ConfigDiscovery._cache.get(key)
+        if cached is not None and all(ConfigDiscovery._mtime(d) == m for d, m in cached[0]):
+            return cached[1]
+        stamps, found = ConfigDiscovery._walk(config_dir)
+        with ConfigDiscovery._lock:
+            ConfigDiscovery._cache[key] = (stamps, found)
+        return found
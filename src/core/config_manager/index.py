@@ -0,0 +1,81 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+Path = Tuple[str, ...]
+
+
+class ConfigIndex:
+    """
+    Index inverse d'un arbre de configuration, construit une fois par génération.
+    - clé -> sections racines qui la contiennent (recherche « aplatie »)
+    - chemin pointé (`memApp.database.port`) -> chemin de clés
+    Les deux recherches se font en O(1) par clé.
+    """
+    def __init__(self, tree: Any):
+        self.tree = tree
+        self._sections: Dict[Any, List[Any]] = {}
+        self._paths: Dict[str, Path] = {}
+        if isinstance(tree, dict):
+            for section, value in tree.items():
+                if isinstance(value, dict):
+                    for key in value:
+                        self._sections.setdefault(key, []).append(section)
+            self._index_paths(tree)
+
+    def _index_paths(self, tree: Dict[str, Any]) -> None:
+        stack = [(tree, ())]
+        while stack:
+            node, path = stack.pop()
+            for key, value in node.items():
+                sub = path + (key,)
+                dotted = '.'.join(str(p) for p in sub)
+                self._paths.setdefault(dotted, sub)
+                if isinstance(value, dict):
+                    stack.append((value, sub))
+
+    def sections(self, key: Any) -> List[Any]:
+        """Sections racines contenant la clé, dans l'ordre de la configuration."""
+        return self._sections.get(key, [])
+
+    def section_of(self, key: Any) -> Optional[Any]:
+        """
+        Section retenue pour une recherche aplatie : la dernière qui contient la clé.
+        Returns:
+            Section, ou None si la clé est absente.
+        """
+        sections = self._sections.get(key)
+        return sections[-1] if sections else None
+
+    def path(self, dotted: str) -> Optional[Path]:
+        """Chemin de clés correspondant à un chemin pointé, ou None."""
+        return self._paths.get(dotted)
+
+    def ambiguous(self) -> Dict[Any, List[Any]]:
+        """
+        Clés présentes dans plusieurs sections racines.
+        Returns:
+            dict: clé -> liste des sections qui la contiennent.
+        """
+        return {k: list(v) for k, v in self._sections.items() if len(v) > 1}
+
+
+_indexes: Dict[str, ConfigIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def index_for(key: str, tree: Any) -> ConfigIndex:
+    """
+    Retourne l'index d'un arbre, reconstruit seulement quand la source produit un nouvel arbre.
+    Args:
+        key (str): Identifiant de la source (chemin du fichier).
+        tree (Any): Arbre de configuration.
+    Returns:
+        ConfigIndex: index de l'arbre.
+    """
+    index = _indexes.get(key)
+    if index is not None and index.tree is tree:
+        return index
+    index = ConfigIndex(tree)
+    with _indexes_lock:
+        _indexes[key] = index
+    return index
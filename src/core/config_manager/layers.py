@@ -0,0 +1,396 @@
+import os
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from src.utils import serialization
+from src.utils.frozen import FrozenDict, freeze, merge_many
+from .substitution import MISSING, Template
+
+# Résolution par couches, de la moins à la plus prioritaire :
+#   builtin (src/core/defaults.py) < defaults (defaults.yml fusionnés) < config (snapshot) < env
+# Sémantique identique à une fusion profonde des couches dans cet ordre (merge_many), mais
+# sans la matérialiser : chaque lecture descend les couches de la plus prioritaire à la moins
+# prioritaire et s'arrête dès que la valeur est déterminée.
+# Surcharges d'environnement : MEMAPP__memApp__database__port=6543 (valeur lue en YAML).
+
+ENV_PREFIX = 'MEMAPP__'
+ENV_SEPARATOR = '__'
+
+Path = Union[str, Tuple[Any, ...]]
+
+# Résultat de la descente d'une couche le long d'un chemin
+FOUND, ABSENT, BLOCKED = 'found', 'absent', 'blocked'
+
+_EMPTY = FrozenDict()
+
+
+def _parts(path: Path) -> Tuple[Any, ...]:
+    if isinstance(path, str):
+        return tuple(path.split('.')) if path else ()
+    return tuple(path)
+
+
+def _walk(tree: Any, path: Tuple[Any, ...]) -> Tuple[str, Any]:
+    """
+    Descend un arbre : (FOUND, valeur), (ABSENT, None) ou (BLOCKED, None) si une valeur
+    non-dict coupe le chemin.
+    """
+    node = tree
+    for part in path:
+        if not isinstance(node, Mapping):
+            return BLOCKED, None
+        node = node.get(part, MISSING)
+        if node is MISSING:
+            return ABSENT, None
+    return FOUND, node
+
+
+class EnvOverrides:
+    """
+    Couche des surcharges d'environnement : la variable PREFIX + clés jointes par '__'
+    fixe la valeur du chemin (la plus spécifique l'emporte). Une valeur dict (YAML en
+    ligne) est fusionnée avec les couches inférieures comme n'importe quelle couche.
+    Une variable située sous une valeur non-dict des couches fichiers est ignorée.
+    Les noms des variables préfixées sont indexés (chemin -> clés filles) et réindexés
+    quand le nombre de variables d'environnement change (refresh() après un renommage à
+    nombre constant) ; les valeurs sont toujours relues dans l'environnement.
+    """
+    def __init__(self, prefix: str = ENV_PREFIX, environ: Optional[Mapping] = None):
+        self.prefix = prefix
+        self.environ = os.environ if environ is None else environ
+        self._parsed: Dict[str, Any] = {}
+        self._size = -1
+        self._children: Dict[Tuple[str, ...], Dict[str, None]] = {}
+        self._names: Dict[Tuple[str, ...], str] = {}
+
+    def name(self, path: Tuple[Any, ...]) -> str:
+        return self.prefix + ENV_SEPARATOR.join(str(part) for part in path)
+
+    def refresh(self) -> None:
+        """Réindexe les variables préfixées."""
+        children: Dict[Tuple[str, ...], Dict[str, None]] = {}
+        names: Dict[Tuple[str, ...], str] = {}
+        size = len(self.environ)
+        for name in list(self.environ):
+            if not name.startswith(self.prefix) or len(name) == len(self.prefix):
+                continue
+            parts = tuple(name[len(self.prefix):].split(ENV_SEPARATOR))
+            names[parts] = name
+            for depth in range(len(parts)):
+                children.setdefault(parts[:depth], {})[parts[depth]] = None
+        self._children, self._names, self._size = children, names, size
+
+    def _index(self) -> Dict[Tuple[str, ...], str]:
+        if len(self.environ) != self._size:
+            self.refresh()
+        return self._names
+
+    def _value(self, raw: str) -> Any:
+        value = self._parsed.get(raw, MISSING)
+        if value is MISSING:
+            try:
+                value = freeze(serialization.loads(raw))
+            except Exception:
+                value = raw
+            if len(self._parsed) > 1024:
+                self._parsed.clear()
+            self._parsed[raw] = value
+        return value
+
+    def walk(self, path: Tuple[Any, ...]) -> Tuple[str, Any]:
+        names = self._index()
+        if not names:
+            return ABSENT, None
+        key = tuple(part if type(part) is str else str(part) for part in path)
+        for depth in range(len(key), 0, -1):
+            name = names.get(key[:depth])
+            if name is not None:
+                raw = self.environ.get(name)
+                if raw is not None:
+                    return _walk(self._value(raw), path[depth:])
+        return ABSENT, None
+
+    def keys(self, path: Tuple[Any, ...]) -> List[Any]:
+        """Clés surchargées directement sous `path`."""
+        self._index()
+        key = tuple(part if type(part) is str else str(part) for part in path)
+        return list(self._children.get(key, ()))
+
+
+class _Layer:
+    __slots__ = ('name', 'tree')
+
+    def __init__(self, name: str, tree: Any):
+        self.name = name
+        self.tree = tree
+
+    def walk(self, path: Tuple[Any, ...]) -> Tuple[str, Any]:
+        if isinstance(self.tree, EnvOverrides):
+            return self.tree.walk(path)
+        return _walk(self.tree, path)
+
+    def keys(self, path: Tuple[Any, ...], value: Any) -> List[Any]:
+        keys = list(value) if isinstance(value, Mapping) else []
+        if isinstance(self.tree, EnvOverrides):
+            keys.extend(k for k in self.tree.keys(path) if k not in keys)
+        return keys
+
+
+class LayeredConfig:
+    """
+    Résolveur par couches, sans copie : équivalent à une fusion profonde des couches
+    (la dernière l'emporte, puis la couche d'environnement), évalué paresseusement à
+    chaque lecture.
+    - get(path) : valeur (feuille substituée `${VAR}`) ou vue LayeredView d'un sous-arbre
+    - source(path) / explain(path) : couche d'où provient chaque valeur
+    - materialize(path) : arbre fusionné gelé, si une copie est réellement nécessaire
+    Les résolutions des couches fichiers sont mises en cache par chemin pour la durée de
+    vie du résolveur (une génération) ; la couche d'environnement est relue à chaque fois.
+    `substitute=False` retourne les feuilles telles quelles (couches déjà substituées).
+    """
+    def __init__(self, layers: Sequence[Tuple[str, Any]], env: Optional[EnvOverrides] = None,
+                 generation: int = 0, substitute: bool = True):
+        self.substitute = substitute
+        self._static = [_Layer(name, tree) for name, tree in layers]
+        self._env = _Layer('env', env) if env is not None else None
+        self.layers = self._static + ([self._env] if self._env is not None else [])
+        self.generation = generation
+        self._cache: Dict[Tuple[Any, ...], Tuple[str, Any, Any]] = {}
+        self._templates: Dict[str, Template] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> List[str]:
+        """Noms des couches, de la moins à la plus prioritaire."""
+        return [layer.name for layer in self.layers]
+
+    @staticmethod
+    def _resolve_layers(layers: Sequence[_Layer], path: Tuple[Any, ...]) -> Tuple[str, Any, Any]:
+        """
+        Descend les couches de la plus prioritaire à la moins prioritaire ; une valeur
+        non-dict sur un préfixe du chemin masque les couches inférieures.
+        Returns:
+            tuple: (FOUND, valeur, couche) pour une feuille ; (dict, [(couche, sous-arbre)...]
+            de la moins à la plus prioritaire, None) pour un sous-arbre ; (ABSENT, None, None).
+        """
+        dicts = []
+        for layer in reversed(layers):
+            status, value = layer.walk(path)
+            if status == BLOCKED:
+                break
+            if status == ABSENT:
+                continue
+            if isinstance(value, Mapping):
+                dicts.append((layer, value))
+                continue
+            if not dicts:
+                return FOUND, value, layer
+            break
+        if dicts:
+            dicts.reverse()
+            return 'dict', dicts, None
+        return ABSENT, None, None
+
+    def _static_resolution(self, path: Tuple[Any, ...]) -> Tuple[str, Any, Any]:
+        cached = self._cache.get(path)
+        if cached is None:
+            cached = self._resolve_layers(self._static, path)
+            with self._lock:
+                self._cache[path] = cached
+        return cached
+
+    def _resolution(self, path: Tuple[Any, ...]) -> Tuple[str, Any, Any]:
+        env = self._env
+        if env is None:
+            return self._static_resolution(path)
+        status, value = env.walk(path)
+        if status == ABSENT:
+            resolved = self._static_resolution(path)
+            if resolved[0] == ABSENT and path and env.tree.keys(path):
+                # Chemin créé uniquement par des variables plus profondes
+                return 'dict', [(env, _EMPTY)], None
+            return resolved
+        if status == BLOCKED:
+            return ABSENT, None, None
+        if not isinstance(value, Mapping):
+            return FOUND, value, env
+        kind, below, _ = self._static_resolution(path)
+        return 'dict', (below if kind == 'dict' else []) + [(env, value)], None
+
+    def _render(self, value: Any) -> Any:
+        if not self.substitute or not Template.needed(value):
+            return value
+        template = self._templates.get(value)
+        if template is None:
+            template = self._templates[value] = Template(value)
+        return template.render()
+
+    def get(self, path: Path = (), default: Any = None) -> Any:
+        """
+        Valeur effective d'un chemin.
+        Args:
+            path (str | tuple): Chemin pointé (`memApp.database.port`) ou tuple ; vide pour
+                la racine.
+            default (Any): Valeur retournée si le chemin n'existe dans aucune couche.
+        Returns:
+            Any: Feuille (variables `${VAR}` substituées) ou LayeredView d'un sous-arbre.
+        """
+        parts = _parts(path)
+        kind, value, _ = self._resolution(parts)
+        if kind == ABSENT:
+            return default
+        if kind == 'dict':
+            return LayeredView(self, parts)
+        return self._render(value)
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self.get((key,), MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def keys_at(self, path: Tuple[Any, ...]) -> List[Any]:
+        """Clés effectives d'un sous-arbre, dans l'ordre d'une fusion des couches."""
+        kind, value, _ = self._resolution(path)
+        if kind != 'dict':
+            return []
+        keys: Dict[Any, None] = {}
+        for layer, tree in value:
+            for key in layer.keys(path, tree):
+                keys.setdefault(key, None)
+        env = self._env
+        if env is not None and all(layer is not env for layer, _ in value):
+            # Variables plus profondes que toute valeur dict de l'environnement
+            for key in env.keys(path, None):
+                if key not in keys and self._resolution(path + (key,))[0] != ABSENT:
+                    keys[key] = None
+        return list(keys)
+
+    def source(self, path: Path) -> Optional[str]:
+        """
+        Couche qui fournit la valeur d'un chemin.
+        Returns:
+            str: Nom de la couche (pour un sous-arbre : la plus prioritaire qui y contribue),
+            ou None si le chemin n'existe pas.
+        """
+        kind, value, layer = self._resolution(_parts(path))
+        if kind == ABSENT:
+            return None
+        if kind == 'dict':
+            return value[-1][0].name
+        return layer.name
+
+    def explain(self, path: Path = ()) -> Dict[str, str]:
+        """
+        Couche d'origine de chaque feuille sous un chemin.
+        Args:
+            path (str | tuple): Chemin pointé ; vide pour toute la configuration.
+        Returns:
+            dict: chemin pointé de la feuille -> nom de la couche.
+        """
+        out = {}
+        stack = [_parts(path)]
+        while stack:
+            parts = stack.pop()
+            kind, value, layer = self._resolution(parts)
+            if kind == 'dict':
+                stack.extend(parts + (key,) for key in reversed(self.keys_at(parts)))
+            elif kind == FOUND:
+                out['.'.join(str(p) for p in parts)] = layer.name
+        return out
+
+    def trace(self, path: Path) -> List[Tuple[str, Any]]:
+        """
+        Valeur de chaque couche pour un chemin (débogage), de la moins à la plus prioritaire.
+        Returns:
+            list: (couche, valeur brute) pour chaque couche qui définit le chemin.
+        """
+        parts = _parts(path)
+        out = []
+        for layer in self.layers:
+            status, value = layer.walk(parts)
+            if status == FOUND:
+                out.append((layer.name, value))
+        return out
+
+    def materialize(self, path: Path = ()) -> Any:
+        """
+        Arbre fusionné gelé d'un chemin (équivalent à merge_many des couches).
+        Args:
+            path (str | tuple): Chemin pointé ; vide pour la racine.
+        Returns:
+            Any: FrozenDict pour un sous-arbre, feuille sinon ; None si absent.
+        """
+        parts = _parts(path)
+        kind, value, _ = self._resolution(parts)
+        if kind == ABSENT:
+            return None
+        if kind == FOUND:
+            return self._render(value)
+        env = self._env
+        trees = [tree for layer, tree in value if layer is not env]
+        if env is not None:
+            overrides = self._env_tree(parts, value)
+            if overrides:
+                trees.append(overrides)
+        return merge_many(trees)
+
+    def _env_tree(self, path: Tuple[Any, ...], value: List[Tuple[_Layer, Any]]) -> Any:
+        """
+        Apport de la couche d'environnement sous `path` : valeur dict éventuelle, puis
+        variables plus profondes non masquées.
+        """
+        env = self._env
+        sources = [tree for layer, tree in value if layer is env]
+        for key in env.tree.keys(path):
+            kind, child, layer = self._resolution(path + (key,))
+            if kind == FOUND and layer is env:
+                sources.append({key: child})
+            elif kind == 'dict':
+                sub = self._env_tree(path + (key,), child)
+                if sub:
+                    sources.append({key: sub})
+        return merge_many(sources) if sources else None
+
+
+class LayeredView(Mapping):
+    """
+    Vue en lecture seule d'un sous-arbre résolu par couches (aucune copie).
+    view['database']['port'], view.get('database.port'), dict(view), view.source('port')...
+    """
+    __slots__ = ('_resolver', '_path')
+
+    def __init__(self, resolver: LayeredConfig, path: Tuple[Any, ...]):
+        self._resolver = resolver
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        return '.'.join(str(p) for p in self._path)
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._resolver.get(self._path + (key,), MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, path: Any, default: Any = None) -> Any:
+        return self._resolver.get(self._path + _parts(path), default)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._resolver.keys_at(self._path))
+
+    def __len__(self) -> int:
+        return len(self._resolver.keys_at(self._path))
+
+    def source(self, path: Path = ()) -> Optional[str]:
+        return self._resolver.source(self._path + _parts(path))
+
+    def explain(self, path: Path = ()) -> Dict[str, str]:
+        return self._resolver.explain(self._path + _parts(path))
+
+    def materialize(self, path: Path = ()) -> Any:
+        return self._resolver.materialize(self._path + _parts(path))
+
+    def __repr__(self):
+        return f"LayeredView({self.path or '<root>'}, layers={self._resolver.names})"
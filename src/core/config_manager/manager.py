@@ -1,43 +1,169 @@
 import os
+import hashlib
+import threading
 import yaml
+from collections.abc import Mapping
+from . import binary
+from .cache import ConfigCache
+from .discovery import ConfigDiscovery
 from .validation import ConfigValidation
 from .merge import ConfigMerge
-from .reload import ConfigReload
-from ..defaults import get_defaults
+from .models import ConfigModels
+from .index import ConfigIndex, index_for
+from .substitution import MISSING, CompiledSubstitution, compiled_for
+from .reload import ConfigReload, ConfigWatcher, DEFAULT_DEBOUNCE, DEFAULT_MAX_WAIT
+from .broadcast import ConfigBroadcast
+from .merkle import ConfigSubscription, ConfigWatches
+from .layers import EnvOverrides, LayeredConfig, LayeredView
+from .snapshot import ConfigSnapshot, SnapshotPin, SnapshotStore
+from .storage import ConfigStorage, YamlDirStorage
+from .transaction import ConfigTransaction
+from src.core.event_manager import EventManager
 from ..schemas import get_schema
+from ..defaults import get_defaults
 from src.core.exceptions import ConfigException
-from typing import Dict, Any
-from pydantic import BaseModel, ValidationError
-from rich import print as rprint
-from dotenv import load_dotenv
-import glob
+from src.utils import metrics, serialization
+from src.utils.file_tools import atomic_write
+from src.utils.frozen import FrozenDict, freeze, thaw
+from typing import Dict, Any, List, Optional, Union
 
-# Chargement automatique des variables d'environnement
-load_dotenv()
+# pydantic, rich et python-dotenv sont importés à la première utilisation :
+# importer ce module ne doit coûter ni dépendances lourdes ni effet de bord.
 
 CONFIG_DIR = os.path.join(os.path.dirname(__file__), '../../config')
 CONFIG_FULL_PATH = os.path.join(CONFIG_DIR, 'config_full.yml')
+CONFIG_SNAPSHOT_PATH = os.path.join(CONFIG_DIR, 'config_full.bin')
+
+_GET_SECONDS = metrics.histogram('memapp_config_get_seconds', 'Lectures get_config()', ('mode',))
+_WRITE_SECONDS = metrics.histogram('memapp_config_write_seconds',
+                                   'Écritures de fichiers de configuration', ('target',))
 
 def _find_schema_files():
-    return glob.glob(os.path.join(CONFIG_DIR, "**/schema.yml"), recursive=True)
+    return ConfigDiscovery.scan(CONFIG_DIR).schema
 
 def _find_defaults_files():
-    return glob.glob(os.path.join(CONFIG_DIR, "**/defaults.yml"), recursive=True)
+    return ConfigDiscovery.scan(CONFIG_DIR).defaults
+
+def _load_entries(files, label):
+    """Entrées de cache à jour d'une liste de fichiers YAML (parsing parallèle des modifiés)."""
+    try:
+        return ConfigCache.load_many(files)
+    except Exception as e:
+        raise ConfigException(f"Error reading {label}: {e}")
 
-class ServiceConfigModel(BaseModel):
-    # Exemple de modèle Pydantic pour une section de config
-    enabled: bool = True
-    interval: int = 10
-    log_path: str = '/var/log/memapp/service.log'
+def _load_all(files, label):
+    """Charge une liste de fichiers YAML via le cache (parsing parallèle des fichiers modifiés)."""
+    return [entry.data for entry in _load_entries(files, label)]
+
+_service_config_model = None
+
+def _get_service_config_model():
+    """
+    Construit (une fois) le modèle Pydantic d'exemple de la section 'watchdog'.
+    Conservé pour compatibilité : les modèles sont désormais générés depuis les
+    schémas (voir ConfigManager.get_typed()).
+    """
+    global _service_config_model
+    if _service_config_model is None:
+        from pydantic import BaseModel
+
+        class ServiceConfigModel(BaseModel):
+            # Exemple de modèle Pydantic pour une section de config
+            enabled: bool = True
+            interval: int = 10
+            log_path: str = '/var/log/memapp/service.log'
+
+        _service_config_model = ServiceConfigModel
+    return _service_config_model
+
+def __getattr__(name):
+    # Accès différé à ServiceConfigModel (PEP 562)
+    if name == 'ServiceConfigModel':
+        return _get_service_config_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 class ConfigManager:
     """
     Gestionnaire centralisé des configurations.
     - Fusionne tous les fichiers config.yml de src/config/*/
     - Exclut config_full.yml
-    - Met à jour et lit le fichier fusionné
+    - Met à jour et lit le fichier fusionné, publié sous forme de snapshots versionnés
+      (lecture sans verrou, échange atomique, épinglage par requête : voir pin())
     - Permet la gestion fine des arguments et sections
+    - Publie les changements sur `ConfigManager.events` (topic `config.changed`)
     """
+    events = EventManager()
+    _env_loaded = False
+    _typed: Dict[Optional[str], tuple] = {}
+    _typed_lock = threading.Lock()
+    _watches = ConfigWatches()
+    _snapshots = SnapshotStore(listeners=[_watches.notify])
+    _layered: Optional[tuple] = None
+    _storage: ConfigStorage = YamlDirStorage()
+
+    @staticmethod
+    def set_config_dir(path: str) -> str:
+        """
+        Change le répertoire de configuration du processus (benchmarks, outils, bacs à sable).
+        config_full.yml et config_full.bin suivent le nouveau répertoire ; le cache et
+        la fusion incrémentale sont réinitialisés.
+        Args:
+            path (str): Nouveau répertoire de configuration.
+        Returns:
+            str: Ancien répertoire, pour restauration.
+        """
+        global CONFIG_DIR, CONFIG_FULL_PATH, CONFIG_SNAPSHOT_PATH
+        from . import broadcast, merge, reload, storage
+        previous = CONFIG_DIR
+        CONFIG_DIR = path
+        CONFIG_FULL_PATH = os.path.join(path, 'config_full.yml')
+        CONFIG_SNAPSHOT_PATH = os.path.join(path, 'config_full.bin')
+        merge.CONFIG_DIR = reload.CONFIG_DIR = broadcast.CONFIG_DIR = storage.CONFIG_DIR = path
+        ConfigMerge.engine.reset()
+        ConfigCache.invalidate()
+        ConfigManager._snapshots.reset()
+        return previous
+
+    @staticmethod
+    def set_storage(storage: Optional[ConfigStorage] = None) -> ConfigStorage:
+        """
+        Change le stockage des configurations de service (YamlDirStorage par défaut).
+        Exemple :
+            ConfigManager.set_storage(SqliteStorage('config.db').import_yaml())
+        config_full.yml, config_full.bin, les schémas et les defaults restent dans CONFIG_DIR.
+        Args:
+            storage (ConfigStorage): Nouveau stockage ; None pour revenir à l'arborescence YAML.
+        Returns:
+            ConfigStorage: Stockage précédent, pour restauration.
+        """
+        previous = ConfigManager._storage
+        with ConfigManager._snapshots.writing():
+            ConfigManager._storage = storage if storage is not None else YamlDirStorage()
+            ConfigManager._snapshots.reset()
+        return previous
+
+    @staticmethod
+    def storage() -> ConfigStorage:
+        """Stockage courant des configurations de service."""
+        return ConfigManager._storage
+
+    @staticmethod
+    def load_env(path: str = None, override: bool = False) -> bool:
+        """
+        Charge le fichier .env dans l'environnement (une seule fois par processus).
+        Appelé automatiquement à la première lecture via get_config().
+        Args:
+            path (str): Chemin du fichier .env (recherche automatique si None).
+            override (bool): Écraser les variables déjà définies.
+        Returns:
+            bool: True si un fichier a été chargé lors de cet appel.
+        """
+        if ConfigManager._env_loaded and path is None:
+            return False
+        from dotenv import load_dotenv
+        ConfigManager._env_loaded = True
+        return load_dotenv(path, override=override)
+
     @staticmethod
     def validate_config(config: dict, schema: dict) -> bool:
         """
@@ -57,86 +183,354 @@ class ConfigManager:
         Args:
             service (str): Nom du service/module.
             section (str): Section à extraire.
-            keys (list): Liste d'arguments à extraire.
+            keys (list): Liste d'arguments à extraire ; sans section, une clé pointée
+                (`memApp.database.port`) désigne un chemin complet.
             multi_sections (list): Liste de sections à extraire.
             with_section (bool): Inclure la section racine ou non.
-            defaults (dict): Valeurs par défaut à appliquer si manquantes.
+            defaults (dict): Valeurs par défaut à appliquer si manquantes : couche inférieure
+                d'un LayeredConfig, sans fusion ; les sous-arbres sont alors des LayeredView
+                (Mapping en lecture seule, dict(view) ou view.materialize() pour une copie).
+        Les variables d'environnement (`$VAR`, `${VAR}`, `${VAR:-défaut}`) ne sont
+        substituées que dans la partie sélectionnée. Les sous-arbres retournés sont
+        partagés avec le cache et gelés (FrozenDict) : frozen.thaw() en donne une copie
+        modifiable (voir aussi get_service_config/get_full_config).
+        Changement incompatible : le résultat était auparavant un dict modifiable ; un
+        appelant qui le modifie sur place (`cfg['port'] = ...`, `setdefault`, `update`)
+        lève désormais TypeError et doit d'abord appeler thaw().
         Returns:
             dict: Configuration extraite.
         """
-        config = {}
-        if service:
-            config = ConfigManager.get_service_config(service)
-        else:
-            config = ConfigManager.get_full_config()
-        def substitute_env(val):
-            if isinstance(val, str) and val.startswith('$'):
-                return os.environ.get(val[1:], val)
-            return val
-        def recursive_substitute(d):
-            if isinstance(d, dict):
-                return {k: recursive_substitute(v) for k, v in d.items()}
-            elif isinstance(d, list):
-                return [recursive_substitute(v) for v in d]
-            else:
-                return substitute_env(d)
-        config = recursive_substitute(config)
-        if defaults:
-            config = ConfigMerge.deep_merge_dicts(defaults, config)
-        if multi_sections:
-            result = {s: config.get(s, {}) for s in multi_sections}
+        mode = ('multi_sections' if multi_sections else 'section' if section
+                else 'keys' if keys else 'full')
+        with _GET_SECONDS.time(mode):
+            return ConfigManager._select_config(service, section, keys, multi_sections,
+                                                with_section, defaults)
+
+    @staticmethod
+    def _select_config(service, section, keys, multi_sections, with_section, defaults) -> dict:
+        """Sélection et substitution de get_config(), hors instrumentation."""
+        if not ConfigManager._env_loaded:
+            ConfigManager.load_env()
+        compiled = ConfigManager._compiled_config(service)
+        tree = compiled.tree
+        # defaults : couche inférieure d'un résolveur par couches, résolu à l'accès (sans fusion)
+        layered = (LayeredConfig([('defaults', defaults), ('config', compiled.sections())],
+                                 substitute=False) if defaults else None)
+
+        def section_value(s):
+            if layered is not None:
+                return layered.get((s,), {})
+            value = compiled.resolve((s,))
+            return {} if value is MISSING else value
+
+        def pick(s):
+            if keys and layered is None and isinstance(tree.get(s), dict):
+                # Seules les clés demandées sont substituées
+                return {k: compiled.resolve((s, k)) for k in keys if k in tree[s]}
+            sect = section_value(s)
             if keys:
-                for s in result:
-                    result[s] = {k: result[s].get(k) for k in keys if k in result[s]}
-            return result
+                sect = {k: sect[k] for k in keys if k in sect}
+            return sect
+
+        if multi_sections:
+            return {s: pick(s) for s in multi_sections}
         if section:
-            sect = config.get(section, {})
-            if keys:
-                sect = {k: sect.get(k) for k in keys if k in sect}
+            sect = pick(section)
             return {section: sect} if with_section else sect
+        if keys and layered is None:
+            index = index_for(ConfigManager._source_key(service), tree)
+            flat = {}
+            for k in keys:
+                path = index.path(k) if isinstance(k, str) and '.' in k else None
+                if path is not None:
+                    flat[k] = compiled.resolve(path)
+                    continue
+                sect = index.section_of(k)
+                if sect is not None:
+                    flat[k] = compiled.resolve((sect, k))
+            return flat
+        if layered is None:
+            return compiled.resolve(())
+        config = layered.get(())
         if keys:
             flat = {}
             for k in keys:
+                if isinstance(k, str) and '.' in k:
+                    value = layered.get(tuple(k.split('.')), MISSING)
+                    if value is not MISSING:
+                        flat[k] = value
+                        continue
                 for sect in config:
-                    if k in config[sect]:
-                        flat[k] = config[sect][k]
+                    value = config[sect]
+                    if isinstance(value, Mapping) and k in value:
+                        flat[k] = value[k]
             return flat
         return config
 
     @staticmethod
-    def reload_on_change(callback=None):
+    def _source_key(service: str = None) -> str:
+        """Chemin du fichier source d'un service, ou de la configuration globale."""
+        return os.path.join(CONFIG_DIR, service, 'config.yml') if service else CONFIG_FULL_PATH
+
+    @staticmethod
+    def _compiled_config(service: str = None) -> CompiledSubstitution:
+        """Retourne la substitution compilée de la configuration d'un service ou globale."""
+        tree = (ConfigManager._read_service_config(service) if service
+                else ConfigManager._read_full_config())
+        return compiled_for(ConfigManager._source_key(service), tree)
+
+    @staticmethod
+    def serialization_backend() -> Dict[str, Any]:
+        """
+        Décrit le backend YAML actif (libyaml ou Python pur, cache JSON).
+        Returns:
+            dict: loader, dumper, libyaml, sidecar et compteurs.
+        """
+        return serialization.backend_info()
+
+    @staticmethod
+    def get_index(service: str = None) -> ConfigIndex:
+        """
+        Retourne l'index des clés de la configuration (reconstruit à chaque rechargement).
+        Args:
+            service (str): Nom du service/module, ou None pour la configuration globale.
+        Returns:
+            ConfigIndex: index clé -> sections et chemins pointés.
+        """
+        return index_for(ConfigManager._source_key(service),
+                         ConfigManager._compiled_config(service).tree)
+
+    @staticmethod
+    def ambiguous_keys(service: str = None) -> Dict[str, list]:
+        """
+        Liste les clés présentes dans plusieurs sections (recherche aplatie ambiguë).
+        Returns:
+            dict: clé -> sections qui la contiennent.
+        """
+        return ConfigManager.get_index(service).ambiguous()
+
+    @staticmethod
+    def reload_on_change(callback=None, debounce: float = DEFAULT_DEBOUNCE,
+                         shared: bool = False, max_wait: float = DEFAULT_MAX_WAIT
+                         ) -> Union[ConfigWatcher, ConfigBroadcast]:
         """
         Active la surveillance dynamique des fichiers de configuration.
+        Les événements sont regroupés sur `debounce` secondes ; chaque lot régénère
+        config_full.yml une seule fois puis appelle le callback.
+        Avec `shared=True` (workers d'un même hôte), un seul processus surveille et fusionne ;
+        les autres reçoivent le nouveau snapshot par socket Unix (voir ConfigBroadcast).
         Args:
-            callback (callable): Fonction à appeler en cas de modification.
+            callback (callable): Fonction à appeler en cas de modification (reçoit un
+                ConfigChangeEvent).
+            debounce (float): Fenêtre de regroupement des événements, en secondes.
+            shared (bool): Mode leader/follower entre processus.
+            max_wait (float): Délai maximal entre le premier événement d'un lot et son
+                traitement, même si les écritures continuent.
+        Returns:
+            ConfigWatcher | ConfigBroadcast: surveillance démarrée, à arrêter via stop() ou `with`.
+        """
+        if shared:
+            return ConfigBroadcast(callback, debounce=debounce, merge=ConfigManager._reload_merge,
+                                   export=ConfigManager._export_snapshot,
+                                   apply=ConfigManager._apply_snapshot,
+                                   config_dir=CONFIG_DIR, max_wait=max_wait).start()
+        return ConfigReload.reload_on_change(callback, debounce=debounce,
+                                             merge=ConfigManager._reload_merge,
+                                             max_wait=max_wait,
+                                             generation=ConfigManager.generation)
+
+    @staticmethod
+    def _export_snapshot(services: Optional[List[str]] = None) -> Dict[str, Any]:
         """
-        ConfigReload.reload_on_change(callback)
+        Décrit le snapshot courant pour un autre processus (ConfigBroadcast) : configuration
+        fusionnée et, pour chaque service demandé (tous si None), arbre, empreinte et
+        signature disque de son config.yml (None si le fichier a disparu). Un arbre non
+        sérialisable en JSON n'est pas transmis : le destinataire relira le disque.
+        """
+        snapshot = ConfigManager.snapshot()
+        names = list(snapshot.services) if services is None else services
+        files = {}
+        for name in names:
+            path = os.path.join(CONFIG_DIR, name, 'config.yml')
+            try:
+                entry = ConfigCache.get_entry(path)
+            except FileNotFoundError:
+                files[name] = None
+                continue
+            except Exception as e:
+                raise ConfigException(f"Erreur lecture config {name}: {e}")
+            files[name] = {'signature': list(entry.signature), 'digest': entry.digest,
+                           'data': entry.data}
+        message = {'generation': snapshot.generation, 'digest': snapshot.digest,
+                   'signature': list(snapshot.signature), 'full': services is None}
+        if serialization.json_safe(snapshot.config) and serialization.json_safe(files):
+            message['config'] = snapshot.config
+            message['services'] = files
+        return message
+
+    @staticmethod
+    def _apply_snapshot(message: Dict[str, Any]) -> None:
+        """
+        Publie un snapshot reçu d'un autre processus (voir _export_snapshot()) : le cache
+        est alimenté avec les arbres reçus, sans lecture ni parsing local.
+        """
+        ConfigManager._layered = None
+        if 'config' not in message:
+            ConfigCache.invalidate()
+            ConfigManager._published()
+            return
+        with ConfigManager._snapshots.writing():
+            current = ConfigManager._snapshots.current()
+            services = {} if message['full'] or current is None else dict(current.services)
+            for name, item in message['services'].items():
+                path = os.path.join(CONFIG_DIR, name, 'config.yml')
+                if item is None:
+                    ConfigCache.invalidate(path)
+                    services.pop(name, None)
+                    continue
+                entry = ConfigCache.store(path, tuple(item['signature']), item['digest'],
+                                          item['data'])
+                services[name] = entry.data
+            ConfigManager._snapshots.publish(freeze(message['config']), message['digest'],
+                                             tuple(message['signature']), FrozenDict(services),
+                                             generation=message['generation'])
+
+    @staticmethod
+    def _reload_merge() -> Dict[str, Any]:
+        """Fusion déclenchée par le reload : met à jour config_full.yml et retourne la fusion."""
+        # Un lot peut ne toucher qu'un defaults.yml, sans nouvelle génération
+        ConfigManager._layered = None
+        ConfigManager.update_full_config()
+        return ConfigManager.snapshot().config
 
     @staticmethod
     def get_service_config(service: str) -> Dict[str, Any]:
         """
         Retourne la configuration d'un service/module spécifique.
+        Args:
+            service (str): Nom du service/module.
+        Returns:
+            dict: Configuration du service (copie modifiable).
+        """
+        return thaw(ConfigManager._read_service_config(service))
+
+    @staticmethod
+    def _read_service_config(service: str) -> Dict[str, Any]:
+        """
+        Lit la configuration d'un service via le cache (arbre partagé et gelé).
         Args:
             service (str): Nom du service/module.
         Returns:
             dict: Configuration du service.
         """
+        pinned = ConfigManager._snapshots.pinned()
+        if pinned is not None and service in pinned.services:
+            return pinned.services[service]
+        if not isinstance(ConfigManager._storage, YamlDirStorage):
+            return ConfigManager._storage.load(service)
         path = os.path.join(CONFIG_DIR, service, 'config.yml')
         if not os.path.exists(path):
             return {}
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f) or {}
-            # Exemple d'utilisation de Pydantic pour valider une section 'watchdog'
-            if 'watchdog' in config:
-                try:
-                    validated = ServiceConfigModel(**config['watchdog'])
-                    rprint(f"[green]Config Watchdog validée :[/green] {validated}")
-                except ValidationError as ve:
-                    rprint(f"[red]Erreur validation Pydantic :[/red] {ve}")
-            return config
+            entry = ConfigCache.get_entry(path)
         except Exception as e:
             raise ConfigException(f"Erreur lecture config {service}: {e}")
+        return entry.data
+
+    @staticmethod
+    def _schema_paths(service: str = None) -> list:
+        """schema.yml d'un service, ou tous (découverte en cache, revalidée par stat)."""
+        if service is None:
+            return ConfigDiscovery.cached(CONFIG_DIR).schema
+        path = os.path.join(CONFIG_DIR, service, 'schema.yml')
+        return [path] if os.path.exists(path) else []
+
+    @staticmethod
+    def service_schema(service: str = None) -> Dict[str, Any]:
+        """
+        Arbre de schémas d'un service (ou de la configuration globale) : entrées de
+        src/core/schemas.py complétées et surchargées par les fichiers schema.yml.
+        Args:
+            service (str): Nom du service/module, ou None pour la configuration globale.
+        Returns:
+            dict: Arbre de schémas gelé.
+        """
+        python_schema = get_schema(service)
+        sources = []
+        if python_schema:
+            sources.append({service: python_schema} if service else python_schema)
+        sources.extend(_load_all(ConfigManager._schema_paths(service), 'schema'))
+        return ConfigMerge.merge_many(sources)
+
+    @staticmethod
+    def get_typed(service: str = None, section: str = None):
+        """
+        Retourne la configuration sous forme d'objets figés et typés (modèles Pydantic
+        générés depuis les schémas), avec accès par attribut :
+            ConfigManager.get_typed('memApp').memApp.database.port
+        L'instance est validée puis conservée tant que ni le fichier (ni les variables
+        d'environnement qu'il référence) ni le schéma ne changent.
+        Args:
+            service (str): Nom du service/module, ou None pour la configuration globale.
+            section (str): Chemin pointé d'une sous-partie (`memApp.database`).
+        Returns:
+            BaseModel: Instance figée (ou sous-instance/valeur si `section` est fourni).
+        Raises:
+            ConfigException: si la configuration ne respecte pas le schéma.
+        """
+        if not ConfigManager._env_loaded:
+            ConfigManager.load_env()
+        tree = (ConfigManager._read_service_config(service) if service
+                else ConfigManager._read_full_config())
+        instance = ConfigManager._typed_instance(service, tree)
+        return ConfigModels.lookup(instance, section) if section else instance
+
+    @staticmethod
+    def validate(service: str = None) -> bool:
+        """
+        Valide explicitement la configuration d'un service (ou globale) contre ses schémas,
+        via les modèles typés de get_typed(). Les lectures get_config()/get_service_config()
+        ne valident pas : la validation (et l'import de pydantic) n'a lieu qu'à la demande.
+        Args:
+            service (str): Nom du service/module, ou None pour la configuration globale.
+        Returns:
+            bool: True si la configuration respecte le schéma.
+        Raises:
+            ConfigException: si la configuration ne respecte pas le schéma.
+        """
+        ConfigManager.get_typed(service)
+        return True
+
+    @staticmethod
+    def _typed_instance(service: Optional[str], tree: Dict[str, Any]):
+        """Instance typée en cache, reconstruite si l'arbre substitué ou les schémas changent."""
+        resolved = compiled_for(ConfigManager._source_key(service), tree).resolve(())
+        schema_paths = ConfigManager._schema_paths(service)
+        digests = tuple(entry.digest for entry in ConfigCache.load_many(schema_paths))
+        cached = ConfigManager._typed.get(service)
+        if cached is not None and cached[0] is resolved and cached[1] == digests:
+            return cached[2]
+        with ConfigManager._typed_lock:
+            instance = ConfigModels.build(ConfigManager.service_schema(service), resolved,
+                                          service or 'Config')
+            ConfigManager._typed[service] = (resolved, digests, instance)
+        return instance
+
+    @staticmethod
+    def transaction(*services: str) -> ConfigTransaction:
+        """
+        Ouvre une transaction d'écriture groupée sur un ou plusieurs services.
+        Exemple :
+            with ConfigManager.transaction('memApp') as tx:
+                tx.set('database', 'port', 5433)
+                tx.delete('watchdog', 'interval')
+        Args:
+            services (str): Services concernés.
+        Returns:
+            ConfigTransaction: transaction à utiliser avec `with`.
+        """
+        return ConfigTransaction(list(services), CONFIG_DIR, events=ConfigManager.events,
+                                 storage=ConfigManager._storage)
 
     @staticmethod
     def set_service_config_arg(service: str, section: str, key: str, value: Any) -> bool:
@@ -150,24 +544,24 @@ class ConfigManager:
         Returns:
             bool: True si succès, False sinon.
         """
-        path = os.path.join(CONFIG_DIR, service, 'config.yml')
-        config = ConfigManager.get_service_config(service)
-        defaults = get_defaults(service)
-        schema = get_schema(service)
-        if section not in config:
-            config[section] = defaults.get(section, {})
-        config[section][key] = value
-        valid = True
-        if section in schema:
-            valid = ConfigValidation.validate_config({key: value}, {key: schema[section].get(key, {})})
-        if not valid:
-            raise ConfigException(f"Validation échouée pour {service}.{section}.{key}: {value}")
-        try:
-            with open(path, 'w', encoding='utf-8') as f:
-                yaml.safe_dump(config, f)
-            return True
-        except Exception as e:
-            raise ConfigException(f"Erreur écriture config {service}: {e}")
+        with ConfigManager.transaction(service) as tx:
+            tx.set(section, key, value)
+        return True
+
+    @staticmethod
+    def get_service_config_arg(service: str, section: str, key: str, default: Any = None) -> Any:
+        """
+        Lit un argument d'une section du fichier config individuel, sans substitution
+        d'environnement (SQLite : une lecture indexée, sans charger le service).
+        Args:
+            service (str): Nom du service/module.
+            section (str): Section concernée.
+            key (str): Clé à lire.
+            default (Any): Valeur retournée si la clé n'existe pas.
+        Returns:
+            Any: Valeur brute (gelée pour un sous-arbre).
+        """
+        return ConfigManager._storage.get(service, section, key, default)
 
     @staticmethod
     def delete_service_config_arg(service: str, section: str, key: str) -> bool:
@@ -180,17 +574,8 @@ class ConfigManager:
         Returns:
             bool: True si succès, False sinon.
         """
-        path = os.path.join(CONFIG_DIR, service, 'config.yml')
-        config = ConfigManager.get_service_config(service)
-        if section in config and key in config[section]:
-            del config[section][key]
-            try:
-                with open(path, 'w', encoding='utf-8') as f:
-                    yaml.safe_dump(config, f)
-                return True
-            except Exception as e:
-                raise ConfigException(f"Erreur écriture config {service}: {e}")
-        return False
+        with ConfigManager.transaction(service) as tx:
+            return tx.delete(section, key)
 
     @staticmethod
     def delete_service_config_section(service: str, section: str) -> bool:
@@ -202,17 +587,8 @@ class ConfigManager:
         Returns:
             bool: True si succès, False sinon.
         """
-        path = os.path.join(CONFIG_DIR, service, 'config.yml')
-        config = ConfigManager.get_service_config(service)
-        if section in config:
-            del config[section]
-            try:
-                with open(path, 'w', encoding='utf-8') as f:
-                    yaml.safe_dump(config, f)
-                return True
-            except Exception as e:
-                raise ConfigException(f"Erreur écriture config {service}: {e}")
-        return False
+        with ConfigManager.transaction(service) as tx:
+            return tx.delete(section)
 
     @staticmethod
     def _find_config_files() -> list:
@@ -226,21 +602,42 @@ class ConfigManager:
 
     @staticmethod
     def merge_configs() -> Dict[str, Any]:
-        """Fusionne toutes les configurations individuelles."""
+        """Fusionne toutes les configurations individuelles (résultat gelé)."""
         return ConfigMerge.merge_configs()
 
     @staticmethod
     def update_full_config() -> bool:
         """
-        Écrit le fichier de configuration fusionné sur le disque.
+        Écrit le fichier de configuration fusionné sur le disque, ainsi que son
+        snapshot binaire (config_full.bin) destiné aux processus workers, puis publie
+        le nouveau snapshot versionné. L'écriture est atomique (fichier temporaire puis
+        rename) et évitée si le fichier existant est déjà à jour.
         Returns:
             bool: True si succès, False sinon.
         """
-        merged = ConfigManager.merge_configs()
+        with ConfigManager._snapshots.writing():
+            return ConfigManager._write_full_config()
+
+    @staticmethod
+    def _write_full_config() -> bool:
+        """Corps de update_full_config(), sous le verrou d'écriture des snapshots."""
+        merged = ConfigManager._storage.merged()
+        if ConfigManager._full_config_matches(merged):
+            if not os.path.exists(CONFIG_SNAPSHOT_PATH):
+                current = ConfigManager._snapshots.current()
+                generation = current.generation if current is not None else None
+                ConfigManager._write_binary_snapshot(merged, generation)
+            return True
         try:
             os.makedirs(CONFIG_DIR, exist_ok=True)
-            with open(CONFIG_FULL_PATH, 'w', encoding='utf-8') as f:
-                yaml.safe_dump(merged, f)
+            with _WRITE_SECONDS.time('full'):
+                payload = serialization.dumps(merged).encode('utf-8')
+                st = atomic_write(CONFIG_FULL_PATH, payload)
+                ConfigCache.invalidate(CONFIG_FULL_PATH)
+                snapshot = ConfigManager._snapshots.publish(
+                    merged, hashlib.sha1(payload).hexdigest(),
+                    (st.st_mtime_ns, st.st_size, st.st_ino), ConfigManager._service_trees())
+                ConfigManager._write_binary_snapshot(merged, snapshot.generation)
             return True
         except FileNotFoundError:
             raise ConfigException(f"File not found: {CONFIG_FULL_PATH}")
@@ -252,24 +649,223 @@ class ConfigManager:
             raise ConfigException(f"Error writing {CONFIG_FULL_PATH}: {e}")
         return False
 
+    @staticmethod
+    def _write_binary_snapshot(merged: Dict[str, Any], generation: Optional[int] = None) -> None:
+        """
+        Écrit config_full.bin avec la génération du snapshot publié.
+        Un arbre non encodable laisse l'image précédente en place (un avertissement est émis) :
+        la supprimer ferait repartir la génération de 1 au prochain succès.
+        """
+        try:
+            binary.write_snapshot(merged, CONFIG_SNAPSHOT_PATH, generation)
+        except ConfigException as e:
+            print(f"Binary snapshot skipped (previous image kept): {e}")
+
+    @staticmethod
+    def attach_snapshot() -> Optional[binary.BinarySnapshot]:
+        """
+        Attache (mmap en lecture seule) le snapshot binaire de la configuration fusionnée.
+        À appeler avant le fork des workers pour partager les pages mémoire ; chaque appel
+        vérifie par stat si un snapshot plus récent est disponible et le remappe.
+        Exemple :
+            ConfigManager.attach_snapshot().get('memApp.database.port')
+        Returns:
+            BinarySnapshot: lecteur partagé du processus, ou None si le snapshot est indisponible.
+        """
+        if not os.path.exists(CONFIG_SNAPSHOT_PATH):
+            ConfigManager.update_full_config()
+        try:
+            return binary.attach(CONFIG_SNAPSHOT_PATH)
+        except (OSError, ConfigException) as e:
+            raise ConfigException(f"Error attaching {CONFIG_SNAPSHOT_PATH}: {e}")
+
+    @staticmethod
+    def _full_config_matches(merged: Dict[str, Any]) -> bool:
+        """Indique si config_full.yml contient déjà la configuration fusionnée."""
+        try:
+            snapshot = ConfigManager._published()
+        except ConfigException:
+            return False
+        return snapshot is not None and snapshot.config == merged
+
     @staticmethod
     def get_full_config() -> Dict[str, Any]:
         """
         Retourne la configuration fusionnée globale.
+        Returns:
+            dict: Configuration globale (copie modifiable).
+        """
+        return thaw(ConfigManager._read_full_config())
+
+    @staticmethod
+    def _read_full_config() -> Dict[str, Any]:
+        """
+        Lit la configuration fusionnée du snapshot courant (ou épinglé), arbre partagé et gelé.
         Returns:
             dict: Configuration globale.
         """
-        if not os.path.exists(CONFIG_FULL_PATH):
+        return ConfigManager.snapshot().config
+
+    @staticmethod
+    def snapshot() -> ConfigSnapshot:
+        """
+        Retourne le snapshot de configuration vu par le thread courant : le snapshot
+        épinglé s'il y en a un (voir pin()), sinon le dernier publié. La lecture ne prend
+        aucun verrou ; seul un config_full.yml modifié hors de ce processus (signature
+        stat différente) déclenche un rechargement.
+        Returns:
+            ConfigSnapshot: Snapshot immuable (generation, config, services).
+        Raises:
+            ConfigException: si config_full.yml ne peut pas être produit ou lu.
+        """
+        pinned = ConfigManager._snapshots.pinned()
+        if pinned is not None:
+            return pinned
+        snapshot = ConfigManager._published()
+        if snapshot is None:
             ConfigManager.update_full_config()
+            snapshot = ConfigManager._published()
+            if snapshot is None:
+                raise ConfigException(f"File not found: {CONFIG_FULL_PATH}")
+        return snapshot
+
+    @staticmethod
+    def pin() -> SnapshotPin:
+        """
+        Épingle le snapshot courant pour le thread, le temps d'un bloc `with` (ou d'une
+        requête) : get_config(), get_full_config(), get_service_config(), get_typed()...
+        lisent tous la même génération, même si un reload publie entre-temps.
+        Exemple :
+            with ConfigManager.pin() as snapshot:
+                port = ConfigManager.get_config(keys=['memApp.database.port'])
+                snapshot.generation
+        Returns:
+            SnapshotPin: Context manager retournant le ConfigSnapshot épinglé.
+        """
+        return SnapshotPin(ConfigManager._snapshots, ConfigManager.snapshot)
+
+    @staticmethod
+    def generation() -> int:
+        """Numéro de génération du snapshot vu par le thread courant."""
+        return ConfigManager.snapshot().generation
+
+    @staticmethod
+    def watch(path: str, callback) -> ConfigSubscription:
+        """
+        Appelle `callback(change)` chaque fois que la valeur d'un chemin change d'une
+        génération publiée à la suivante (reload, update_full_config(), reload partagé).
+        Seules les branches surveillées dont l'empreinte de Merkle diffère sont comparées.
+        Exemple :
+            sub = ConfigManager.watch('memApp.database.port', lambda c: pool.resize(c.new))
+            sub.cancel()
+        Args:
+            path (str): Chemin pointé (ou tuple de clés).
+            callback (callable): Reçoit un ConfigChange (kind, old, new, generation) ; les
+                valeurs sont brutes, avant substitution des variables d'environnement.
+        Returns:
+            ConfigSubscription: Abonnement (cancel() ou `with`).
+        """
+        ConfigManager.snapshot()  # génération de référence pour la prochaine comparaison
+        return ConfigManager._watches.add(path, callback)
+
+    @staticmethod
+    def layers(service: str = None) -> Union[LayeredConfig, LayeredView, None]:
+        """
+        Configuration effective résolue par couches, sans fusion ni copie :
+        builtin (src/core/defaults.py) < defaults (defaults.yml) < config (snapshot) < env
+        (variables MEMAPP__section__clé, valeur lue en YAML).
+        Exemple :
+            cfg = ConfigManager.layers()
+            cfg.get('memApp.database.port')     # 6543 si MEMAPP__memApp__database__port=6543
+            cfg.source('memApp.database.port')  # 'env'
+        Le résolveur est partagé tant que la génération du snapshot, la liste des fichiers
+        defaults (ConfigDiscovery.cached) et leurs empreintes ne changent pas : un defaults.yml
+        modifié sur place est pris en compte au prochain appel (un stat par fichier).
+        Args:
+            service (str): Section à retourner (vue LayeredView) ; None pour la racine.
+        Returns:
+            LayeredConfig | LayeredView: Résolveur (ou vue de la section), None si la section
+            n'existe pas.
+        """
+        snapshot = ConfigManager.snapshot()
+        found = ConfigDiscovery.cached(CONFIG_DIR)
+        entries = _load_entries(found.defaults, 'defaults')
+        digests = tuple(entry.digest for entry in entries)
+        cached = ConfigManager._layered
+        if (cached is None or cached[0] != snapshot.generation or cached[1] is not found
+                or cached[2] != digests):
+            resolver = LayeredConfig([
+                ('builtin', freeze(get_defaults())),
+                ('defaults', ConfigMerge.merge_many([entry.data for entry in entries])),
+                ('config', snapshot.config),
+            ], env=EnvOverrides(), generation=snapshot.generation)
+            cached = ConfigManager._layered = (snapshot.generation, found, digests, resolver)
+        resolver = cached[3]
+        return resolver if service is None else resolver.get((service,))
+
+    @staticmethod
+    def explain(path: str = '') -> Dict[str, str]:
+        """
+        Couche d'origine (builtin, defaults, config, env) de chaque valeur sous un chemin.
+        Args:
+            path (str): Chemin pointé ; vide pour toute la configuration.
+        Returns:
+            dict: chemin pointé de la feuille -> nom de la couche.
+        """
+        return ConfigManager.layers().explain(path)
+
+    @staticmethod
+    def _published() -> Optional[ConfigSnapshot]:
+        """
+        Dernier snapshot publié s'il correspond encore à config_full.yml (comparaison stat,
+        sans verrou), sinon rechargé depuis le disque ; None si le fichier n'existe pas.
+        """
         try:
-            with open(CONFIG_FULL_PATH, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f) or {}
+            st = os.stat(CONFIG_FULL_PATH)
         except FileNotFoundError:
-            raise ConfigException(f"File not found: {CONFIG_FULL_PATH}")
-        except PermissionError:
-            raise ConfigException(f"Permission denied: {CONFIG_FULL_PATH}")
-        except yaml.YAMLError as e:
-            raise ConfigException(f"YAML error in {CONFIG_FULL_PATH}: {e}")
+            return None
+        except OSError as e:
+            raise ConfigException(f"Error reading {CONFIG_FULL_PATH}: {e}")
+        current = ConfigManager._snapshots.current()
+        if current is not None and current.signature == (st.st_mtime_ns, st.st_size, st.st_ino):
+            return current
+        with ConfigManager._snapshots.writing():
+            try:
+                entry = ConfigCache.get_entry(CONFIG_FULL_PATH)
+            except FileNotFoundError:
+                return None
+            except PermissionError:
+                raise ConfigException(f"Permission denied: {CONFIG_FULL_PATH}")
+            except yaml.YAMLError as e:
+                raise ConfigException(f"YAML error in {CONFIG_FULL_PATH}: {e}")
+            current = ConfigManager._snapshots.current()
+            if current is not None and current.signature == entry.signature:
+                return current
+            services = (None if current is not None and current.digest == entry.digest
+                        else ConfigManager._service_trees())
+            return ConfigManager._snapshots.publish(entry.data, entry.digest, entry.signature,
+                                                    services)
+
+    @staticmethod
+    def _service_trees() -> Dict[str, Any]:
+        """Arbres gelés des configurations de service, par nom de service (via le cache)."""
+        storage = ConfigManager._storage
+        if not isinstance(storage, YamlDirStorage):
+            return FrozenDict((service, storage.load(service)) for service in storage.services())
+        files = ConfigMerge.find_config_files()
+        return FrozenDict(
+            (os.path.relpath(os.path.dirname(path), CONFIG_DIR), data)
+            for path, data in zip(files, _load_all(files, 'config files'))
+        )
+
+    @staticmethod
+    def cache_stats() -> Dict[str, int]:
+        """
+        Retourne les compteurs du cache de configuration.
+        Returns:
+            dict: hits, misses, parses, invalidations, entries, generation.
+        """
+        return ConfigCache.stats()
 
     @staticmethod
     def merge_schemas() -> Dict[str, Any]:
@@ -278,15 +874,7 @@ class ConfigManager:
         Returns:
             dict: Schéma global Cerberus.
         """
-        merged = {}
-        for file in _find_schema_files():
-            try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f) or {}
-                    merged = ConfigMerge.deep_merge_dicts(merged, data)
-            except Exception as e:
-                raise ConfigException(f"Error reading schema {file}: {e}")
-        return merged
+        return thaw(ConfigMerge.merge_many(_load_all(_find_schema_files(), 'schema')))
 
     @staticmethod
     def merge_defaults() -> Dict[str, Any]:
@@ -295,15 +883,7 @@ class ConfigManager:
         Returns:
             dict: Defaults global.
         """
-        merged = {}
-        for file in _find_defaults_files():
-            try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f) or {}
-                    merged = ConfigMerge.deep_merge_dicts(merged, data)
-            except Exception as e:
-                raise ConfigException(f"Error reading defaults {file}: {e}")
-        return merged
+        return thaw(ConfigMerge.merge_many(_load_all(_find_defaults_files(), 'defaults')))
 
     @staticmethod
     def update_global_schema_and_defaults() -> bool:
@@ -314,21 +894,21 @@ class ConfigManager:
         """
         import json
         try:
+            # Un seul parcours du répertoire ; schémas et defaults parsés ensemble
+            found = ConfigDiscovery.scan(CONFIG_DIR)
+            trees = _load_all(found.schema + found.defaults, 'schema/defaults')
+
             # Fusion des schémas
             schema_dict = {}
-            for file in _find_schema_files():
-                with open(file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f) or {}
-                    schema_dict.update(data)
+            for data in trees[:len(found.schema)]:
+                schema_dict.update(data)
             with open(os.path.join(CONFIG_DIR, 'schemas_globale.json'), 'w', encoding='utf-8') as f:
                 json.dump(schema_dict, f, indent=2, ensure_ascii=False)
 
             # Fusion des valeurs par défaut
             defaults_dict = {}
-            for file in _find_defaults_files():
-                with open(file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f) or {}
-                    defaults_dict.update(data)
+            for data in trees[len(found.schema):]:
+                defaults_dict.update(data)
             with open(os.path.join(CONFIG_DIR, 'defaults_globale.json'), 'w', encoding='utf-8') as f:
                 json.dump(defaults_dict, f, indent=2, ensure_ascii=False)
             return True
@@ -1,15 +1,120 @@
 import os
-import yaml
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, List, Tuple
 from src.core.exceptions import ConfigException
+from src.utils import metrics
+from src.utils.frozen import FrozenDict, merge_many
+from .cache import ConfigCache
+from .discovery import ConfigDiscovery
 
 CONFIG_DIR = os.path.join(os.path.dirname(__file__), '../../config')
 
+_MERGE_SECONDS = metrics.histogram('memapp_config_merge_seconds',
+                                   'Fusion incrémentale des config.yml')
+
+class IncrementalMerge:
+    """
+    Moteur de fusion incrémentale des fichiers config.yml.
+    - Conserve la contribution parsée et l'empreinte de chaque fichier
+    - Ne re-parse que les fichiers modifiés (via ConfigCache)
+    - Ne recalcule que les sous-arbres racines touchés par ces fichiers
+    Le résultat est identique à une fusion complète dans le même ordre de fichiers ;
+    il est gelé et partage les sous-arbres non fusionnés avec le cache.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files: List[str] = []
+        self._digests: Dict[str, str] = {}
+        self._contribs: Dict[str, Dict[str, Any]] = {}
+        self._subtrees: Dict[str, Any] = {}
+        self._merged: Dict[str, Any] = FrozenDict()
+
+    def merge(self, files: List[str]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Met à jour la fusion à partir de la liste ordonnée des fichiers.
+        Args:
+            files (list): chemins des fichiers config.yml, dans l'ordre de fusion.
+        Returns:
+            tuple: (configuration fusionnée gelée, True si elle a changé).
+        Raises:
+            ConfigException: en cas d’erreur de lecture.
+        """
+        with _MERGE_SECONDS.time(), self._lock:
+            contribs = {}
+            digests = {}
+            changed_files = []
+            try:
+                entries = ConfigCache.load_many(files)
+            except Exception as e:
+                raise ConfigException(f"Error reading config files: {e}")
+            for file, entry in zip(files, entries):
+                if not isinstance(entry.data, dict):
+                    raise ConfigException(f"Error reading {file}: mapping attendu à la racine")
+                contribs[file] = entry.data
+                digests[file] = entry.digest
+                if self._digests.get(file) != entry.digest:
+                    changed_files.append(file)
+            removed = [f for f in self._files if f not in digests]
+            kept_old = [f for f in self._files if f in digests]
+            kept_new = [f for f in files if f in self._digests]
+            if kept_old != kept_new:
+                # Ordre relatif modifié : recalcul complet
+                affected = None
+            else:
+                affected = set()
+                for file in changed_files + removed:
+                    affected.update(self._contribs.get(file, {}))
+                    affected.update(contribs.get(file, {}))
+
+            self._files = list(files)
+            self._digests = digests
+            self._contribs = contribs
+            if affected is not None and not affected:
+                return self._merged, False
+
+            keys = []
+            seen = set()
+            for file in files:
+                for k in contribs[file]:
+                    if k not in seen:
+                        seen.add(k)
+                        keys.append(k)
+            changed = list(self._merged) != keys
+            subtrees = {}
+            for k in keys:
+                if affected is not None and k not in affected and k in self._subtrees:
+                    subtrees[k] = self._subtrees[k]
+                    continue
+                value = self._merge_key(k, files, contribs)
+                if not changed and (k not in self._subtrees or self._subtrees[k] != value):
+                    changed = True
+                subtrees[k] = value
+            self._subtrees = subtrees
+            if changed:
+                self._merged = FrozenDict(subtrees)
+            return self._merged, changed
+
+    @staticmethod
+    def _merge_key(key: str, files: List[str], contribs: Dict[str, Dict[str, Any]]) -> Any:
+        """Fusionne en une passe les contributions d'une clé racine, dans l'ordre des fichiers."""
+        return merge_many(contribs[file][key] for file in files if key in contribs[file])
+
+    def reset(self) -> None:
+        """Oublie l'état accumulé ; la prochaine fusion sera complète."""
+        with self._lock:
+            self._files = []
+            self._digests = {}
+            self._contribs = {}
+            self._subtrees = {}
+            self._merged = FrozenDict()
+
+
 class ConfigMerge:
     """
     Module de fusion profonde et extraction des configurations.
     - Recherche tous les fichiers config.yml individuels
-    - Fusionne récursivement les dictionnaires
+    - Fusionne les dictionnaires (k-way, itératif, avec partage des sous-arbres)
+    Les résultats sont gelés (FrozenDict) : utiliser frozen.thaw() pour les modifier.
     """
     @staticmethod
     def find_config_files() -> list:
@@ -18,46 +123,54 @@ class ConfigMerge:
         Returns:
             list: chemins des fichiers config.yml
         """
-        files = []
-        for root, dirs, filenames in os.walk(CONFIG_DIR):
-            for filename in filenames:
-                if filename == 'config.yml' and root != CONFIG_DIR:
-                    files.append(os.path.join(root, filename))
-        return files
+        return ConfigDiscovery.scan(CONFIG_DIR).config
 
     @staticmethod
     def deep_merge_dicts(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Fusion profonde de deux dictionnaires.
+        Fusion profonde de deux dictionnaires (voir merge_many pour N sources).
         Args:
             a (dict): Dictionnaire source.
             b (dict): Dictionnaire à fusionner.
         Returns:
-            dict: Dictionnaire fusionné.
+            dict: Dictionnaire fusionné, gelé ; partage les sous-arbres non fusionnés.
         """
-        result = dict(a)
-        for k, v in b.items():
-            if k in result and isinstance(result[k], dict) and isinstance(v, dict):
-                result[k] = ConfigMerge.deep_merge_dicts(result[k], v)
-            else:
-                result[k] = v
-        return result
+        return merge_many((a, b))
+
+    @staticmethod
+    def merge_many(sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Fusion profonde de N dictionnaires en une passe, équivalente au repli
+        successif de deep_merge_dicts dans l'ordre des sources.
+        Args:
+            sources (list): Dictionnaires à fusionner, du moins au plus prioritaire.
+        Returns:
+            dict: Dictionnaire fusionné, gelé.
+        """
+        return merge_many(sources) if sources else FrozenDict()
+
+    engine = IncrementalMerge()
 
     @staticmethod
     def merge_configs() -> Dict[str, Any]:
         """
         Fusionne toutes les configurations individuelles.
+        Seuls les fichiers modifiés depuis l'appel précédent sont relus.
         Returns:
-            dict: Configuration globale fusionnée.
+            dict: Configuration globale fusionnée, gelée (frozen.thaw() pour une copie modifiable).
         Raises:
             ConfigException: en cas d’erreur de lecture.
         """
-        merged = {}
-        for file in ConfigMerge.find_config_files():
-            try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f) or {}
-                    merged = ConfigMerge.deep_merge_dicts(merged, data)
-            except Exception as e:
-                raise ConfigException(f"Error reading {file}: {e}")
+        merged, _ = ConfigMerge.merge_configs_incremental()
         return merged
+
+    @staticmethod
+    def merge_configs_incremental() -> Tuple[Dict[str, Any], bool]:
+        """
+        Fusion incrémentale sans copie.
+        Returns:
+            tuple: (configuration fusionnée gelée ; True si elle a changé).
+        Raises:
+            ConfigException: en cas d’erreur de lecture.
+        """
+        return ConfigMerge.engine.merge(ConfigMerge.find_config_files())
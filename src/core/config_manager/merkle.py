@@ -0,0 +1,282 @@
+import struct
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from src.utils.frozen import FrozenDict, FrozenList
+from .substitution import MISSING
+
+# Empreintes de Merkle des arbres de configuration :
+# - feuille : type et repr de la valeur ; dict : paires (clé, valeur) triées ; liste : valeurs
+#   dans l'ordre, un sous-arbre étant représenté par son empreinte (blake2b, 16 octets)
+# - les sous-arbres gelés (FrozenDict/FrozenList) sont mis en cache par identité (LRU borné à
+#   MAX_CACHE) : d'une génération à l'autre, les sous-arbres partagés (fusion incrémentale,
+#   cache) ne sont jamais re-hachés
+# - diff() ne descend que dans les sous-arbres dont l'empreinte diffère : coût proportionnel
+#   à ce qui a changé, pas à la taille de l'arbre
+
+Path = Union[str, Tuple[Any, ...]]
+
+MAX_CACHE = 200_000
+
+_FROZEN = (FrozenDict, FrozenList)
+_cache: 'OrderedDict[int, Tuple[Any, bytes]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+_PACK = struct.Struct('<I').pack
+
+
+def _text(value: Any) -> bytes:
+    if type(value) is str:
+        text = b'str:' + value.encode('utf-8', 'surrogatepass')
+    else:
+        text = f"{type(value).__name__}:{value!r}".encode('utf-8', 'surrogatepass')
+    return _PACK(len(text)) + text
+
+
+def _cached(node: Any) -> Optional[bytes]:
+    entry = _cache.get(id(node))
+    return entry[1] if entry is not None and entry[0] is node else None
+
+
+def _remember(entries: List[Tuple[Any, bytes]]) -> None:
+    """Place les sous-arbres gelés en tête du LRU puis évince les plus anciens."""
+    with _cache_lock:
+        for node, value in entries:
+            _cache[id(node)] = (node, value)
+            _cache.move_to_end(id(node))
+        while len(_cache) > MAX_CACHE:
+            _cache.popitem(last=False)
+
+
+def digest(node: Any) -> bytes:
+    """
+    Empreinte de Merkle d'un arbre (parcours itératif, post-ordre).
+    Les sous-arbres gelés déjà hachés sont repris du cache (l'entrée retient le nœud :
+    son identité ne peut pas être réutilisée tant qu'elle est en cache). Les empreintes
+    reprises sont copiées pour la durée du parcours : l'éviction, faite à la fin, ne peut
+    pas retirer l'empreinte d'un enfant avant que son parent soit encodé.
+    Args:
+        node (Any): Arbre de dict/list/scalaires.
+    Returns:
+        bytes: Empreinte (16 octets).
+    """
+    if not isinstance(node, (dict, list)):
+        return hashlib.blake2b(b'v' + _text(node), digest_size=16).digest()
+    known = _cached(node)
+    if known is not None:
+        _remember([(node, known)])
+        return known
+    computed: Dict[int, bytes] = {}
+    frozen: List[Tuple[Any, bytes]] = []
+
+    def encode(child):
+        if isinstance(child, (dict, list)):
+            return b'h' + computed[id(child)]
+        return b'v' + _text(child)
+
+    stack = [(node, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if not expanded:
+            stack.append((current, True))
+            children = current.values() if isinstance(current, dict) else current
+            for child in children:
+                if not isinstance(child, (dict, list)) or id(child) in computed:
+                    continue
+                known = _cached(child)
+                if known is None:
+                    stack.append((child, False))
+                else:
+                    computed[id(child)] = known
+                    frozen.append((child, known))
+            continue
+        if id(current) in computed:
+            continue
+        if isinstance(current, dict):
+            parts = sorted((_text(key), encode(child)) for key, child in current.items())
+            payload = b'd' + b''.join(key + child for key, child in parts)
+        else:
+            payload = b'l' + b''.join(encode(child) for child in current)
+        value = hashlib.blake2b(payload, digest_size=16).digest()
+        computed[id(current)] = value
+        if isinstance(current, _FROZEN):
+            frozen.append((current, value))
+    _remember(frozen)
+    return computed[id(node)]
+
+
+def hexdigest(node: Any) -> str:
+    """Empreinte de Merkle en hexadécimal."""
+    return digest(node).hex()
+
+
+def same(a: Any, b: Any) -> bool:
+    """Égalité par empreinte (identité, puis feuilles comparées directement)."""
+    if a is b:
+        return True
+    if a is MISSING or b is MISSING:
+        return False
+    if isinstance(a, (dict, list)) or isinstance(b, (dict, list)):
+        return (isinstance(a, (dict, list)) and isinstance(b, (dict, list))
+                and digest(a) == digest(b))
+    return type(a) is type(b) and a == b
+
+
+@dataclass
+class ConfigChange:
+    """
+    Changement d'une valeur entre deux générations.
+    - path : chemin de clés ; kind : 'added', 'removed' ou 'changed'
+    - old / new : valeurs brutes (avant substitution des variables d'environnement),
+      None si absente
+    """
+    path: Tuple[Any, ...]
+    kind: str
+    old: Any = None
+    new: Any = None
+    generation: int = 0
+
+    @property
+    def key(self) -> str:
+        return '.'.join(str(part) for part in self.path)
+
+
+def _change(path, old, new, generation=0) -> ConfigChange:
+    kind = 'added' if old is MISSING else 'removed' if new is MISSING else 'changed'
+    return ConfigChange(path, kind, None if old is MISSING else old,
+                        None if new is MISSING else new, generation)
+
+
+def diff(old: Any, new: Any, watched: Optional[Dict[Any, Any]] = None) -> List[ConfigChange]:
+    """
+    Liste les changements entre deux arbres, en ne descendant que dans les sous-arbres
+    dont l'empreinte diffère.
+    - sans `watched` : changements les plus précis (une clé ajoutée, retirée ou modifiée ;
+      un sous-arbre remplacé par une valeur d'un autre type est signalé en entier)
+    - avec `watched` (trie de chemins, voir ConfigWatches) : uniquement les chemins surveillés
+      dont la valeur a changé, et seules leurs branches sont parcourues
+    Args:
+        old (Any): Arbre précédent.
+        new (Any): Nouvel arbre.
+        watched (dict): Trie clé -> sous-trie ; la clé None marque un chemin surveillé.
+    Returns:
+        list: ConfigChange, dans l'ordre des chemins.
+    """
+    changes = []
+    stack = [((), old, new, watched)]
+    while stack:
+        path, a, b, trie = stack.pop()
+        if same(a, b):
+            continue
+        if trie is None:
+            if isinstance(a, dict) and isinstance(b, dict):
+                for key in reversed(list(dict.fromkeys([*a, *b]))):
+                    stack.append((path + (key,), a.get(key, MISSING), b.get(key, MISSING), None))
+            else:
+                changes.append(_change(path, a, b))
+            continue
+        if None in trie:
+            changes.append(_change(path, a, b))
+        for key in reversed([k for k in trie if k is not None]):
+            child_a = a.get(key, MISSING) if isinstance(a, dict) else MISSING
+            child_b = b.get(key, MISSING) if isinstance(b, dict) else MISSING
+            stack.append((path + (key,), child_a, child_b, trie[key]))
+    return changes
+
+
+def _parts(path: Path) -> Tuple[Any, ...]:
+    return tuple(path.split('.')) if isinstance(path, str) else tuple(path)
+
+
+class ConfigSubscription:
+    """Abonnement retourné par ConfigWatches.add() ; cancel() le supprime."""
+    def __init__(self, registry: 'ConfigWatches', path: Tuple[Any, ...],
+                 callback: Callable[[ConfigChange], None]):
+        self.registry = registry
+        self.path = path
+        self.callback = callback
+
+    def cancel(self) -> None:
+        self.registry.remove(self)
+
+    def __enter__(self) -> 'ConfigSubscription':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.cancel()
+
+
+class ConfigWatches:
+    """
+    Abonnements par chemin de clé, notifiés à chaque publication de snapshot.
+    Le trie des chemins est reconstruit (copie) à chaque abonnement : notify() le lit
+    sans verrou et ne parcourt que les branches surveillées.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[Tuple[Any, ...], List[ConfigSubscription]] = {}
+        self._trie: Dict[Any, Any] = {}
+
+    def add(self, path: Path, callback: Callable[[ConfigChange], None]) -> ConfigSubscription:
+        """
+        Abonne un callback aux changements de valeur d'un chemin.
+        Args:
+            path (str | tuple): Chemin pointé (`memApp.database.port`) ou tuple de clés.
+            callback (callable): Appelé avec un ConfigChange.
+        Returns:
+            ConfigSubscription: Abonnement (cancel() ou `with`).
+        """
+        subscription = ConfigSubscription(self, _parts(path), callback)
+        with self._lock:
+            subscriptions = {k: list(v) for k, v in self._subscriptions.items()}
+            subscriptions.setdefault(subscription.path, []).append(subscription)
+            self._publish(subscriptions)
+        return subscription
+
+    def remove(self, subscription: ConfigSubscription) -> None:
+        """Supprime un abonnement (sans effet s'il l'est déjà)."""
+        with self._lock:
+            subscriptions = {k: [s for s in v if s is not subscription]
+                             for k, v in self._subscriptions.items()}
+            self._publish({k: v for k, v in subscriptions.items() if v})
+
+    def _publish(self, subscriptions: Dict[Tuple[Any, ...], List[ConfigSubscription]]) -> None:
+        trie: Dict[Any, Any] = {}
+        for path in subscriptions:
+            node = trie
+            for part in path:
+                node = node.setdefault(part, {})
+            node[None] = True
+        self._subscriptions = subscriptions
+        self._trie = trie
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._subscriptions.values())
+
+    def notify(self, old, new) -> List[ConfigChange]:
+        """
+        Compare deux snapshots et appelle les callbacks des chemins modifiés.
+        Les callbacks s'exécutent hors du verrou de publication, dans un thread qui publie,
+        dans l'ordre des générations ; une exception est affichée sans interrompre les
+        autres notifications.
+        Args:
+            old (ConfigSnapshot): Snapshot précédent.
+            new (ConfigSnapshot): Snapshot publié.
+        Returns:
+            list: Changements notifiés.
+        """
+        trie, subscriptions = self._trie, self._subscriptions
+        if not trie:
+            return []
+        changes = diff(old.config, new.config, trie)
+        for change in changes:
+            change.generation = new.generation
+            for subscription in subscriptions.get(change.path, ()):
+                try:
+                    subscription.callback(change)
+                except Exception as e:
+                    print(f"Config watch callback error ({change.key}): {e}")
+        return changes
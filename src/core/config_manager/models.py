@@ -0,0 +1,216 @@
+import re
+import keyword
+import datetime
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+from src.core.exceptions import ConfigException
+from .validation import ConfigValidation
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+# pydantic est importé à la première génération de modèle (coût de démarrage)
+
+_SCALARS = {
+    'string': str,
+    'integer': int,
+    'float': float,
+    'number': Union[int, float],
+    'boolean': bool,
+    'datetime': datetime.datetime,
+    'date': datetime.date,
+}
+
+
+class ConfigModels:
+    """
+    Modèles Pydantic générés à partir des arbres de schémas Cerberus
+    (service -> section -> clé -> règles, format de schema.yml / schemas.py).
+    - un modèle par schéma, mis en cache selon l'empreinte du contenu du schéma
+    - instances figées (frozen) avec accès par attribut : `cfg.memApp.database.port`
+    - les listes deviennent des tuples ; les clés hors schéma sont conservées telles quelles
+    - une clé qui n'est pas un identifiant Python valide (ou réservé par Pydantic) est
+      exposée sous un nom dérivé (`field_name()`), la clé d'origine restant l'alias
+    """
+    _models: Dict[str, type] = {}
+    _fields: Dict[type, Dict[str, str]] = {}
+    _lock = threading.RLock()
+
+    @staticmethod
+    def model_for(tree_schema: dict, name: str = 'Config') -> type:
+        """
+        Retourne le modèle compilé d'un arbre de schémas (généré au premier appel).
+        Args:
+            tree_schema (dict): Arbre de schémas.
+            name (str): Nom de la classe générée.
+        Returns:
+            type: Sous-classe de pydantic.BaseModel, figée.
+        Raises:
+            ConfigException: si le schéma ne peut pas être converti.
+        """
+        key = ConfigValidation.schema_key(tree_schema) + ':' + name
+        model = ConfigModels._models.get(key)
+        if model is None:
+            with ConfigModels._lock:
+                model = ConfigModels._models.get(key)
+                if model is None:
+                    try:
+                        model = ConfigModels._structure(name, tree_schema)
+                    except ConfigException:
+                        raise
+                    except Exception as e:
+                        raise ConfigException(f"Erreur génération du modèle {name}: {e}")
+                    ConfigModels._models[key] = model
+        return model
+
+    @staticmethod
+    def build(tree_schema: dict, data: Any, name: str = 'Config') -> 'BaseModel':
+        """
+        Valide des données et retourne l'instance figée du modèle correspondant.
+        Args:
+            tree_schema (dict): Arbre de schémas.
+            data (dict): Configuration à valider.
+            name (str): Nom de la classe générée.
+        Returns:
+            BaseModel: Instance figée.
+        Raises:
+            ConfigException: si les données ne respectent pas le schéma.
+        """
+        from pydantic import ValidationError
+        model = ConfigModels.model_for(tree_schema, name)
+        try:
+            return model.model_validate(data)
+        except ValidationError as e:
+            errors = '; '.join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            raise ConfigException(f"Configuration {name} invalide: {errors}")
+
+    @staticmethod
+    def field_name(model: type, key: str) -> str:
+        """Nom d'attribut Python d'une clé de configuration dans un modèle généré."""
+        return ConfigModels._fields.get(model, {}).get(key, key)
+
+    @staticmethod
+    def lookup(instance: Any, path: Union[str, Tuple[str, ...]]) -> Any:
+        """
+        Descend dans une instance par chemin de clés (`memApp.database`).
+        Args:
+            instance (BaseModel): Instance générée.
+            path (str | tuple): Chemin pointé ou tuple de clés.
+        Returns:
+            Any: Sous-instance ou valeur.
+        Raises:
+            ConfigException: si le chemin n'existe pas.
+        """
+        parts = path.split('.') if isinstance(path, str) else path
+        node = instance
+        for part in parts:
+            if isinstance(node, dict):
+                if part not in node:
+                    raise ConfigException(f"Chemin introuvable: {path}")
+                node = node[part]
+                continue
+            attr = ConfigModels.field_name(type(node), part)
+            if not hasattr(node, attr):
+                raise ConfigException(f"Chemin introuvable: {path}")
+            node = getattr(node, attr)
+        return node
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Oublie les modèles générés."""
+        with ConfigModels._lock:
+            ConfigModels._models.clear()
+            ConfigModels._fields.clear()
+
+    @staticmethod
+    def _attribute(key: str, taken: set) -> str:
+        from pydantic import BaseModel
+        name = key
+        if (not key.isidentifier() or keyword.iskeyword(key) or key.startswith('_')
+                or hasattr(BaseModel, key)):
+            name = 'f_' + re.sub(r'\W', '_', key.lstrip('_'))
+        while name in taken:
+            name += '_'
+        taken.add(name)
+        return name
+
+    @staticmethod
+    def _create(name: str, fields: Dict[str, Tuple[Any, Any, Dict[str, Any]]]) -> type:
+        from pydantic import ConfigDict, Field, create_model
+        config = ConfigDict(frozen=True, extra='allow', populate_by_name=True,
+                            arbitrary_types_allowed=True)
+        taken: set = set()
+        definitions = {}
+        aliases = {}
+        for key, (annotation, default, constraints) in fields.items():
+            attr = ConfigModels._attribute(str(key), taken)
+            if attr != key:
+                constraints = dict(constraints, alias=str(key))
+            aliases[str(key)] = attr
+            definitions[attr] = (annotation, Field(default, **constraints))
+        model = create_model(re.sub(r'\W', '_', name), __config__=config, **definitions)
+        ConfigModels._fields[model] = aliases
+        return model
+
+    @staticmethod
+    def _structure(name: str, node: dict) -> type:
+        """Niveau structurel (service, section) : chaque enfant est un sous-modèle ou un champ."""
+        fields = {}
+        for key, child in node.items():
+            if not isinstance(child, dict):
+                continue
+            if ConfigValidation._is_rules(child):
+                fields[key] = ConfigModels._field(f"{name}_{key}", child)
+            else:
+                fields[key] = (Optional[ConfigModels._structure(f"{name}_{key}", child)], None, {})
+        return ConfigModels._create(name, fields)
+
+    @staticmethod
+    def _annotation(name: str, rules: dict) -> Any:
+        from typing import Literal
+        kinds = rules.get('type')
+        kinds = kinds if isinstance(kinds, list) else [kinds] if kinds else []
+        options = []
+        for kind in kinds:
+            if kind == 'dict':
+                sub = rules.get('schema')
+                if isinstance(sub, dict) and sub:
+                    options.append(ConfigModels._create(name, {
+                        k: ConfigModels._field(f"{name}_{k}", r)
+                        for k, r in sub.items() if isinstance(r, dict)
+                    }))
+                else:
+                    options.append(Any)
+            elif kind == 'list':
+                item = rules.get('schema')
+                item_type = (ConfigModels._annotation(name + '_item', item)
+                             if isinstance(item, dict) and 'type' in item else Any)
+                options.append(Tuple[item_type, ...])
+            else:
+                options.append(_SCALARS.get(kind, Any))
+        if 'allowed' in rules and isinstance(rules['allowed'], (list, tuple)) and rules['allowed']:
+            options = [Literal[tuple(rules['allowed'])]]
+        if not options or Any in options:
+            annotation = Any
+        elif len(options) == 1:
+            annotation = options[0]
+        else:
+            annotation = Union[tuple(options)]
+        if rules.get('nullable') or not rules.get('required'):
+            annotation = Optional[annotation]
+        return annotation
+
+    @staticmethod
+    def _field(name: str, rules: dict) -> Tuple[Any, Any, Dict[str, Any]]:
+        constraints = {}
+        for rule, option in (('min', 'ge'), ('max', 'le'), ('minlength', 'min_length'),
+                             ('maxlength', 'max_length'), ('regex', 'pattern')):
+            if rule in rules:
+                constraints[option] = rules[rule]
+        if rules.get('required'):
+            default = ...
+        else:
+            default = rules.get('default')
+        return ConfigModels._annotation(name, rules), default, constraints
@@ -1,35 +1,295 @@
 import os
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
 from src.core.exceptions import ConfigException
+from src.utils import metrics
+from .cache import ConfigCache
+from .merge import ConfigMerge
+from .merkle import same
 
 CONFIG_DIR = os.path.join(os.path.dirname(__file__), '../../config')
 
+DEFAULT_DEBOUNCE = 0.25
+DEFAULT_MAX_WAIT = 2.0
+WATCHED_FILES = ('config.yml', 'defaults.yml')
+
+_RELOAD_SECONDS = metrics.histogram('memapp_config_reload_seconds',
+                                    'Traitement d\'un lot de reload (fusion et callback)')
+_RELOAD_LAG_SECONDS = metrics.histogram(
+    'memapp_config_reload_lag_seconds',
+    'Délai entre le premier événement fichier et la livraison au callback')
+_RELOAD_BATCHES = metrics.counter('memapp_config_reload_batches_total', 'Lots de reload traités',
+                                  ('outcome',))
+
+
+@dataclass
+class ConfigChangeEvent:
+    """
+    Événement de changement livré une fois par lot de modifications.
+    - paths : fichiers touchés et nature du dernier événement (created/modified/deleted/moved)
+    - services : répertoires de service concernés
+    - sections : sections fusionnées réellement modifiées (`service` ou `service.section`)
+    """
+    paths: Dict[str, str] = field(default_factory=dict)
+    services: List[str] = field(default_factory=list)
+    sections: List[str] = field(default_factory=list)
+    generation: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.sections)
+
+
+def _changed_sections(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """
+    Liste les sections racines (et sous-sections) dont la valeur fusionnée diffère.
+    La comparaison se fait par empreinte de Merkle : les sous-arbres partagés entre les
+    deux générations ne sont pas reparcourus.
+    """
+    sections = []
+    for key in sorted(set(old) | set(new), key=str):
+        before, after = old.get(key), new.get(key)
+        if same(before, after):
+            continue
+        if isinstance(before, dict) and isinstance(after, dict):
+            for sub in sorted(set(before) | set(after), key=str):
+                if not same(before.get(sub), after.get(sub)):
+                    sections.append(f"{key}.{sub}")
+        else:
+            sections.append(str(key))
+    return sections
+
+
+class ConfigWatcher:
+    """
+    Pipeline de reload : les événements watchdog sont regroupés par fichier sur une
+    fenêtre glissante (debounce), puis un worker relance une seule fusion par lot
+    et livre un ConfigChangeEvent au callback, hors du thread de l'observer.
+    La fenêtre est bornée par `max_wait` (depuis le premier événement du lot) : un fichier
+    réécrit en continu ne retarde pas le reload indéfiniment.
+    `generation` donne le numéro inscrit dans l'événement : la génération du snapshot publié
+    par la fusion (ConfigManager), à défaut celle du cache.
+    """
+    def __init__(self, callback: Optional[Callable] = None, debounce: float = DEFAULT_DEBOUNCE,
+                 merge: Optional[Callable[[], Dict[str, Any]]] = None,
+                 config_dir: Optional[str] = None, max_wait: float = DEFAULT_MAX_WAIT,
+                 generation: Optional[Callable[[], int]] = None):
+        self.callback = callback
+        self.generation = generation or ConfigCache.generation
+        self.debounce = debounce
+        self.max_wait = max(max_wait, debounce)
+        self.merge = merge or (lambda: ConfigMerge.merge_configs_incremental()[0])
+        self.config_dir = os.path.abspath(config_dir or CONFIG_DIR)
+        self._pass_event = ConfigWatcher._accepts_event(callback)
+        self._cond = threading.Condition()
+        self._pending: Dict[str, str] = {}
+        self._rescan = False
+        self._last_event = 0.0
+        self._first_event = 0.0
+        self._stopping = False
+        self._observer = None
+        self._worker = None
+        self._merged: Dict[str, Any] = {}
+
+    @staticmethod
+    def _accepts_event(callback: Optional[Callable]) -> bool:
+        """Compatibilité : les anciens callbacks ne prennent aucun argument."""
+        if callback is None:
+            return False
+        import inspect
+        try:
+            return bool(inspect.signature(callback).parameters)
+        except (TypeError, ValueError):
+            return True
+
+    def notify(self, path: str, kind: str, is_directory: bool = False) -> None:
+        """
+        Enregistre un événement fichier (appelé depuis le thread de l'observer).
+        Args:
+            path (str): Chemin concerné.
+            kind (str): created, modified, deleted ou moved.
+            is_directory (bool): True pour un répertoire déplacé/supprimé.
+        """
+        with self._cond:
+            if is_directory:
+                self._rescan = True
+            self._last_event = time.monotonic()
+            if not self._pending:
+                self._first_event = self._last_event
+            self._pending[path] = kind
+            self._cond.notify()
+
+    def start(self) -> 'ConfigWatcher':
+        """
+        Démarre l'observer watchdog et le worker de reload.
+        Returns:
+            ConfigWatcher: l'instance démarrée.
+        Raises:
+            ConfigException: en cas d’erreur d’initialisation.
+        """
+        try:
+            self._merged = self.merge()
+        except Exception:
+            self._merged = {}
+        try:
+            self._worker = threading.Thread(target=self._run, name='memapp-config-reload',
+                                            daemon=True)
+            self._worker.start()
+            from watchdog.observers import Observer  # import différé : coût de démarrage
+            self._observer = Observer()
+            self._observer.schedule(ConfigReload.Handler(self), self.config_dir, recursive=True)
+            self._observer.start()
+        except Exception as e:
+            self.stop()
+            raise ConfigException(f"Erreur initialisation watchdog: {e}")
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Arrête l'observer puis le worker ; les événements en attente sont abandonnés.
+        Args:
+            timeout (float): Délai maximal d'attente de chaque thread.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._observer is not None:
+            self._observer.stop()
+            if self._observer.is_alive():
+                self._observer.join(timeout)
+            self._observer = None
+        if self._worker is not None and self._worker is not threading.current_thread():
+            self._worker.join(timeout)
+        self._worker = None
+
+    def __enter__(self) -> 'ConfigWatcher':
+        return self.start() if self._worker is None else self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _next_batch(self):
+        """Attend la fin de la fenêtre de debounce (bornée par max_wait) ; retourne le lot."""
+        with self._cond:
+            while not self._stopping:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                deadline = min(self._last_event + self.debounce, self._first_event + self.max_wait)
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                batch, rescan = self._pending, self._rescan
+                self._pending, self._rescan = {}, False
+                return batch, rescan, self._first_event
+        return None, False, 0.0
+
+    def _run(self) -> None:
+        while True:
+            batch, rescan, first_event = self._next_batch()
+            if batch is None:
+                return
+            try:
+                with _RELOAD_SECONDS.time():
+                    self._process(batch, rescan, first_event)
+            except Exception as e:
+                _RELOAD_BATCHES.inc(1, 'error')
+                print(f"Config reload error: {e}")
+
+    def _process(self, batch: Dict[str, str], rescan: bool, first_event: float = 0.0) -> None:
+        if rescan:
+            ConfigCache.invalidate()
+        else:
+            for path in batch:
+                ConfigCache.invalidate(path)
+        old = self._merged
+        new = self.merge()
+        self._merged = new
+        sections = _changed_sections(old, new)
+        if not sections:
+            _RELOAD_BATCHES.inc(1, 'unchanged')
+            return
+        services = set()
+        for path in batch:
+            rel = os.path.relpath(os.path.abspath(path), self.config_dir)
+            parts = rel.split(os.sep)
+            if len(parts) > 1 and parts[0] != '..':
+                services.add(parts[0])
+        event = ConfigChangeEvent(dict(batch), sorted(services), sections, self.generation())
+        _RELOAD_BATCHES.inc(1, 'changed')
+        if first_event:
+            _RELOAD_LAG_SECONDS.observe(time.monotonic() - first_event)
+        if self.callback:
+            if self._pass_event:
+                self.callback(event)
+            else:
+                self.callback()
+
+
 class ConfigReload:
     """
     Module de surveillance et reload dynamique des fichiers de configuration.
     """
-    class Handler(FileSystemEventHandler):
-        def __init__(self, callback):
-            super().__init__()
-            self.callback = callback
+    class Handler:
+        """
+        Handler watchdog (interface `dispatch(event)`), sans dépendance à l'import
+        de watchdog : le module n'est chargé qu'au démarrage de la surveillance.
+        """
+        def __init__(self, watcher: ConfigWatcher):
+            self.watcher = watcher
+
+        def dispatch(self, event):
+            handler = getattr(self, 'on_' + str(event.event_type), None)
+            if handler is not None:
+                handler(event)
+
+        @staticmethod
+        def _watched(path) -> bool:
+            # config.yml (fusion) et defaults.yml (couche defaults de ConfigManager.layers())
+            return isinstance(path, str) and path.endswith(WATCHED_FILES)
+
+        def _dispatch(self, event, kind):
+            if self._watched(event.src_path):
+                self.watcher.notify(event.src_path, kind)
+            elif event.is_directory and kind in ('deleted', 'moved'):
+                self.watcher.notify(event.src_path, kind, is_directory=True)
+
+        def on_created(self, event):
+            self._dispatch(event, 'created')
+
         def on_modified(self, event):
-            if event.src_path.endswith('config.yml'):
-                if self.callback:
-                    self.callback()
+            self._dispatch(event, 'modified')
+
+        def on_deleted(self, event):
+            self._dispatch(event, 'deleted')
+
+        def on_moved(self, event):
+            self._dispatch(event, 'moved')
+            dest = getattr(event, 'dest_path', None)
+            if self._watched(dest):
+                self.watcher.notify(dest, 'moved')
+
     @staticmethod
-    def reload_on_change(callback=None):
+    def reload_on_change(callback=None, debounce: float = DEFAULT_DEBOUNCE, merge=None,
+                         max_wait: float = DEFAULT_MAX_WAIT, generation=None) -> ConfigWatcher:
         """
         Active la surveillance des fichiers de configuration.
         Args:
-            callback (callable): Fonction à appeler en cas de modification.
+            callback (callable): Fonction appelée une fois par lot de modifications,
+                avec un ConfigChangeEvent (ou sans argument si elle n'en accepte pas).
+            debounce (float): Fenêtre de regroupement des événements, en secondes.
+            merge (callable): Fusion à relancer par lot ; retourne la configuration fusionnée.
+            max_wait (float): Délai maximal entre le premier événement d'un lot et le reload.
+            generation (callable): Génération à inscrire dans l'événement, après la fusion.
+        Returns:
+            ConfigWatcher: surveillance démarrée, à arrêter via stop() ou `with`.
         Raises:
             ConfigException: en cas d’erreur d’initialisation.
         """
-        try:
-            observer = Observer()
-            observer.schedule(ConfigReload.Handler(callback), CONFIG_DIR, recursive=True)
-            observer.start()
-            print("Config file change monitoring enabled.")
-        except Exception as e:
-            raise ConfigException(f"Erreur initialisation watchdog: {e}")
+        watcher = ConfigWatcher(callback, debounce=debounce, merge=merge, max_wait=max_wait,
+                                generation=generation).start()
+        print("Config file change monitoring enabled.")
+        return watcher
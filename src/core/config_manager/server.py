@@ -0,0 +1,257 @@
+import gzip
+import json
+import time
+import hashlib
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+from src.utils import metrics
+from .manager import ConfigManager
+from .merkle import ConfigChange, diff
+from .substitution import MISSING, CompiledSubstitution
+
+# Service HTTP local de la configuration (flask importé à la demande) :
+#   GET /config[/<chemin>]               configuration globale ou sous-arbre
+#                                        (memApp/database ou memApp.database)
+#   GET /services/<service>[/<chemin>]   config.yml d'un service
+#   GET /changes?since=<génération>      long-poll : répond dès qu'une génération plus récente
+#                                        est publiée
+# Les corps JSON (et leur version gzip) sont sérialisés une fois par valeur et mis en cache ;
+# l'ETag est l'empreinte du corps canonique (clés triées) : une relecture inchangée répond 304
+# sans sérialisation, y compris d'une génération à l'autre si le sous-arbre n'a pas changé.
+
+MAX_BODIES = 1024
+MAX_HISTORY = 256
+MAX_PATHS = 256
+MIN_GZIP = 1024
+MAX_WAIT = 60.0
+POLL_INTERVAL = 0.5
+
+_REQUESTS = metrics.counter('memapp_config_server_requests_total',
+                            'Requêtes du service de configuration', ('endpoint', 'status'))
+_SERIALIZED = metrics.counter('memapp_config_server_bodies_total',
+                              'Corps JSON sérialisés (cache manqué)')
+
+
+class _Body:
+    """Corps pré-sérialisé d'une valeur : JSON, gzip éventuel et ETag."""
+    __slots__ = ('value', 'generation', 'etag', 'raw', 'compressed')
+
+    def __init__(self, value: Any, generation: int):
+        self.value = value
+        self.generation = generation
+        self.raw = json.dumps(value, ensure_ascii=False, separators=(',', ':'), sort_keys=True,
+                              default=str).encode('utf-8')
+        self.etag = hashlib.blake2b(self.raw, digest_size=12).hexdigest()
+        self.compressed = gzip.compress(self.raw, 6) if len(self.raw) >= MIN_GZIP else None
+
+
+class ConfigServer:
+    """
+    Service HTTP local de la configuration, pour les processus voisins (sidecars) :
+    une seule copie parsée est partagée par tous les lecteurs.
+    - les lectures épinglent le snapshot courant et substituent les variables
+      d'environnement comme get_config()
+    - le corps de chaque chemin est mis en cache par valeur (arbres partagés d'une
+      génération à l'autre : un sous-arbre inchangé n'est pas re-sérialisé)
+    - If-None-Match -> 304 sans sérialisation ; gzip pré-calculé si le client l'accepte
+    - /changes?since=N bloque jusqu'à la publication d'une génération > N (ou timeout)
+      et liste les chemins modifiés depuis N
+    Avec `watch=True`, start() active aussi la surveillance des fichiers (reload_on_change).
+    """
+    def __init__(self, watch: bool = False, shared: bool = False):
+        self.watch = watch
+        self.shared = shared
+        self._bodies: Dict[Tuple[Optional[str], Tuple[Any, ...]], _Body] = {}
+        self._changed = threading.Condition()
+        self._history: deque = deque(maxlen=MAX_HISTORY)
+        self._base = 0
+        self._latest = 0
+        self._subscription = None
+        self._watcher = None
+
+    def start(self) -> 'ConfigServer':
+        """
+        Abonne le service aux publications de snapshot (et démarre la surveillance si demandée).
+        Returns:
+            ConfigServer: l'instance démarrée.
+        """
+        if self._subscription is None:
+            self._subscription = ConfigManager.watch((), self._published)
+            with self._changed:
+                self._base = self._latest = ConfigManager.generation()
+        if self.watch and self._watcher is None:
+            self._watcher = ConfigManager.reload_on_change(debounce=0.1, shared=self.shared)
+        return self
+
+    def stop(self) -> None:
+        """Arrête la surveillance et résilie l'abonnement."""
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.stop()
+        subscription, self._subscription = self._subscription, None
+        if subscription is not None:
+            subscription.cancel()
+        with self._changed:
+            self._changed.notify_all()
+
+    def _published(self, change: ConfigChange) -> None:
+        """Abonnement racine : historise les chemins modifiés et réveille les long-polls."""
+        paths = [c.key for c in diff(change.old, change.new)[:MAX_PATHS + 1]]
+        with self._changed:
+            if len(self._history) == self._history.maxlen:
+                self._base = self._history[0][0]
+            self._history.append((change.generation, paths[:MAX_PATHS], len(paths) > MAX_PATHS))
+            self._latest = max(self._latest, change.generation)
+            self._changed.notify_all()
+
+    # --- lectures ---
+
+    @staticmethod
+    def _path(tree: Any, parts: List[str]) -> Tuple[Any, ...]:
+        """Chemin de clés d'une URL (segments `/` ou `.`) ; indices entiers dans les listes."""
+        path = []
+        node = tree
+        for part in (p for segment in parts for p in segment.split('.') if p):
+            key: Any = part
+            if isinstance(node, list) and part.lstrip('-').isdigit():
+                key = int(part)
+            path.append(key)
+            node = CompiledSubstitution._get(node, (key,)) if node is not MISSING else MISSING
+        return tuple(path)
+
+    def body(self, service: Optional[str], parts: List[str]) -> Optional[_Body]:
+        """
+        Corps pré-sérialisé d'un chemin, pour le snapshot épinglé par l'appelant.
+        Args:
+            service (str): Service (config.yml du service) ou None (configuration globale).
+            parts (list): Segments du chemin.
+        Returns:
+            _Body: Corps mis en cache, ou None si le chemin n'existe pas.
+        """
+        if not ConfigManager._env_loaded:
+            ConfigManager.load_env()
+        compiled = ConfigManager._compiled_config(service)
+        path = self._path(compiled.tree, parts)
+        value = compiled.resolve(path)
+        if value is MISSING:
+            return None
+        key = (service, path)
+        body = self._bodies.get(key)
+        if body is None or body.value is not value:
+            _SERIALIZED.inc()
+            body = _Body(value, ConfigManager.generation())
+            if len(self._bodies) >= MAX_BODIES:
+                self._bodies.clear()
+            self._bodies[key] = body
+        return body
+
+    def changes(self, since: Optional[int], timeout: float) -> Dict[str, Any]:
+        """
+        Long-poll : attend qu'une génération > `since` soit publiée.
+        Args:
+            since (int): Dernière génération connue du client ; None pour la génération courante.
+            timeout (float): Attente maximale (secondes, bornée par MAX_WAIT).
+        Returns:
+            dict: generation, since, changes ([{generation, paths, truncated}]) et complete
+            (False si l'historique ne remonte pas jusqu'à `since` : relire /config).
+        """
+        deadline = time.monotonic() + max(0.0, min(timeout, MAX_WAIT))
+        while since is not None:
+            ConfigManager.snapshot()  # réécriture par un autre processus : publie et notifie
+            with self._changed:
+                remaining = deadline - time.monotonic()
+                if self._latest != since or remaining <= 0 or self._subscription is None:
+                    break
+                self._changed.wait(min(remaining, POLL_INTERVAL))
+        with self._changed:
+            latest, base = self._latest, self._base
+            history = [entry for entry in self._history if since is not None and entry[0] > since]
+        return {
+            'generation': latest,
+            'since': since,
+            'complete': since is not None and base <= since <= latest,
+            'changes': [{'generation': g, 'paths': paths, 'truncated': truncated}
+                        for g, paths, truncated in history],
+        }
+
+    # --- Flask ---
+
+    def create_app(self):
+        """
+        Application Flask du service (démarre l'abonnement aux publications).
+        Returns:
+            flask.Flask: Application à servir ou à monter.
+        """
+        from flask import Flask, Response, jsonify, request  # import différé : coût de démarrage
+        self.start()
+        app = Flask('memapp-config')
+
+        def send(endpoint: str, service: Optional[str], path: str):
+            with ConfigManager.pin() as snapshot:
+                body = self.body(service, path.split('/') if path else [])
+            if body is None:
+                _REQUESTS.inc(1, endpoint, '404')
+                return jsonify({'error': f"Chemin introuvable: {path or '<racine>'}"}), 404
+            use_gzip = (body.compressed is not None
+                        and 'gzip' in request.headers.get('Accept-Encoding', ''))
+            etag = body.etag + ('-gz' if use_gzip else '')
+            headers = {'ETag': f'"{etag}"', 'X-Config-Generation': str(snapshot.generation),
+                       'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+            if request.if_none_match.contains(etag):
+                _REQUESTS.inc(1, endpoint, '304')
+                return Response(status=304, headers=headers)
+            if use_gzip:
+                headers['Content-Encoding'] = 'gzip'
+            _REQUESTS.inc(1, endpoint, '200')
+            return Response(body.compressed if use_gzip else body.raw, status=200, headers=headers,
+                            content_type='application/json')
+
+        @app.route('/config', defaults={'path': ''})
+        @app.route('/config/<path:path>')
+        def config(path):
+            return send('config', None, path)
+
+        @app.route('/services/<service>', defaults={'path': ''})
+        @app.route('/services/<service>/<path:path>')
+        def service_config(service, path):
+            if service not in ConfigManager.snapshot().services:
+                _REQUESTS.inc(1, 'services', '404')
+                return jsonify({'error': f"Service inconnu: {service}"}), 404
+            return send('services', service, path)
+
+        @app.route('/changes')
+        def changes():
+            try:
+                since = request.args.get('since')
+                since = None if since is None else int(since)
+                timeout = float(request.args.get('timeout', 30))
+            except ValueError:
+                _REQUESTS.inc(1, 'changes', '400')
+                return jsonify({'error': 'since/timeout invalides'}), 400
+            _REQUESTS.inc(1, 'changes', '200')
+            return jsonify(self.changes(since, timeout))
+
+        return app
+
+    def serve(self, host: str = '127.0.0.1', port: int = 8765,
+              background: bool = True) -> Optional[threading.Thread]:
+        """
+        Sert la configuration en HTTP, par défaut sur l'interface locale uniquement.
+        Args:
+            host (str): Adresse d'écoute.
+            port (int): Port d'écoute.
+            background (bool): Servir depuis un thread démon (sinon appel bloquant).
+        Returns:
+            threading.Thread: Thread du serveur, ou None si bloquant.
+        """
+        app = self.create_app()
+        if not background:
+            app.run(host=host, port=port, use_reloader=False, threaded=True)
+            return None
+        thread = threading.Thread(target=app.run, name='memapp-config-server',
+                                  kwargs={'host': host, 'port': port, 'use_reloader': False,
+                                          'threaded': True},
+                                  daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,215 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.utils.frozen import FrozenDict
+from . import merkle
+
+
+class ConfigSnapshot:
+    """
+    Version immuable et numérotée de la configuration fusionnée.
+    - generation : numéro croissant, incrémenté à chaque publication d'un nouveau contenu
+    - config : arbre global gelé (contenu de config_full.yml)
+    - services : arbres gelés des config.yml de service ayant servi à la fusion
+    - digest / signature : empreinte SHA-1 et stat (mtime, taille, inode) de config_full.yml
+    - hash(path) : empreinte de Merkle d'un sous-arbre (calculée à la demande, partagée
+      avec les générations voisines pour les sous-arbres inchangés)
+    """
+    __slots__ = ('generation', 'config', 'services', 'digest', 'signature', 'created')
+
+    def __init__(self, generation: int, config: Dict[str, Any], services: Dict[str, Any],
+                 digest: str, signature: Optional[Tuple[int, int, int]]):
+        for name, value in (('generation', generation), ('config', config), ('services', services),
+                            ('digest', digest), ('signature', signature), ('created', time.time())):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ConfigSnapshot est immuable ({name})")
+
+    def get(self, path: str, default: Any = None) -> Any:
+        """
+        Valeur brute (sans substitution d'environnement) par chemin pointé.
+        Args:
+            path (str): Chemin pointé (`memApp.database.port`).
+            default (Any): Valeur retournée si le chemin n'existe pas.
+        Returns:
+            Any: Valeur ou sous-arbre gelé.
+        """
+        node = self.config
+        for part in path.split('.'):
+            if not isinstance(node, dict) or part not in node:
+                return default
+            node = node[part]
+        return node
+
+    def hash(self, path: str = '') -> Optional[str]:
+        """
+        Empreinte de Merkle (hexadécimale) d'un sous-arbre.
+        Args:
+            path (str): Chemin pointé ; vide pour la racine.
+        Returns:
+            str: Empreinte, ou None si le chemin n'existe pas.
+        """
+        node = self.get(path, merkle.MISSING) if path else self.config
+        return None if node is merkle.MISSING else merkle.hexdigest(node)
+
+    def diff(self, other: 'ConfigSnapshot') -> List[merkle.ConfigChange]:
+        """Changements de ce snapshot vers `other` (voir merkle.diff())."""
+        changes = merkle.diff(self.config, other.config)
+        for change in changes:
+            change.generation = other.generation
+        return changes
+
+    def __repr__(self):
+        return f"ConfigSnapshot(generation={self.generation}, digest={self.digest[:12]})"
+
+
+class SnapshotStore:
+    """
+    Publication des snapshots par échange de référence.
+    - current() : lecture de la référence courante, sans verrou (affectation atomique)
+    - publish() : sous le verrou d'écriture, le snapshot est construit à part puis échangé
+    - pin()/unpin() : fige le snapshot vu par le thread courant (pile réentrante)
+    - listeners : appelés (ancien, nouveau) après chaque publication d'un nouvel arbre,
+      hors du verrou et dans l'ordre de publication (à la sortie du bloc writing() englobant)
+    Les lecteurs ne prennent jamais le verrou : un snapshot publié n'est plus modifié.
+    """
+    def __init__(self,
+                 listeners: Optional[List[Callable[[ConfigSnapshot, ConfigSnapshot], Any]]] = None):
+        self.lock = threading.RLock()
+        self.listeners = list(listeners or [])
+        self._current: Optional[ConfigSnapshot] = None
+        self._generation = 0
+        self._local = threading.local()
+        self._pending: deque = deque()
+        self._notifying = False
+
+    def current(self) -> Optional[ConfigSnapshot]:
+        """Dernier snapshot publié (None avant la première publication)."""
+        return self._current
+
+    def publish(self, config: Dict[str, Any], digest: str,
+                signature: Optional[Tuple[int, int, int]],
+                services: Optional[Dict[str, Any]] = None,
+                generation: Optional[int] = None) -> ConfigSnapshot:
+        """
+        Publie un snapshot. Un contenu identique (même empreinte) conserve sa génération :
+        seule la signature disque est mise à jour.
+        Args:
+            config (dict): Arbre global gelé.
+            digest (str): Empreinte SHA-1 du fichier publié.
+            signature (tuple): stat (mtime, taille, inode) du fichier publié.
+            services (dict): Arbres gelés des services, par nom.
+            generation (int): Génération imposée (snapshot reçu d'un autre processus) ;
+                jamais inférieure à la dernière publiée.
+        Returns:
+            ConfigSnapshot: Snapshot devenu courant.
+        """
+        with self.lock:
+            current = self._current
+            if services is None and current is not None:
+                services = current.services
+            if generation is not None:
+                # Une génération imposée plus ancienne (diffusion en retard) ne fait pas reculer
+                generation = self._generation = max(self._generation, generation)
+            elif current is not None and current.digest == digest:
+                generation = current.generation
+            else:
+                self._generation += 1
+                generation = self._generation
+            if services is None:
+                services = FrozenDict()
+            snapshot = ConfigSnapshot(generation, config, services, digest, signature)
+            self._current = snapshot
+            if current is not None and current.config is not config and self.listeners:
+                self._pending.append((current, snapshot))
+        self._notify()
+        return snapshot
+
+    @contextmanager
+    def writing(self):
+        """
+        Verrou d'écriture pour une séquence lecture/publication : les listeners des
+        publications faites dans le bloc sont appelés à sa sortie, verrou relâché.
+        """
+        try:
+            with self.lock:
+                self._local.depth = getattr(self._local, 'depth', 0) + 1
+                try:
+                    yield self
+                finally:
+                    self._local.depth -= 1
+        finally:
+            self._notify()
+
+    def _notify(self) -> None:
+        """
+        Appelle les listeners des publications en attente, hors du verrou.
+        Un seul thread notifie à la fois et vide la file dans l'ordre de publication :
+        une publication concurrente (ou faite depuis un listener) est notifiée par lui.
+        """
+        if getattr(self._local, 'depth', 0):
+            return  # différé à la sortie du bloc writing()
+        while True:
+            with self.lock:
+                if self._notifying or not self._pending:
+                    return
+                self._notifying = True
+                old, new = self._pending.popleft()
+            try:
+                for listener in list(self.listeners):
+                    listener(old, new)
+            finally:
+                with self.lock:
+                    self._notifying = False
+
+    def reset(self) -> None:
+        """Oublie le snapshot courant ; les numéros de génération restent croissants."""
+        with self.lock:
+            self._current = None
+
+    def _stack(self) -> List[ConfigSnapshot]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def pinned(self) -> Optional[ConfigSnapshot]:
+        """Snapshot épinglé par le thread courant, ou None."""
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    def pin(self, snapshot: ConfigSnapshot) -> ConfigSnapshot:
+        """Épingle un snapshot pour le thread courant (à défaire par unpin())."""
+        self._stack().append(snapshot)
+        return snapshot
+
+    def unpin(self) -> None:
+        """Retire le dernier snapshot épinglé par le thread courant."""
+        stack = self._stack()
+        if stack:
+            stack.pop()
+
+
+class SnapshotPin:
+    """
+    Épinglage d'un snapshot pour la durée d'un bloc ou d'une requête :
+        with ConfigManager.pin() as snapshot:
+            ...  # toutes les lectures voient snapshot.generation
+    Réentrant : un épinglage imbriqué réutilise le snapshot déjà épinglé. Hors d'un
+    `with` (Flask : before_request/teardown_request), appeler __enter__ puis __exit__
+    dans le même thread.
+    """
+    def __init__(self, store: SnapshotStore, resolve):
+        self.store = store
+        self.resolve = resolve
+        self.snapshot: Optional[ConfigSnapshot] = None
+
+    def __enter__(self) -> ConfigSnapshot:
+        self.snapshot = self.store.pin(self.store.pinned() or self.resolve())
+        return self.snapshot
+
+    def __exit__(self, exc_type=None, exc=None, tb=None) -> None:
+        self.store.unpin()
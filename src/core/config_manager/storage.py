@@ -0,0 +1,398 @@
+import os
+import json
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from src.core.exceptions import ConfigException
+from src.utils import serialization
+from src.utils.file_tools import atomic_write, file_lock
+from src.utils.frozen import FrozenDict, freeze
+from .cache import ConfigCache
+from .discovery import ConfigDiscovery
+from .merge import ConfigMerge
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), '../../config')
+
+# Stockage des config.yml de service derrière une interface commune :
+# - YamlDirStorage (défaut) : un fichier <CONFIG_DIR>/<service>/config.yml par service
+# - SqliteStorage : une ligne par (service, section, clé), lectures et écritures ponctuelles
+#   indexées, WAL, numéro de génération par ligne, par service et global
+# Un arbre de service a la forme {section: {clé: valeur}} ; une section non-dict (ou vide)
+# est stockée telle quelle sous la clé SECTION_VALUE.
+
+SECTION_VALUE = ''
+
+# Opération d'une transaction : (service, section, clé ou None, 'set'/'delete')
+Change = Tuple[str, str, Optional[str], str]
+
+
+class ConfigStorage(ABC):
+    """
+    Interface de stockage des configurations de service utilisée par ConfigManager
+    et ConfigTransaction.
+    """
+    @abstractmethod
+    def services(self) -> List[str]:
+        """Services stockés."""
+
+    @abstractmethod
+    def load(self, service: str) -> Dict[str, Any]:
+        """Arbre gelé d'un service ({} s'il n'existe pas)."""
+
+    def get(self, service: str, section: str, key: Optional[str] = None,
+            default: Any = None) -> Any:
+        """Valeur d'une clé (ou d'une section entière si `key` est None)."""
+        sect = self.load(service).get(section)
+        if key is None:
+            return default if sect is None else sect
+        return sect.get(key, default) if isinstance(sect, dict) else default
+
+    @abstractmethod
+    def lock(self, service: str):
+        """
+        Context manager sérialisant les transactions d'écriture sur un service, entre threads
+        et entre processus : une transaction le détient de la lecture jusqu'au commit.
+        """
+
+    @abstractmethod
+    def commit(self, service: str, config: Dict[str, Any], changes: List[Change]) -> None:
+        """
+        Enregistre le résultat d'une transaction.
+        Args:
+            service (str): Service modifié.
+            config (dict): Arbre complet après modification.
+            changes (list): Opérations appliquées à cet arbre.
+        """
+
+    def merged(self) -> Dict[str, Any]:
+        """Configuration globale : fusion des arbres de tous les services, gelée."""
+        return ConfigMerge.merge_many([self.load(service) for service in self.services()])
+
+    def generation(self) -> Optional[int]:
+        """Génération globale du stockage (None si non suivie)."""
+        return None
+
+
+class YamlDirStorage(ConfigStorage):
+    """
+    Arborescence YAML historique : <config_dir>/<service>/config.yml, lu via ConfigCache
+    et réécrit en entier (fichier temporaire + rename) à chaque transaction.
+    """
+    def __init__(self, config_dir: Optional[str] = None):
+        self._config_dir = config_dir
+
+    @property
+    def config_dir(self) -> str:
+        return self._config_dir or CONFIG_DIR
+
+    def path(self, service: str) -> str:
+        return os.path.join(self.config_dir, service, 'config.yml')
+
+    def services(self) -> List[str]:
+        return [os.path.relpath(os.path.dirname(path), self.config_dir)
+                for path in ConfigDiscovery.scan(self.config_dir).config]
+
+    def load(self, service: str) -> Dict[str, Any]:
+        path = self.path(service)
+        if not os.path.exists(path):
+            return FrozenDict()
+        try:
+            return ConfigCache.load(path)
+        except Exception as e:
+            raise ConfigException(f"Erreur lecture config {service}: {e}")
+
+    def lock(self, service: str):
+        return file_lock(self.path(service))
+
+    def commit(self, service: str, config: Dict[str, Any], changes: List[Change]) -> None:
+        path = self.path(service)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write(path, serialization.dumps(config))
+        finally:
+            ConfigCache.invalidate(path)
+
+    def merged(self) -> Dict[str, Any]:
+        if self._config_dir is not None:
+            return super().merged()
+        merged, _ = ConfigMerge.merge_configs_incremental()
+        return merged
+
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS config ("
+    " service TEXT NOT NULL, section TEXT NOT NULL, key TEXT NOT NULL,"
+    " value TEXT NOT NULL, generation INTEGER NOT NULL,"
+    " PRIMARY KEY (service, section, key)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS config_generation ON config (generation)",
+    "CREATE TABLE IF NOT EXISTS services ("
+    " service TEXT PRIMARY KEY, generation INTEGER NOT NULL) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID",
+    "INSERT OR IGNORE INTO meta (name, value) VALUES ('generation', 0)",
+)
+
+
+_INSERT = ("INSERT INTO config (service, section, key, value, generation) "
+           "VALUES (?, ?, ?, ?, ?)")
+_UPSERT = (_INSERT + " ON CONFLICT (service, section, key) DO UPDATE SET "
+           "value = excluded.value, generation = excluded.generation")
+_DELETE_SECTION = "DELETE FROM config WHERE service = ? AND section = ?"
+_DELETE_KEY = _DELETE_SECTION + " AND key = ?"
+
+
+def _encode(value: Any) -> str:
+    if not serialization.json_safe(value):
+        raise ConfigException(f"Valeur non stockable en JSON: {value!r}")
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class SqliteStorage(ConfigStorage):
+    """
+    Stockage SQLite indexé par (service, section, clé).
+    - lectures ponctuelles (get) et écritures ponctuelles (une ligne par clé modifiée)
+    - WAL : les lecteurs ne bloquent pas l'écrivain ; écritures en BEGIN IMMEDIATE
+    - une connexion par thread (et par processus après un fork), réutilisée
+    - génération : compteur global incrémenté à chaque écriture, recopié sur les lignes
+      et les services écrits ; load() et merged() ne relisent que si elle a changé
+    - import_yaml() / export_yaml() : conversion depuis et vers l'arborescence YAML
+    Exemple :
+        ConfigManager.set_storage(SqliteStorage('config.db').import_yaml(CONFIG_DIR))
+    """
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.path = os.path.abspath(path)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._trees: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._merged: Optional[Tuple[int, Dict[str, Any]]] = None
+        with self.connection() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    # --- connexions ---
+
+    def _connect(self):
+        import sqlite3  # import différé : coût de démarrage
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                               check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+        return conn
+
+    def connection(self):
+        """Connexion du thread courant (ouverte au premier usage, rouverte après un fork)."""
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is None or local.pid != os.getpid():
+            conn = local.conn = self._connect()
+            local.pid = os.getpid()
+        return conn
+
+    def close(self) -> None:
+        """Ferme la connexion du thread courant."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @contextmanager
+    def _write(self) -> Iterator[Tuple[Any, int]]:
+        """Transaction d'écriture : (connexion, nouvelle génération)."""
+        conn = self.connection()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'generation'")
+            generation = conn.execute(
+                "SELECT value FROM meta WHERE name = 'generation'").fetchone()[0]
+            yield conn, generation
+            conn.execute('COMMIT')
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+
+    # --- lectures ---
+
+    def generation(self, service: Optional[str] = None) -> int:
+        """
+        Génération globale, ou celle d'un service (0 s'il n'a jamais été écrit).
+        Une seule lecture indexée : à comparer pour invalider un cache.
+        """
+        conn = self.connection()
+        if service is None:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()
+        else:
+            row = conn.execute("SELECT generation FROM services WHERE service = ?",
+                               (service,)).fetchone()
+        return row[0] if row else 0
+
+    def services(self) -> List[str]:
+        return [row[0] for row in
+                self.connection().execute("SELECT service FROM services ORDER BY service")]
+
+    def load(self, service: str) -> Dict[str, Any]:
+        generation = self.generation(service)
+        cached = self._trees.get(service)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        tree: Dict[str, Any] = {}
+        rows = self.connection().execute(
+            "SELECT section, key, value FROM config WHERE service = ? ORDER BY section, key",
+            (service,))
+        for section, key, value in rows:
+            if key == SECTION_VALUE:
+                tree[section] = json.loads(value)
+            else:
+                tree.setdefault(section, {})[key] = json.loads(value)
+        frozen = freeze(tree)
+        self._trees[service] = (generation, frozen)
+        return frozen
+
+    def get(self, service: str, section: str, key: Optional[str] = None,
+            default: Any = None) -> Any:
+        if key is None:
+            return super().get(service, section, None, default)
+        row = self.connection().execute(
+            "SELECT value FROM config WHERE service = ? AND section = ? AND key = ?",
+            (service, section, str(key))).fetchone()
+        return default if row is None else freeze(json.loads(row[0]))
+
+    def changed_since(self, generation: int) -> List[str]:
+        """Services écrits après une génération donnée."""
+        return [row[0] for row in self.connection().execute(
+            "SELECT service FROM services WHERE generation > ? ORDER BY service", (generation,))]
+
+    def merged(self) -> Dict[str, Any]:
+        generation = self.generation()
+        cached = self._merged
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        merged = super().merged()
+        self._merged = (generation, merged)
+        return merged
+
+    # --- écritures ---
+
+    def lock(self, service: str):
+        # Une transaction lit, modifie puis écrit : le verrou (threads et processus, flock sur
+        # <base>.<service>.lock) couvre tout l'intervalle, sans tenir la base verrouillée
+        return file_lock(f"{self.path}.{service.replace(os.sep, '.')}")
+
+    @staticmethod
+    def _section_rows(service: str, section: str, value: Any, generation: int):
+        if isinstance(value, dict) and value:
+            return [(service, section, str(k), _encode(v), generation) for k, v in value.items()]
+        return [(service, section, SECTION_VALUE, _encode(value), generation)]
+
+    @staticmethod
+    def _touch(conn, service: str, generation: int) -> None:
+        conn.execute("INSERT INTO services (service, generation) VALUES (?, ?) "
+                     "ON CONFLICT (service) DO UPDATE SET generation = excluded.generation",
+                     (service, generation))
+
+    def _replace_section(self, conn, service: str, section: str, value: Any,
+                         generation: int) -> None:
+        conn.execute(_DELETE_SECTION, (service, section))
+        conn.executemany(_INSERT, self._section_rows(service, section, value, generation))
+
+    def set(self, service: str, section: str, key: str, value: Any) -> int:
+        """
+        Écrit une clé (une ligne). Une section stockée comme valeur non-dict est remplacée.
+        Returns:
+            int: Génération de l'écriture.
+        """
+        with self._write() as (conn, generation):
+            conn.execute(_DELETE_KEY, (service, section, SECTION_VALUE))
+            conn.execute(_UPSERT, (service, section, str(key), _encode(value), generation))
+            self._touch(conn, service, generation)
+        return generation
+
+    def delete(self, service: str, section: str, key: Optional[str] = None) -> bool:
+        """
+        Supprime une clé, ou une section entière si `key` est None.
+        Returns:
+            bool: True si une ligne a été supprimée.
+        """
+        with self._write() as (conn, generation):
+            if key is None:
+                cursor = conn.execute(_DELETE_SECTION, (service, section))
+            else:
+                cursor = conn.execute(_DELETE_KEY, (service, section, str(key)))
+            if cursor.rowcount:
+                self._touch(conn, service, generation)
+        return cursor.rowcount > 0
+
+    def commit(self, service: str, config: Dict[str, Any], changes: List[Change]) -> None:
+        # Seules les lignes des clés modifiées sont écrites ; une section absente du stockage
+        # (créée par la transaction avec ses valeurs par défaut) est écrite en entier.
+        with self._write() as (conn, generation):
+            for _, section, key, op in changes:
+                value = config.get(section)
+                if op == 'delete':
+                    if key is None:
+                        conn.execute(_DELETE_SECTION, (service, section))
+                    else:
+                        conn.execute(_DELETE_KEY, (service, section, str(key)))
+                    continue
+                exists = conn.execute(
+                    "SELECT 1 FROM config WHERE service = ? AND section = ? AND key != ? LIMIT 1",
+                    (service, section, SECTION_VALUE)).fetchone()
+                if exists is None or not isinstance(value, dict) or key not in value:
+                    self._replace_section(conn, service, section, value, generation)
+                    continue
+                conn.execute(_UPSERT,
+                             (service, section, str(key), _encode(value[key]), generation))
+            self._touch(conn, service, generation)
+
+    def write(self, service: str, config: Dict[str, Any]) -> int:
+        """
+        Remplace l'arbre complet d'un service.
+        Returns:
+            int: Génération de l'écriture.
+        """
+        with self._write() as (conn, generation):
+            conn.execute("DELETE FROM config WHERE service = ?", (service,))
+            for section, value in config.items():
+                conn.executemany(_INSERT,
+                                 self._section_rows(service, str(section), value, generation))
+            self._touch(conn, service, generation)
+        return generation
+
+    # --- import / export ---
+
+    def import_yaml(self, config_dir: Optional[str] = None) -> 'SqliteStorage':
+        """
+        Importe l'arborescence YAML (un config.yml par service) en une seule transaction ;
+        les services importés remplacent leurs lignes existantes.
+        Args:
+            config_dir (str): Répertoire source (CONFIG_DIR par défaut).
+        Returns:
+            SqliteStorage: l'instance, pour chaîner.
+        Raises:
+            ConfigException: si un fichier est illisible ou une valeur non stockable en JSON.
+        """
+        source = YamlDirStorage(config_dir)
+        trees = {service: source.load(service) for service in source.services()}
+        with self._write() as (conn, generation):
+            for service, tree in trees.items():
+                conn.execute("DELETE FROM config WHERE service = ?", (service,))
+                rows = [row for section, value in tree.items()
+                        for row in self._section_rows(service, str(section), value, generation)]
+                conn.executemany(_INSERT, rows)
+                self._touch(conn, service, generation)
+        return self
+
+    def export_yaml(self, config_dir: str) -> List[str]:
+        """
+        Écrit un config.yml par service sous `config_dir` (écritures atomiques).
+        Returns:
+            list: Chemins écrits.
+        """
+        target = YamlDirStorage(config_dir)
+        written = []
+        for service in self.services():
+            target.commit(service, self.load(service), [])
+            written.append(target.path(service))
+        return written
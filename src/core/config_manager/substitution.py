@@ -0,0 +1,207 @@
+import os
+import re
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from src.utils.frozen import FrozenDict, FrozenList
+
+Path = Tuple[Union[str, int], ...]
+
+# ${VAR} ou ${VAR:-défaut}, utilisable au milieu d'une chaîne
+_BRACED = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)(?::-([^}]*))?\}')
+
+MISSING = object()
+
+
+class Template:
+    """
+    Chaîne compilée contenant des références à l'environnement.
+    - `$VAR` (chaîne entière) : valeur de VAR, ou la chaîne telle quelle si absente
+    - `${VAR}` / `${VAR:-défaut}` : interpolation, y compris au milieu du texte
+    """
+    __slots__ = ('raw', 'parts', 'variables')
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.parts: List[Union[str, Tuple[str, Optional[str], str]]] = []
+        if raw.startswith('$') and not raw.startswith('${'):
+            self.parts = [(raw[1:], None, raw)]
+        else:
+            pos = 0
+            for m in _BRACED.finditer(raw):
+                if m.start() > pos:
+                    self.parts.append(raw[pos:m.start()])
+                self.parts.append((m.group(1), m.group(2), m.group(0)))
+                pos = m.end()
+            if pos < len(raw):
+                self.parts.append(raw[pos:])
+        self.variables = {p[0] for p in self.parts if isinstance(p, tuple)}
+
+    @staticmethod
+    def needed(value: Any) -> bool:
+        return isinstance(value, str) and '$' in value and (value.startswith('$') or '${' in value)
+
+    def render(self, env=os.environ) -> str:
+        whole = len(self.parts) == 1 and isinstance(self.parts[0], tuple)
+        if whole and not self.raw.startswith('${'):
+            name, _, original = self.parts[0]
+            return env.get(name, original)
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            name, default, original = part
+            value = env.get(name)
+            if value is None:
+                value = default if default is not None else original
+            out.append(value)
+        return ''.join(out)
+
+
+class CompiledSubstitution:
+    """
+    Substitution d'environnement compilée pour un arbre de configuration.
+    Les chemins des feuilles à substituer sont calculés une fois ; la résolution
+    d'un chemin ne reconstruit que les conteneurs menant à ces feuilles, et son
+    résultat est mis en cache tant que les variables concernées ne changent pas.
+    Les sous-arbres sans variable sont partagés avec l'arbre source.
+    """
+    def __init__(self, tree: Any):
+        self.tree = tree
+        self.templates: Dict[Path, Template] = {}
+        self._hot: Set[Path] = set()
+        self._vars_under: Dict[Path, Tuple[str, ...]] = {}
+        self._resolved: Dict[Path, Tuple[Tuple[Optional[str], ...], Any]] = {}
+        self._lock = threading.Lock()
+        self._compile(tree, ())
+
+    def _compile(self, node: Any, path: Path) -> None:
+        stack = [(node, path)]
+        while stack:
+            node, path = stack.pop()
+            if isinstance(node, dict):
+                stack.extend((v, path + (k,)) for k, v in node.items())
+            elif isinstance(node, list):
+                stack.extend((v, path + (i,)) for i, v in enumerate(node))
+            elif Template.needed(node):
+                self.templates[path] = Template(node)
+                for i in range(len(path) + 1):
+                    self._hot.add(path[:i])
+
+    @property
+    def variables(self) -> Set[str]:
+        names = set()
+        for template in self.templates.values():
+            names |= template.variables
+        return names
+
+    def _variables(self, path: Path) -> Tuple[str, ...]:
+        names = self._vars_under.get(path)
+        if names is None:
+            found = set()
+            n = len(path)
+            for leaf, template in self.templates.items():
+                if leaf[:n] == path:
+                    found |= template.variables
+            names = tuple(sorted(found))
+            self._vars_under[path] = names
+        return names
+
+    @staticmethod
+    def _get(node: Any, path: Path) -> Any:
+        for part in path:
+            if isinstance(node, dict):
+                if part not in node:
+                    return MISSING
+                node = node[part]
+            elif (isinstance(node, list) and isinstance(part, int)
+                  and -len(node) <= part < len(node)):
+                node = node[part]
+            else:
+                return MISSING
+        return node
+
+    def resolve(self, path: Path = (), default: Any = MISSING) -> Any:
+        """
+        Retourne la valeur substituée au chemin donné.
+        Args:
+            path (tuple): Chemin (clés/indices) depuis la racine.
+            default (Any): Valeur retournée si le chemin n'existe pas.
+        Returns:
+            Any: Valeur substituée (sous-arbres partagés, ne pas modifier).
+        """
+        node = self._get(self.tree, path)
+        if node is MISSING:
+            return default
+        if path not in self._hot:
+            return node
+        env_key = tuple(os.environ.get(name) for name in self._variables(path))
+        cached = self._resolved.get(path)
+        if cached is not None and cached[0] == env_key:
+            return cached[1]
+        value = self._rebuild(node, path)
+        with self._lock:
+            self._resolved[path] = (env_key, value)
+        return value
+
+    def sections(self) -> 'ResolvedSections':
+        """Vue de la racine dont chaque section n'est substituée qu'à son accès."""
+        return ResolvedSections(self)
+
+    def _rebuild(self, node: Any, path: Path) -> Any:
+        if path not in self._hot:
+            return node
+        if isinstance(node, dict):
+            return FrozenDict({k: self._rebuild(v, path + (k,)) for k, v in node.items()})
+        if isinstance(node, list):
+            return FrozenList([self._rebuild(v, path + (i,)) for i, v in enumerate(node)])
+        return self.templates[path].render()
+
+
+class ResolvedSections(Mapping):
+    """
+    Racine substituée paresseusement : `view[section]` équivaut à resolve((section,)).
+    Sert de couche `config` à un LayeredConfig sans substituer tout l'arbre.
+    """
+    __slots__ = ('_compiled',)
+
+    def __init__(self, compiled: CompiledSubstitution):
+        self._compiled = compiled
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._compiled.resolve((key,))
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        tree = self._compiled.tree
+        return iter(tree if isinstance(tree, dict) else ())
+
+    def __len__(self) -> int:
+        tree = self._compiled.tree
+        return len(tree) if isinstance(tree, dict) else 0
+
+
+_compiled: Dict[str, CompiledSubstitution] = {}
+_compiled_lock = threading.Lock()
+
+
+def compiled_for(key: str, tree: Any) -> CompiledSubstitution:
+    """
+    Retourne la substitution compilée d'un arbre ; elle n'est recompilée que
+    lorsque la source produit un nouvel arbre (nouvelle génération du cache).
+    Args:
+        key (str): Identifiant de la source (chemin du fichier).
+        tree (Any): Arbre de configuration.
+    Returns:
+        CompiledSubstitution: substitution compilée.
+    """
+    compiled = _compiled.get(key)
+    if compiled is not None and compiled.tree is tree:
+        return compiled
+    compiled = CompiledSubstitution(tree)
+    with _compiled_lock:
+        _compiled[key] = compiled
+    return compiled
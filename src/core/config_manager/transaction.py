@@ -0,0 +1,186 @@
+import os
+import copy
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from src.core.exceptions import ConfigException
+from src.utils import metrics
+from src.utils.frozen import thaw
+from ..defaults import get_defaults
+from ..schemas import get_schema
+from .storage import ConfigStorage, YamlDirStorage
+from .validation import ConfigValidation
+
+CHANGE_TOPIC = 'config.changed'
+
+_WRITE_SECONDS = metrics.histogram('memapp_config_write_seconds',
+                                   'Écritures de fichiers de configuration', ('target',))
+
+
+@dataclass
+class ConfigCommit:
+    """
+    Notification émise une fois par transaction validée.
+    - services : services dont le fichier a été réécrit
+    - changes : opérations appliquées (service, section, clé ou None, 'set'/'delete')
+    """
+    services: List[str] = field(default_factory=list)
+    changes: List[Tuple[str, str, Optional[str], str]] = field(default_factory=list)
+
+
+class ConfigTransaction:
+    """
+    Transaction d'écriture sur un ou plusieurs fichiers config.yml de service.
+    - verrouille chaque service (threads et processus) pendant toute la transaction
+    - applique les set/delete sur une copie de travail
+    - valide toutes les clés modifiées ensemble avec le schéma du service
+    - enregistre chaque service une seule fois via le stockage (YAML : fichier temporaire
+      + fsync + rename ; SQLite : lignes des clés modifiées)
+    - publie une seule notification ConfigCommit
+    En cas d'exception dans le bloc `with`, rien n'est écrit.
+    """
+    def __init__(self, services: List[str], config_dir: str, events=None,
+                 storage: Optional[ConfigStorage] = None):
+        if not services:
+            raise ConfigException("Transaction sans service")
+        self.services = list(dict.fromkeys(services))
+        self.config_dir = config_dir
+        self.events = events
+        self.storage = storage if storage is not None else YamlDirStorage(config_dir)
+        self._stack: Optional[ExitStack] = None
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._changes: List[Tuple[str, str, Optional[str], str]] = []
+        self._dirty: Dict[str, bool] = {}
+        self._touched: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def path(self, service: str) -> str:
+        return os.path.join(self.config_dir, service, 'config.yml')
+
+    def __enter__(self) -> 'ConfigTransaction':
+        self._stack = ExitStack()
+        try:
+            # Ordre de verrouillage stable pour éviter les interblocages
+            for service in sorted(self.services):
+                self._stack.enter_context(self.storage.lock(service))
+            for service in self.services:
+                self._configs[service] = self._load(service)
+        except Exception as e:
+            self._stack.close()
+            self._stack = None
+            raise ConfigException(f"Erreur ouverture transaction {self.services}: {e}")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.commit()
+        finally:
+            if self._stack is not None:
+                self._stack.close()
+                self._stack = None
+
+    def _load(self, service: str) -> Dict[str, Any]:
+        return thaw(self.storage.load(service))
+
+    def _service(self, service: Optional[str]) -> str:
+        if self._stack is None:
+            raise ConfigException("Transaction inactive : utiliser `with`")
+        if service is None:
+            if len(self.services) > 1:
+                raise ConfigException("Service requis dans une transaction multi-services")
+            return self.services[0]
+        if service not in self._configs:
+            raise ConfigException(f"Service hors transaction: {service}")
+        return service
+
+    def get(self, section: str, key: Optional[str] = None, service: Optional[str] = None) -> Any:
+        """Lit la copie de travail (modifications de la transaction incluses)."""
+        config = self._configs[self._service(service)]
+        sect = config.get(section, {})
+        return sect if key is None else (sect.get(key) if isinstance(sect, dict) else None)
+
+    def set(self, section: str, key: str, value: Any, service: Optional[str] = None) -> None:
+        """
+        Ajoute ou modifie un argument ; une section absente est initialisée avec les défauts.
+        Args:
+            section (str): Section concernée.
+            key (str): Clé à modifier.
+            value (Any): Valeur à affecter.
+            service (str): Service concerné (obligatoire en multi-services).
+        """
+        service = self._service(service)
+        config = self._configs[service]
+        if section not in config:
+            config[section] = copy.deepcopy(get_defaults(service).get(section, {}))
+        config[section][key] = value
+        self._touched.setdefault((service, section), {})[key] = value
+        self._dirty[service] = True
+        self._changes.append((service, section, key, 'set'))
+
+    def delete(self, section: str, key: Optional[str] = None,
+               service: Optional[str] = None) -> bool:
+        """
+        Supprime un argument, ou la section entière si `key` est None.
+        Returns:
+            bool: True si quelque chose a été supprimé.
+        """
+        service = self._service(service)
+        config = self._configs[service]
+        if section not in config:
+            return False
+        if key is None:
+            del config[section]
+            self._touched.pop((service, section), None)
+        elif isinstance(config[section], dict) and key in config[section]:
+            del config[section][key]
+            self._touched.get((service, section), {}).pop(key, None)
+        else:
+            return False
+        self._dirty[service] = True
+        self._changes.append((service, section, key, 'delete'))
+        return True
+
+    def validate(self) -> None:
+        """
+        Valide ensemble toutes les clés modifiées, section par section.
+        Raises:
+            ConfigException: si une valeur est refusée par le schéma.
+        """
+        failures = []
+        for (service, section), values in self._touched.items():
+            schema = get_schema(service)
+            if not values or section not in schema:
+                continue
+            rules = {k: schema[section].get(k, {}) for k in values}
+            errors = ConfigValidation.validate_many([values], rules).get(0, {})
+            failures.extend(f"{service}.{section}.{k}: {values.get(k)}" for k in errors)
+        if failures:
+            raise ConfigException(f"Validation échouée pour {', '.join(failures)}")
+
+    def commit(self) -> ConfigCommit:
+        """
+        Valide puis écrit les fichiers modifiés et publie la notification.
+        Returns:
+            ConfigCommit: services réécrits et opérations appliquées.
+        Raises:
+            ConfigException: en cas d'erreur de validation ou d'écriture.
+        """
+        self.validate()
+        written = []
+        for service in self.services:
+            if not self._dirty.get(service):
+                continue
+            try:
+                with _WRITE_SECONDS.time('service'):
+                    changes = [change for change in self._changes if change[0] == service]
+                    self.storage.commit(service, self._configs[service], changes)
+            except Exception as e:
+                raise ConfigException(f"Erreur écriture config {service}: {e}")
+            written.append(service)
+        commit = ConfigCommit(written, list(self._changes))
+        self._dirty.clear()
+        self._touched.clear()
+        self._changes = []
+        if written and self.events is not None:
+            self.events.publish(CHANGE_TOPIC, commit)
+        return commit
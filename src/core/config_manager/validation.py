@@ -1,13 +1,72 @@
 # Validation avancée (Cerberus)
 # (à déplacer le contenu de l'ancien config_validation.py ici)
 
-from cerberus import Validator
+import json
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union
 from src.core.exceptions import ConfigException
+from src.utils import metrics
+
+if TYPE_CHECKING:
+    from cerberus import Validator
+
+_VALIDATION_SECONDS = metrics.histogram('memapp_config_validation_seconds', 'Validations Cerberus',
+                                        ('kind',))
+
 
 class ConfigValidation:
     """
     Module de validation avancée des configurations (Cerberus).
+    Chaque schéma n'est compilé qu'une fois : les validateurs sont conservés
+    dans un registre indexé par l'empreinte du contenu du schéma.
+    Cerberus n'est importé qu'à la première compilation.
     """
+    _registry: Dict[str, Tuple['Validator', threading.Lock]] = {}
+    _registry_lock = threading.Lock()
+
+    @staticmethod
+    def schema_key(schema: dict) -> str:
+        """
+        Calcule l'empreinte stable d'un schéma.
+        Args:
+            schema (dict): Schéma Cerberus.
+        Returns:
+            str: Empreinte SHA-1 du schéma sérialisé.
+        """
+        raw = json.dumps(schema, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _compiled(schema: dict, allow_unknown: bool = False) -> Tuple['Validator', threading.Lock]:
+        key = ConfigValidation.schema_key(schema) + ('+' if allow_unknown else '')
+        compiled = ConfigValidation._registry.get(key)
+        if compiled is None:
+            with ConfigValidation._registry_lock:
+                compiled = ConfigValidation._registry.get(key)
+                if compiled is None:
+                    from cerberus import Validator  # import différé : coût de démarrage
+                    compiled = (Validator(schema, allow_unknown=allow_unknown), threading.Lock())
+                    ConfigValidation._registry[key] = compiled
+        return compiled
+
+    @staticmethod
+    def get_validator(schema: dict) -> 'Validator':
+        """
+        Retourne le validateur compilé d'un schéma (compilé au premier appel).
+        Le validateur n'est pas thread-safe : préférer validate_config/validate_many.
+        Args:
+            schema (dict): Schéma Cerberus.
+        Returns:
+            Validator: Validateur Cerberus.
+        Raises:
+            ConfigException: si le schéma est invalide.
+        """
+        try:
+            return ConfigValidation._compiled(schema)[0]
+        except Exception as e:
+            raise ConfigException(f"Erreur validation Cerberus: {e}")
+
     @staticmethod
     def validate_config(config: dict, schema: dict) -> bool:
         """
@@ -21,7 +80,86 @@ class ConfigValidation:
             ConfigException: en cas d’erreur de validation.
         """
         try:
-            v = Validator(schema)
-            return v.validate(config)
+            validator, lock = ConfigValidation._compiled(schema)
+            with lock, _VALIDATION_SECONDS.time('single'):
+                return validator.validate(config)
         except Exception as e:
             raise ConfigException(f"Erreur validation Cerberus: {e}")
+
+    @staticmethod
+    def validate_many(configs: Union[List[dict], Dict[str, Any]], schema: dict) -> Dict[Any, dict]:
+        """
+        Valide un lot de configurations avec un seul validateur compilé.
+        - liste : chaque élément est validé contre `schema` (mises à jour candidates)
+        - dict : arbre fusionné validé en une passe contre un arbre de schémas
+          (format de merge_schemas() / schemas_globale.json)
+        Args:
+            configs (list | dict): Configurations ou arbre fusionné.
+            schema (dict): Schéma Cerberus, ou arbre de schémas pour un dict.
+        Returns:
+            dict: Erreurs par index (liste) ou par section racine (arbre) ; vide si tout est valide.
+        Raises:
+            ConfigException: en cas d’erreur de validation.
+        """
+        try:
+            if isinstance(configs, dict):
+                tree_schema = ConfigValidation.compile_tree_schema(schema)
+                validator, lock = ConfigValidation._compiled(tree_schema, allow_unknown=True)
+                with lock, _VALIDATION_SECONDS.time('tree'):
+                    if validator.validate(configs):
+                        return {}
+                    return dict(validator.errors)
+            validator, lock = ConfigValidation._compiled(schema)
+            errors = {}
+            with lock, _VALIDATION_SECONDS.time('batch'):
+                for i, config in enumerate(configs):
+                    if not validator.validate(config):
+                        errors[i] = validator.errors
+            return errors
+        except Exception as e:
+            raise ConfigException(f"Erreur validation Cerberus: {e}")
+
+    @staticmethod
+    def _is_rules(node: Any) -> bool:
+        """Indique si un nœud de schéma est un jeu de règles Cerberus (feuille)."""
+        if not isinstance(node, dict):
+            return False
+        if 'type' in node:
+            return isinstance(node['type'], (str, list))
+        return all(not isinstance(v, dict) for v in node.values())
+
+    @staticmethod
+    def compile_tree_schema(tree: dict) -> dict:
+        """
+        Convertit un arbre de schémas (service -> section -> clé -> règles)
+        en un schéma Cerberus imbriqué validant l'arbre fusionné en une passe.
+        Les niveaux structurels acceptent les clés inconnues, les sections restent strictes.
+        Args:
+            tree (dict): Arbre de schémas.
+        Returns:
+            dict: Schéma Cerberus imbriqué.
+        """
+        def convert(node: dict) -> dict:
+            result = {}
+            for k, v in node.items():
+                if not isinstance(v, dict):
+                    continue
+                if ConfigValidation._is_rules(v):
+                    result[k] = v
+                elif all(ConfigValidation._is_rules(r) for r in v.values()):
+                    result[k] = {'type': 'dict', 'schema': v}
+                else:
+                    result[k] = {'type': 'dict', 'allow_unknown': True, 'schema': convert(v)}
+            return result
+        return convert(tree)
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Vide le registre des validateurs compilés."""
+        with ConfigValidation._registry_lock:
+            ConfigValidation._registry.clear()
+
+    @staticmethod
+    def cache_size() -> int:
+        """Nombre de schémas compilés dans le registre."""
+        return len(ConfigValidation._registry)
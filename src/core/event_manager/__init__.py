@@ -1 +1,5 @@
+from .dispatch import (AsyncioDispatcher, Dispatcher, HandlerResult, SyncDispatcher,
+                       ThreadPoolDispatcher)
+from .journal import EventJournal, JournalCursor, JournalRecord
 from .manager import EventManager
+from .routing import Subscription, TopicRouter
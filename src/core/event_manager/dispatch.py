@@ -0,0 +1,206 @@
+import time
+import inspect
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, List, Optional
+from src.core.exceptions import EventException
+from src.utils import metrics
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+# asyncio et concurrent.futures sont importés à la première utilisation (coût de démarrage)
+
+_HANDLER_SECONDS = metrics.histogram('memapp_event_handler_seconds',
+                                     'Exécution des handlers d\'événements')
+_HANDLER_ERRORS = metrics.counter('memapp_event_handler_errors_total',
+                                  'Handlers d\'événements en erreur')
+
+
+@dataclass
+class HandlerResult:
+    """
+    Résultat de l'exécution d'un handler : durée (secondes) et éventuelle erreur.
+    """
+    event_type: str
+    handler: Callable
+    duration: float
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_handler(event_type: str, handler: Callable, data: Any) -> HandlerResult:
+    """
+    Exécute un handler en isolant ses erreurs et en mesurant sa latence.
+    Un handler `async def` appelé hors boucle asyncio est exécuté jusqu'au bout.
+    Args:
+        event_type (str): Type d'événement.
+        handler (callable): Handler à exécuter.
+        data (Any): Données de l'événement.
+    Returns:
+        HandlerResult: Résultat de l'exécution.
+    """
+    start = time.perf_counter()
+    error = None
+    try:
+        result = handler(data)
+        if inspect.isawaitable(result):
+            import asyncio
+            asyncio.run(_await(result))
+    except Exception as e:
+        error = e
+    return HandlerResult(event_type, handler, time.perf_counter() - start, error)
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+async def run_handler_async(event_type: str, handler: Callable, data: Any) -> HandlerResult:
+    """
+    Variante asynchrone de run_handler : les handlers synchrones s'exécutent
+    dans l'executor de la boucle pour ne pas la bloquer.
+    """
+    start = time.perf_counter()
+    error = None
+    try:
+        if inspect.iscoroutinefunction(handler):
+            await handler(data)
+        else:
+            import asyncio
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, handler, data)
+            if inspect.isawaitable(result):
+                await result
+    except Exception as e:
+        error = e
+    return HandlerResult(event_type, handler, time.perf_counter() - start, error)
+
+
+class Dispatcher(ABC):
+    """
+    Stratégie de distribution des événements aux handlers.
+    `report` est appelé avec chaque HandlerResult (latence, erreur).
+    Les sous-classes implémentent dispatch().
+    """
+    def __init__(self, report: Optional[Callable[[HandlerResult], None]] = None):
+        self.report = report or Dispatcher.default_report
+
+    @staticmethod
+    def default_report(result: HandlerResult) -> None:
+        if result.error is not None:
+            name = getattr(result.handler, '__qualname__', repr(result.handler))
+            print(f"Event handler error ({result.event_type}, {name}): {result.error}")
+
+    def _reported(self, result: HandlerResult) -> HandlerResult:
+        _HANDLER_SECONDS.observe(result.duration)
+        if result.error is not None:
+            _HANDLER_ERRORS.inc()
+        try:
+            self.report(result)
+        except Exception:
+            pass
+        return result
+
+    def run(self, event_type: str, handler: Callable, data: Any) -> HandlerResult:
+        """
+        Exécute un handler dans le thread appelant (rejeu du journal) et rapporte son
+        résultat comme une distribution ordinaire.
+        """
+        return self._reported(run_handler(event_type, handler, data))
+
+    @abstractmethod
+    def dispatch(self, event_type: str, handlers: List[Callable], data: Any) -> Any:
+        """
+        Distribue un événement aux handlers.
+        Returns:
+            Résultat propre à la stratégie (HandlerResult, Future ou tâche asyncio).
+        """
+
+    async def dispatch_async(self, event_type: str, handlers: List[Callable],
+                             data: Any) -> List[HandlerResult]:
+        """Distribution depuis une coroutine ; par défaut, délègue à dispatch() dans l'executor."""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.dispatch, event_type, handlers, data)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Libère les ressources de la stratégie."""
+
+
+class SyncDispatcher(Dispatcher):
+    """
+    Distribution séquentielle sur le thread appelant (mode par défaut).
+    """
+    def dispatch(self, event_type: str, handlers: List[Callable], data: Any) -> List[HandlerResult]:
+        return [self.run(event_type, h, data) for h in handlers]
+
+
+class ThreadPoolDispatcher(Dispatcher):
+    """
+    Distribution parallèle sur un pool de threads, avec file bornée.
+    Lorsque `max_queue` exécutions sont en attente, publish() bloque (backpressure)
+    ou lève EventException si `block` vaut False ou si `timeout` expire.
+    """
+    def __init__(self, max_workers: int = 4, max_queue: int = 1024, block: bool = True,
+                 timeout: Optional[float] = None,
+                 report: Optional[Callable[[HandlerResult], None]] = None):
+        super().__init__(report)
+        from concurrent.futures import ThreadPoolExecutor
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='memapp-event')
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self.block = block
+        self.timeout = timeout
+
+    def _execute(self, event_type: str, handler: Callable, data: Any) -> HandlerResult:
+        try:
+            return self._reported(run_handler(event_type, handler, data))
+        finally:
+            self._slots.release()
+
+    def dispatch(self, event_type: str, handlers: List[Callable], data: Any) -> List['Future']:
+        futures = []
+        for handler in handlers:
+            if not self._slots.acquire(self.block, self.timeout if self.block else None):
+                raise EventException(f"File d'événements pleine ({event_type})")
+            try:
+                futures.append(self._executor.submit(self._execute, event_type, handler, data))
+            except Exception:
+                self._slots.release()
+                raise
+        return futures
+
+    async def dispatch_async(self, event_type: str, handlers: List[Callable],
+                             data: Any) -> List[HandlerResult]:
+        import asyncio
+        futures = self.dispatch(event_type, handlers, data)
+        return list(await asyncio.gather(*(asyncio.wrap_future(f) for f in futures)))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+class AsyncioDispatcher(Dispatcher):
+    """
+    Distribution asyncio : les handlers `async def` s'exécutent concurremment
+    sur la boucle, les handlers synchrones dans son executor.
+    publish() depuis la boucle planifie une tâche ; hors boucle, il attend la fin.
+    """
+    def dispatch(self, event_type: str, handlers: List[Callable], data: Any) -> Any:
+        import asyncio
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.dispatch_async(event_type, handlers, data))
+        return loop.create_task(self.dispatch_async(event_type, handlers, data))
+
+    async def dispatch_async(self, event_type: str, handlers: List[Callable],
+                             data: Any) -> List[HandlerResult]:
+        import asyncio
+        results = await asyncio.gather(*(run_handler_async(event_type, h, data) for h in handlers))
+        return [self._reported(r) for r in results]
@@ -0,0 +1,445 @@
+import os
+import json
+import time
+import zlib
+import struct
+import threading
+import dataclasses
+from typing import Any, Iterator, List, NamedTuple, Optional
+from src.core.exceptions import EventException
+from src.utils import metrics
+
+# Journal d'événements en ajout seul, découpé en segments <première séquence>.log.
+# Enregistrement (little-endian) :
+#   longueur du corps (u32) | crc32 (u32) | séquence (u64) | horodatage (f64)
+#   | longueur du topic (u16) | corps = topic UTF-8 + données JSON
+# Le crc couvre le corps puis les champs séquence/horodatage/longueur du topic.
+# Les ajouts sont regroupés en mémoire et écrits par un thread unique (group commit) : un
+# write() et un fsync par lot, déclenchés après `flush_interval` secondes ou `flush_bytes`
+# octets.
+
+_PREFIX = struct.Struct('<II')
+_TAIL = struct.Struct('<QdH')
+HEADER_SIZE = _PREFIX.size + _TAIL.size
+SEGMENT_SUFFIX = '.log'
+DEFAULT_SEGMENT_BYTES = 64 << 20
+MAX_RECORD = 16 << 20
+
+_RECORDS = metrics.counter('memapp_event_journal_records_total', 'Événements journalisés')
+_FLUSH_SECONDS = metrics.histogram('memapp_event_journal_flush_seconds',
+                                   'Écriture et fsync d\'un lot du journal')
+
+
+class JournalRecord(NamedTuple):
+    """Événement relu du journal ; `data` est la donnée décodée depuis JSON."""
+    offset: int
+    topic: str
+    timestamp: float
+    data: Any
+
+
+def _default(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return repr(value)
+
+
+def encode_data(data: Any) -> bytes:
+    """Données d'un événement en JSON (dataclasses en dict, objets inconnus en repr)."""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'),
+                      default=_default).encode('utf-8')
+
+
+def read_record(f) -> Optional[tuple]:
+    """
+    Lit l'enregistrement suivant d'un fichier de segment.
+    Returns:
+        tuple: (séquence, horodatage, topic, données brutes), ou None en fin de fichier ou
+        devant un enregistrement incomplet (la position du fichier est alors inchangée).
+    Raises:
+        EventException: si l'enregistrement est corrompu.
+    """
+    start = f.tell()
+    header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        f.seek(start)
+        return None
+    length, crc = _PREFIX.unpack_from(header)
+    if length > MAX_RECORD:
+        raise EventException(f"Enregistrement de journal invalide à {start} ({length} octets)")
+    body = f.read(length)
+    if len(body) < length:
+        f.seek(start)
+        return None
+    if zlib.crc32(header[_PREFIX.size:], zlib.crc32(body)) != crc:
+        raise EventException(f"Enregistrement de journal corrompu à {start}")
+    seq, timestamp, topic_length = _TAIL.unpack_from(header, _PREFIX.size)
+    return seq, timestamp, body[:topic_length].decode('utf-8'), body[topic_length:]
+
+
+def segment_name(first: int) -> str:
+    return f"{first:020d}{SEGMENT_SUFFIX}"
+
+
+def list_segments(directory: str) -> List[int]:
+    """Premières séquences des segments d'un répertoire, triées."""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return sorted(int(name[:-len(SEGMENT_SUFFIX)]) for name in names
+                  if name.endswith(SEGMENT_SUFFIX) and name[:-len(SEGMENT_SUFFIX)].isdigit())
+
+
+class EventJournal:
+    """
+    Journal durable des événements publiés, en ajout seul.
+    - append() encode l'événement, lui attribue un offset (séquence croissante) et le met
+      en tampon ; le thread d'écriture vide le tampon par lots (un write + un fsync)
+    - flush_interval / flush_bytes : latence maximale et taille déclenchant un lot
+    - append(..., wait=True) ou flush() attendent que l'événement soit sur disque
+    - rotation au-delà de `segment_bytes`, conservation des `max_segments` derniers segments
+    - à l'ouverture, une fin de segment tronquée (arrêt brutal) est coupée
+    - cursor(offset) relit les événements à partir d'un offset
+    """
+    def __init__(self, directory: str, segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 flush_interval: float = 0.005, flush_bytes: int = 1 << 20, fsync: bool = True,
+                 max_segments: Optional[int] = None, max_buffer: int = 64 << 20):
+        self.directory = os.path.abspath(directory)
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.fsync = fsync
+        self.max_segments = max_segments
+        self.max_buffer = max(max_buffer, flush_bytes)
+        self._lock = threading.Lock()
+        self._pending = threading.Condition(self._lock)
+        self._durable_cond = threading.Condition(self._lock)
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._batch_first = 0
+        self._first_at = 0.0
+        self._force = False
+        self._closing = False
+        self._stopped = False
+        self._detached = False
+        self._error: Optional[BaseException] = None
+        os.makedirs(self.directory, exist_ok=True)
+        self._segment_first, self._next = self._recover()
+        self._durable = self._next - 1
+        self._fd = self._open_segment(self._segment_first)
+        self._segment_size = os.fstat(self._fd).st_size
+        self._thread = threading.Thread(target=self._run, name='memapp-event-journal', daemon=True)
+        self._thread.start()
+
+    def _segment_path(self, first: int) -> str:
+        return os.path.join(self.directory, segment_name(first))
+
+    def _open_segment(self, first: int) -> int:
+        return os.open(self._segment_path(first), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _recover(self):
+        """
+        Dernier segment : coupe une fin incomplète ou corrompue.
+        Returns:
+            tuple: (premier offset du segment, offset suivant).
+        """
+        segments = list_segments(self.directory)
+        if not segments:
+            return 0, 0
+        first = segments[-1]
+        path = self._segment_path(first)
+        next_seq = first
+        valid = 0
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    record = read_record(f)
+                except EventException:
+                    record = None
+                if record is None:
+                    break
+                next_seq = record[0] + 1
+                valid = f.tell()
+        if valid < os.path.getsize(path):
+            cut = os.path.getsize(path) - valid
+            print(f"Event journal: fin de segment tronquée ({path}, {cut} octets)")
+            with open(path, 'r+b') as f:
+                f.truncate(valid)
+        return first, next_seq
+
+    # --- écriture ---
+
+    @property
+    def next_offset(self) -> int:
+        """Offset attribué au prochain événement."""
+        return self._next
+
+    @property
+    def durable_offset(self) -> int:
+        """Dernier offset écrit (et synchronisé) sur disque, -1 si aucun."""
+        return self._durable
+
+    def append(self, topic: str, data: Any, wait: bool = False,
+               timeout: Optional[float] = None) -> int:
+        """
+        Journalise un événement.
+        Args:
+            topic (str): Topic de l'événement.
+            data (Any): Données (encodées en JSON).
+            wait (bool): Attendre l'écriture sur disque du lot contenant l'événement.
+            timeout (float): Attente maximale (secondes) avec `wait`.
+        Returns:
+            int: Offset de l'événement.
+        Raises:
+            EventException: journal fermé, en erreur, ou délai d'attente dépassé.
+        """
+        raw_topic = topic.encode('utf-8')
+        body = raw_topic + encode_data(data)
+        if len(body) > MAX_RECORD:
+            raise EventException(f"Événement trop volumineux pour le journal ({len(body)} octets)")
+        # crc du corps hors verrou ; les champs d'en-tête (séquence) y sont ajoutés sous verrou
+        body_crc = zlib.crc32(body)
+        timestamp = time.time()
+        topic_length = len(raw_topic)
+        with self._lock:
+            if self._closing or self._error is not None:
+                raise EventException(f"Journal indisponible: {self._error or 'fermé'}")
+            while self._buffered >= self.max_buffer and self._error is None:
+                self._durable_cond.wait()
+            seq = self._next
+            self._next += 1
+            tail = _TAIL.pack(seq, timestamp, topic_length)
+            record = _PREFIX.pack(len(body), zlib.crc32(tail, body_crc)) + tail + body
+            if not self._buffer:
+                self._batch_first = seq
+                self._first_at = time.monotonic()
+                self._pending.notify()
+            self._buffer.append(record)
+            self._buffered += len(record)
+            if self._buffered >= self.flush_bytes:
+                self._pending.notify()
+        _RECORDS.inc()
+        if wait:
+            self.wait(seq, timeout)
+        return seq
+
+    def wait(self, offset: int, timeout: Optional[float] = None) -> None:
+        """
+        Attend que l'offset soit sur disque.
+        Raises:
+            EventException: si le délai expire ou si l'écriture a échoué.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while self._durable < offset and self._error is None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise EventException(f"Journal : offset {offset} non écrit après {timeout}s")
+                self._durable_cond.wait(remaining)
+            if self._error is not None:
+                raise EventException(f"Écriture du journal en échec: {self._error}")
+
+    def flush(self, timeout: Optional[float] = None) -> int:
+        """
+        Écrit immédiatement le tampon et attend sa synchronisation.
+        Returns:
+            int: Dernier offset sur disque.
+        """
+        with self._lock:
+            target = self._next - 1
+            if self._durable >= target:
+                return self._durable
+            self._force = True
+            self._pending.notify()
+        self.wait(target, timeout)
+        return target
+
+    def _run(self) -> None:
+        try:
+            self._drain()
+        finally:
+            with self._lock:
+                self._stopped = True
+                release = self._detached
+            if release:
+                os.close(self._fd)
+
+    def _drain(self) -> None:
+        while True:
+            with self._lock:
+                while not self._buffer and not self._closing:
+                    self._pending.wait()
+                if not self._buffer:
+                    return
+                # Fenêtre de regroupement : d'autres ajouts rejoignent le lot
+                deadline = self._first_at + self.flush_interval
+                while (self._buffered < self.flush_bytes and not self._force and not self._closing
+                       and time.monotonic() < deadline):
+                    self._pending.wait(deadline - time.monotonic())
+                batch, self._buffer = self._buffer, []
+                first, last = self._batch_first, self._next - 1
+                size, self._buffered = self._buffered, 0
+                self._force = False
+            try:
+                with _FLUSH_SECONDS.time():
+                    self._write(batch, first, size)
+            except OSError as e:
+                with self._lock:
+                    self._error = e
+                    self._durable_cond.notify_all()
+                print(f"Event journal: écriture impossible ({e})")
+                return
+            with self._lock:
+                self._durable = last
+                self._durable_cond.notify_all()
+
+    def _write(self, batch: List[bytes], first: int, size: int) -> None:
+        if self._segment_size and self._segment_size + size > self.segment_bytes:
+            self._rotate(first)
+        data = memoryview(b''.join(batch))
+        while data:
+            written = os.write(self._fd, data)
+            data = data[written:]
+        self._segment_size += size
+        if self.fsync:
+            (os.fdatasync if hasattr(os, 'fdatasync') else os.fsync)(self._fd)
+
+    def _rotate(self, first: int) -> None:
+        if self.fsync:
+            os.fsync(self._fd)
+        os.close(self._fd)
+        self._fd = self._open_segment(first)
+        self._segment_first, self._segment_size = first, 0
+        if self.fsync and hasattr(os, 'O_DIRECTORY'):
+            dir_fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        if self.max_segments:
+            for old in list_segments(self.directory)[:-self.max_segments]:
+                try:
+                    os.unlink(self._segment_path(old))
+                except FileNotFoundError:
+                    pass
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Écrit le tampon, arrête le thread d'écriture et ferme le segment courant.
+        Si le thread écrit encore après `timeout`, c'est lui qui fermera le segment en sortant.
+        """
+        with self._lock:
+            if self._closing:
+                return
+            self._closing = True
+            self._pending.notify()
+        self._thread.join(timeout)
+        with self._lock:
+            if not self._stopped:
+                self._detached = True
+                print(f"Event journal: écriture toujours en cours après {timeout}s")
+                return
+        os.close(self._fd)
+
+    def __enter__(self) -> 'EventJournal':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # --- relecture ---
+
+    def segments(self) -> List[str]:
+        """Chemins des segments, du plus ancien au plus récent."""
+        return [self._segment_path(first) for first in list_segments(self.directory)]
+
+    def cursor(self, offset: int = 0) -> 'JournalCursor':
+        """Curseur de relecture à partir d'un offset (événements déjà écrits sur disque)."""
+        return JournalCursor(self.directory, offset)
+
+
+class JournalCursor:
+    """
+    Relecture séquentielle du journal à partir d'un offset, à travers les segments.
+    `offset` est le prochain offset à lire : à conserver pour reprendre plus tard.
+    Les événements encore en tampon (non écrits) ne sont pas visibles : voir
+    EventJournal.flush().
+    Si l'offset demandé a été supprimé par la rotation, la relecture part du plus ancien.
+    """
+    def __init__(self, directory: str, offset: int = 0):
+        self.directory = directory
+        self.offset = offset
+        self._file = None
+        self._segment: Optional[int] = None
+
+    def _open(self) -> bool:
+        segments = list_segments(self.directory)
+        candidates = [first for first in segments if first <= self.offset]
+        if candidates:
+            first = candidates[-1]
+        elif segments:
+            first = segments[0]
+            self.offset = first
+        else:
+            return False
+        self._file = open(os.path.join(self.directory, segment_name(first)), 'rb')
+        self._segment = first
+        return True
+
+    def _next_segment(self) -> bool:
+        later = [first for first in list_segments(self.directory) if first > self._segment]
+        if not later:
+            return False
+        self._file.close()
+        self._file = open(os.path.join(self.directory, segment_name(later[0])), 'rb')
+        self._segment = later[0]
+        return True
+
+    def read(self, max_records: Optional[int] = None) -> List[JournalRecord]:
+        """
+        Lit les événements disponibles à partir de `offset`.
+        Args:
+            max_records (int): Nombre maximal d'événements (tous si None).
+        Returns:
+            list: JournalRecord lus ; `offset` avance d'autant.
+        Raises:
+            EventException: si un segment scellé est corrompu.
+        """
+        out: List[JournalRecord] = []
+        if self._file is None and not self._open():
+            return out
+        while max_records is None or len(out) < max_records:
+            record = read_record(self._file)
+            if record is None:
+                # Fin du segment : un segment plus récent signifie que celui-ci est complet
+                if self._next_segment():
+                    continue
+                break
+            seq, timestamp, topic, raw = record
+            if seq < self.offset:
+                continue
+            data = json.loads(raw.decode('utf-8')) if raw else None
+            out.append(JournalRecord(seq, topic, timestamp, data))
+            self.offset = seq + 1
+        return out
+
+    def __iter__(self) -> Iterator[JournalRecord]:
+        while True:
+            records = self.read(1024)
+            if not records:
+                return
+            yield from records
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'JournalCursor':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
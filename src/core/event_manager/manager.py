@@ -1,14 +1,150 @@
+import threading
+from .dispatch import Dispatcher, SyncDispatcher
+from .journal import EventJournal
+from .routing import TopicRouter
+from src.core.exceptions import EventException
+from src.utils import metrics
+
+_PUBLISH_SECONDS = metrics.histogram('memapp_event_publish_seconds',
+                                     'Publication d\'événements (résolution et distribution)')
+_PUBLISHED = metrics.counter('memapp_events_published_total', 'Événements publiés')
+
+
 class EventManager:
     """
     Gestionnaire centralisé des événements pour memApp.
     Permet l’abonnement, la publication et la gestion des handlers.
+    Les topics sont hiérarchiques (`config.memApp.watchdog`) et acceptent les
+    jokers `*` (un segment) et `#` (zéro ou plusieurs segments).
+    La distribution est déléguée à une stratégie (synchrone par défaut,
+    pool de threads ou asyncio) qui isole les erreurs des handlers.
+    Avec un journal (EventJournal), chaque événement publié est d'abord journalisé ;
+    un abonné tardif peut rejouer les événements passés depuis un offset.
     """
-    def __init__(self):
-        self.subscribers = {}
-    def subscribe(self, event_type, handler):
-        if event_type not in self.subscribers:
-            self.subscribers[event_type] = []
-        self.subscribers[event_type].append(handler)
+    def __init__(self, dispatcher: Dispatcher = None, journal: EventJournal = None):
+        self.router = TopicRouter()
+        self.dispatcher = dispatcher or SyncDispatcher()
+        self.journal = journal
+        # Avec un journal : offset et handlers d'un événement sont fixés ensemble, et les
+        # événements destinés à un abonné en cours de rejeu lui sont retenus (voir subscribe)
+        self._publish_lock = threading.Lock()
+        self._replaying = []
+    @property
+    def subscribers(self):
+        """Handlers vivants par motif d'abonnement."""
+        return self.router.patterns()
+    def subscribe(self, event_type, handler, priority=0, weak=False, replay_from=None):
+        """
+        Abonne un handler à un topic ou un motif.
+        Args:
+            event_type (str): Topic ou motif (`config.*`, `config.#`).
+            handler (callable): Handler appelé avec les données de l'événement.
+            priority (int): Priorité d'appel (les plus élevées d'abord).
+            weak (bool): Référence faible, l'abonnement disparaît avec l'objet du handler.
+            replay_from (int): Offset du journal à partir duquel rejouer les événements passés
+                avant de recevoir les suivants, dans l'ordre des offsets et sans doublon.
+        Returns:
+            Subscription: Abonnement créé.
+        """
+        if replay_from is None:
+            return self.router.subscribe(event_type, handler, priority, weak)
+        journal = self._journal()
+        held = (handler, [])
+        with self._publish_lock:
+            until = journal.next_offset
+            subscription = self.router.subscribe(event_type, handler, priority, weak)
+            self._replaying.append(held)
+        try:
+            self.replay(event_type, handler, replay_from, until=until)
+        finally:
+            self._release(held)
+        return subscription
+    def _release(self, held):
+        """Livre les événements retenus pendant un rejeu, puis rend la livraison directe."""
+        handler, pending = held
+        while True:
+            with self._publish_lock:
+                if not pending:
+                    self._replaying.remove(held)
+                    return
+                batch = pending[:]
+                del pending[:]
+            for event_type, data in batch:
+                self.dispatcher.run(event_type, handler, data)
+    def _live(self, event_type, data):
+        """Journalise l'événement et résout ses handlers (sous _publish_lock si journal)."""
+        if self.journal is None:
+            return self.router.handlers(event_type)
+        with self._publish_lock:
+            self.journal.append(event_type, data)
+            handlers = self.router.handlers(event_type)
+            if not self._replaying:
+                return handlers
+            live = []
+            for handler in handlers:
+                for replaying, pending in self._replaying:
+                    if replaying == handler:
+                        pending.append((event_type, data))
+                        break
+                else:
+                    live.append(handler)
+            return live
+    def _journal(self):
+        if self.journal is None:
+            raise EventException("Aucun journal d'événements configuré")
+        return self.journal
+    def replay(self, event_type, handler, offset=0, until=None):
+        """
+        Rejoue au handler, dans le thread appelant, les événements journalisés correspondant
+        au motif. Les données sont relues depuis le journal (JSON) : les dataclasses
+        deviennent des dict.
+        Args:
+            event_type (str): Topic ou motif.
+            handler (callable): Handler appelé avec les données de chaque événement.
+            offset (int): Premier offset à rejouer.
+            until (int): Offset de fin (exclu) ; tout le journal écrit si None.
+        Returns:
+            int: Offset suivant le dernier événement lu, pour reprendre plus tard.
+        Raises:
+            EventException: si aucun journal n'est configuré.
+        """
+        journal = self._journal()
+        journal.flush()
+        router = TopicRouter(cache_size=64)
+        router.subscribe(event_type, handler)
+        with journal.cursor(offset) as cursor:
+            for record in cursor:
+                if until is not None and record.offset >= until:
+                    return record.offset
+                if router.handlers(record.topic):
+                    self.dispatcher.run(record.topic, handler, record.data)
+            return cursor.offset
+    def unsubscribe(self, event_type, handler=None):
+        """
+        Désabonne un handler (ou tous les handlers) d'un motif.
+        Returns:
+            bool: True si au moins un abonnement a été retiré.
+        """
+        return self.router.unsubscribe(event_type, handler) > 0
     def publish(self, event_type, data):
-        for handler in self.subscribers.get(event_type, []):
-            handler(data)
+        """
+        Publie un événement.
+        Returns:
+            Résultat de la stratégie : liste de HandlerResult (sync), de Future (pool)
+            ou tâche asyncio si appelé depuis une boucle (asyncio).
+        """
+        _PUBLISHED.inc()
+        with _PUBLISH_SECONDS.time():
+            return self.dispatcher.dispatch(event_type, self._live(event_type, data), data)
+    async def publish_async(self, event_type, data):
+        """
+        Publie un événement depuis une coroutine et attend tous les handlers.
+        Returns:
+            list: HandlerResult de chaque handler.
+        """
+        return await self.dispatcher.dispatch_async(event_type, self._live(event_type, data), data)
+    def shutdown(self, wait=True):
+        """Arrête la stratégie de distribution (pool de threads) et ferme le journal."""
+        self.dispatcher.shutdown(wait)
+        if self.journal is not None:
+            self.journal.close()
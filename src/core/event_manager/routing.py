@@ -0,0 +1,200 @@
+import weakref
+import itertools
+import threading
+from typing import Callable, Dict, List, Optional
+
+SEPARATOR = '.'
+SINGLE = '*'
+MULTI = '#'
+
+
+class Subscription:
+    """
+    Abonnement d'un handler à un motif de topic.
+    - `*` correspond à exactement un segment, `#` à zéro ou plusieurs segments
+    - priorité décroissante, puis ordre d'abonnement
+    - référence faible optionnelle : l'abonnement disparaît avec l'objet du handler
+    """
+    __slots__ = ('pattern', 'priority', 'seq', 'weak', '_ref', '__weakref__')
+
+    def __init__(self, pattern: str, handler: Callable, priority: int, seq: int, weak: bool,
+                 on_dead=None):
+        self.pattern = pattern
+        self.priority = priority
+        self.seq = seq
+        self.weak = weak
+        if weak:
+            if hasattr(handler, '__self__') and hasattr(handler, '__func__'):
+                self._ref = weakref.WeakMethod(handler, on_dead)
+            else:
+                self._ref = weakref.ref(handler, on_dead)
+        else:
+            self._ref = handler
+
+    def handler(self) -> Optional[Callable]:
+        """Retourne le handler, ou None si sa référence faible est morte."""
+        return self._ref() if self.weak else self._ref
+
+    def matches(self, handler: Callable) -> bool:
+        return self.handler() == handler
+
+
+class _Node:
+    __slots__ = ('children', 'subs')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.subs: List[Subscription] = []
+
+
+class TopicRouter:
+    """
+    Routage hiérarchique des topics (`config.memApp.watchdog`) par trie.
+    La liste ordonnée des abonnements d'un topic concret est mise en cache
+    et invalidée à chaque (dés)abonnement : une publication coûte un accès au cache.
+    """
+    def __init__(self, cache_size: int = 4096):
+        self._root = _Node()
+        self._lock = threading.RLock()
+        self._cache: Dict[str, List[Subscription]] = {}
+        self._cache_size = cache_size
+        self._seq = itertools.count()
+
+    def subscribe(self, pattern: str, handler: Callable, priority: int = 0,
+                  weak: bool = False) -> Subscription:
+        """
+        Abonne un handler à un motif.
+        Args:
+            pattern (str): Topic ou motif (`config.*`, `config.#`).
+            handler (callable): Handler à appeler.
+            priority (int): Priorité (les plus élevées d'abord).
+            weak (bool): Ne conserver qu'une référence faible au handler.
+        Returns:
+            Subscription: Abonnement créé.
+        """
+        with self._lock:
+            sub = Subscription(pattern, handler, priority, next(self._seq), weak, self._on_dead)
+            node = self._root
+            for part in pattern.split(SEPARATOR):
+                node = node.children.setdefault(part, _Node())
+            node.subs.append(sub)
+            self._cache.clear()
+            return sub
+
+    def unsubscribe(self, pattern: str, handler: Optional[Callable] = None) -> int:
+        """
+        Retire les abonnements d'un motif (tous, ou ceux d'un handler donné).
+        Returns:
+            int: Nombre d'abonnements retirés.
+        """
+        with self._lock:
+            node = self._find(pattern)
+            if node is None:
+                return 0
+            before = len(node.subs)
+            node.subs = [s for s in node.subs if handler is not None and not s.matches(handler)]
+            removed = before - len(node.subs)
+            if removed:
+                self._prune(pattern)
+                self._cache.clear()
+            return removed
+
+    def remove(self, sub: Subscription) -> bool:
+        """Retire un abonnement précis."""
+        with self._lock:
+            node = self._find(sub.pattern)
+            if node is None or sub not in node.subs:
+                return False
+            node.subs.remove(sub)
+            self._prune(sub.pattern)
+            self._cache.clear()
+            return True
+
+    def _on_dead(self, ref) -> None:
+        with self._lock:
+            self._purge(self._root)
+            self._cache.clear()
+
+    def _purge(self, node: _Node) -> None:
+        node.subs = [s for s in node.subs if not s.weak or s.handler() is not None]
+        for child in node.children.values():
+            self._purge(child)
+
+    def _find(self, pattern: str) -> Optional[_Node]:
+        node = self._root
+        for part in pattern.split(SEPARATOR):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def _prune(self, pattern: str) -> None:
+        """Supprime les nœuds devenus vides le long du motif."""
+        parts = pattern.split(SEPARATOR)
+        path = [self._root]
+        for part in parts:
+            path.append(path[-1].children[part])
+        for i in range(len(parts) - 1, -1, -1):
+            node = path[i + 1]
+            if node.subs or node.children:
+                break
+            del path[i].children[parts[i]]
+
+    def resolve(self, topic: str) -> List[Subscription]:
+        """
+        Retourne les abonnements correspondant à un topic concret, triés par priorité.
+        Args:
+            topic (str): Topic publié.
+        Returns:
+            list: Abonnements (mis en cache jusqu'au prochain (dés)abonnement).
+        """
+        subs = self._cache.get(topic)
+        if subs is not None:
+            return subs
+        with self._lock:
+            found: Dict[int, Subscription] = {}
+            self._match(self._root, topic.split(SEPARATOR), 0, found)
+            subs = sorted(found.values(), key=lambda s: (-s.priority, s.seq))
+            if len(self._cache) >= self._cache_size:
+                self._cache.clear()
+            self._cache[topic] = subs
+            return subs
+
+    def handlers(self, topic: str) -> List[Callable]:
+        """Retourne les handlers vivants d'un topic concret, dans l'ordre d'appel."""
+        result = []
+        for sub in self.resolve(topic):
+            handler = sub.handler()
+            if handler is not None:
+                result.append(handler)
+        return result
+
+    def _match(self, node: _Node, parts: List[str], i: int, found: Dict[int, Subscription]) -> None:
+        multi = node.children.get(MULTI)
+        if multi is not None:
+            for j in range(i, len(parts) + 1):
+                self._match(multi, parts, j, found)
+        if i == len(parts):
+            for sub in node.subs:
+                found[sub.seq] = sub
+            return
+        child = node.children.get(parts[i])
+        if child is not None:
+            self._match(child, parts, i + 1, found)
+        single = node.children.get(SINGLE)
+        if single is not None:
+            self._match(single, parts, i + 1, found)
+
+    def patterns(self) -> Dict[str, List[Callable]]:
+        """Retourne les handlers vivants par motif d'abonnement."""
+        result: Dict[str, List[Callable]] = {}
+        with self._lock:
+            stack = [self._root]
+            while stack:
+                node = stack.pop()
+                for sub in node.subs:
+                    handler = sub.handler()
+                    if handler is not None:
+                        result.setdefault(sub.pattern, []).append(handler)
+                stack.extend(node.children.values())
+        return result
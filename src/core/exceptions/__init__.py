@@ -4,3 +4,4 @@ from .plugin import PluginException
 from .utils import UtilsException
 from .core import CoreException
 from .watchdog import WatchdogException
+from .event import EventException
@@ -0,0 +1,7 @@
+from .base import MemAppException
+
+
+class EventException(MemAppException):
+    """Exception spécifique au gestionnaire d'événements."""
+
+    default_message = "Erreur du gestionnaire d'événements."
@@ -1,4 +1,14 @@
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows : verrou limité aux threads du processus
+    fcntl = None
+
 
 def list_files(directory: str, ext: str = None):
     """Liste les fichiers d’un dossier, filtrés par extension."""
@@ -7,3 +17,80 @@ def list_files(directory: str, ext: str = None):
     except (FileNotFoundError, PermissionError) as e:
         print(f"Error accessing directory '{directory}': {e}")
         return []
+
+
+def atomic_write(path: str, data: Union[str, bytes], encoding: str = 'utf-8'):
+    """
+    Écrit un fichier de façon atomique : fichier temporaire, fsync puis rename.
+    Un lecteur concurrent voit l'ancien ou le nouveau contenu, jamais un fichier tronqué.
+    Returns:
+        os.stat_result: stat du fichier écrit (mtime, taille et inode sont conservés par le rename).
+    Raises:
+        OSError: en cas d'erreur d'écriture.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    payload = data.encode(encoding) if isinstance(data, str) else data
+    fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp',
+                               dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp, os.stat(path).st_mode & 0o777)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return st
+
+
+class _PathLock:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.depth = 0
+        self.handle = None
+
+
+_path_locks: Dict[str, _PathLock] = {}
+_path_locks_guard = threading.Lock()
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Verrou exclusif sur un fichier, entre threads (réentrant) et entre processus
+    (flock sur `<path>.lock`).
+    Raises:
+        OSError: si le fichier verrou ne peut pas être créé.
+    """
+    key = os.path.abspath(path)
+    with _path_locks_guard:
+        state = _path_locks.setdefault(key, _PathLock())
+    with state.lock:
+        if state.depth == 0 and fcntl is not None:
+            handle = open(key + '.lock', 'a')
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            except BaseException:
+                handle.close()
+                raise
+            state.handle = handle
+        state.depth += 1
+        try:
+            yield
+        finally:
+            state.depth -= 1
+            if state.depth == 0 and state.handle is not None:
+                fcntl.flock(state.handle.fileno(), fcntl.LOCK_UN)
+                state.handle.close()
+                state.handle = None
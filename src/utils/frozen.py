@@ -0,0 +1,212 @@
+# Conteneurs en lecture seule pour les arbres de configuration partagés.
+# FrozenDict/FrozenList héritent de dict/list (isinstance, json, comparaison et
+# itération inchangés) mais refusent toute modification : un arbre mis en cache
+# peut être partagé entre appelants sans copie défensive.
+# - freeze() convertit un arbre (les sous-arbres déjà gelés sont réutilisés tels quels)
+# - thaw() en produit une copie profonde modifiable (dict/list), comme copy.deepcopy() ;
+#   copy.copy() donne une copie superficielle modifiable
+# - merge_many() fusionne N sources en une passe itérative, en partageant les sous-arbres
+#   qui ne proviennent que d'une seule source
+
+from typing import Any, Iterable, List
+
+_dict_set = dict.__setitem__
+_dict_update = dict.update
+_list_append = list.append
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} est en lecture seule : "
+                    "utiliser thaw() pour obtenir une copie modifiable")
+
+
+class FrozenDict(dict):
+    """
+    Dictionnaire en lecture seule.
+    copy.copy() retourne un dict ordinaire (copie superficielle modifiable),
+    copy.deepcopy() une copie profonde modifiable (voir thaw()).
+    """
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __repr__(self):
+        return f"FrozenDict({dict.__repr__(self)})"
+
+
+class FrozenList(list):
+    """
+    Liste en lecture seule.
+    copy.copy() retourne une list ordinaire (copie superficielle modifiable),
+    copy.deepcopy() une copie profonde modifiable (voir thaw()).
+    """
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _readonly
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+    __iadd__ = __imul__ = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def __repr__(self):
+        return f"FrozenList({list.__repr__(self)})"
+
+
+_FROZEN = (FrozenDict, FrozenList)
+
+
+def _frozen_container(value: Any):
+    """Conteneur gelé vide du même genre que `value`, ou None pour une feuille."""
+    if isinstance(value, _FROZEN):
+        return None
+    if isinstance(value, dict):
+        return FrozenDict()
+    if isinstance(value, list):
+        return FrozenList()
+    return None
+
+
+def freeze(value: Any) -> Any:
+    """
+    Retourne une version en lecture seule d'un arbre (parcours itératif).
+    Les sous-arbres déjà gelés sont partagés, les feuilles sont conservées.
+    Args:
+        value (Any): Arbre de dict/list/scalaires.
+    Returns:
+        Any: FrozenDict, FrozenList ou la feuille elle-même.
+    """
+    root = _frozen_container(value)
+    if root is None:
+        return value
+    stack = [(value, root)]
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if isinstance(source, dict) else enumerate(source)
+        for key, child in items:
+            frozen = _frozen_container(child)
+            if frozen is not None:
+                stack.append((child, frozen))
+            else:
+                frozen = child
+            if isinstance(target, dict):
+                _dict_set(target, key, frozen)
+            else:
+                _list_append(target, frozen)
+    return root
+
+
+def thaw(value: Any) -> Any:
+    """
+    Copie profonde modifiable d'un arbre (dict/list ordinaires), parcours itératif.
+    Args:
+        value (Any): Arbre, gelé ou non.
+    Returns:
+        Any: Copie indépendante ; les feuilles sont partagées.
+    """
+    def empty(node):
+        if isinstance(node, dict):
+            return {}
+        if isinstance(node, list):
+            return []
+        return None
+
+    root = empty(value)
+    if root is None:
+        return value
+    stack = [(value, root)]
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if isinstance(source, dict) else enumerate(source)
+        for key, child in items:
+            copy = empty(child)
+            if copy is not None:
+                stack.append((child, copy))
+            else:
+                copy = child
+            if isinstance(target, dict):
+                target[key] = copy
+            else:
+                target.append(copy)
+    return root
+
+
+def merge_many(values: Iterable[Any]) -> Any:
+    """
+    Fusion profonde de N valeurs, dans l'ordre, en une seule passe par clé.
+    Résultat identique au repli successif de deux à deux (une valeur non-dict
+    remplace ce qui précède, deux dicts sont fusionnés récursivement), mais :
+    - chaque clé n'est visitée qu'une fois, quel que soit le nombre de sources
+    - le parcours est itératif (pas de limite de récursion)
+    - un sous-arbre fourni par une seule source est partagé (gelé), pas copié
+    Args:
+        values (iterable): Valeurs à fusionner (typiquement des dicts racine).
+    Returns:
+        Any: Résultat gelé (FrozenDict pour des dicts) ; None si aucune valeur.
+    """
+    values = list(values)
+    if not values:
+        return None
+    suffix = _dict_suffix(values)
+    if len(suffix) == 1:
+        return freeze(suffix[0])
+    root = FrozenDict()
+    stack = [(suffix, root)]
+    while stack:
+        sources, target = stack.pop()
+        # Repli clé par clé : une valeur non-dict remplace (position conservée),
+        # deux dicts successifs sont mis de côté pour une fusion au niveau inférieur
+        merged = {}
+        pending = {}
+        for source in sources:
+            for key, value in source.items():
+                if key in merged:
+                    if isinstance(value, dict) and isinstance(merged[key], dict):
+                        group = pending.get(key)
+                        if group is None:
+                            pending[key] = [merged[key], value]
+                        else:
+                            group.append(value)
+                        continue
+                    if pending:
+                        pending.pop(key, None)
+                merged[key] = value
+        for key, group in pending.items():
+            child = merged[key] = FrozenDict()
+            stack.append((group, child))
+        if not all(isinstance(source, FrozenDict) for source in sources):
+            for key, value in merged.items():
+                if isinstance(value, (dict, list)) and not isinstance(value, _FROZEN):
+                    merged[key] = freeze(value)
+        _dict_update(target, merged)
+    return root
+
+
+def _dict_suffix(values: List[Any]) -> List[Any]:
+    """
+    Valeurs effectivement fusionnées à la racine : la dernière si ce n'est pas
+    un dict, sinon la plus longue suite finale de dicts.
+    """
+    if not isinstance(values[-1], dict):
+        return values[-1:]
+    start = len(values) - 1
+    while start > 0 and isinstance(values[start - 1], dict):
+        start -= 1
+    return values[start:]
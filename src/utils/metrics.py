@@ -0,0 +1,418 @@
+# Registre de métriques interne (compteurs, histogrammes à buckets fixes).
+# - MEMAPP_METRICS=0 désactive l'instrumentation : chaque point de mesure se
+#   réduit à un test de booléen (mode no-op)
+# - MEMAPP_METRICS_SAMPLE=N ne chronomètre qu'un appel sur N (les compteurs restent exacts)
+# - export en dict (snapshot()) ou au format texte Prometheus (to_prometheus()),
+#   servi localement par Flask via create_app()/serve() (flask importé à la demande)
+
+import os
+import time
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _NullTimer:
+    """Chronomètre inactif (métriques désactivées ou appel non échantillonné)."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('child', 'start')
+
+    def __init__(self, child: '_HistogramChild'):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.child.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum', 'count', 'ticks', '_lock')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.ticks = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative(self) -> List[int]:
+        total, result = 0, []
+        for c in self.counts:
+            total += c
+            result.append(total)
+        return result
+
+
+class Metric(ABC):
+    """
+    Métrique nommée, éventuellement déclinée par valeurs d'étiquettes (`labels()`).
+    """
+    kind = 'untyped'
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, help: str = '',
+                 labelnames: Iterable[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        if not self.labelnames:
+            self._default = self._children[()] = self._new_child()
+
+    @abstractmethod
+    def _new_child(self):
+        """Crée la valeur d'une déclinaison (une par jeu d'étiquettes)."""
+
+    def labels(self, *values: Any):
+        """
+        Retourne la déclinaison de la métrique pour ces valeurs d'étiquettes.
+        Raises:
+            ValueError: si le nombre de valeurs ne correspond pas aux étiquettes.
+        """
+        child = self._children.get(values)
+        if child is not None:
+            return child
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name}: étiquettes attendues {self.labelnames}, reçu {values}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def children(self) -> Dict[Tuple[str, ...], Any]:
+        with self._lock:
+            return dict(self._children)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._children = {(): self._new_child()} if not self.labelnames else {}
+            if not self.labelnames:
+                self._default = self._children[()]
+
+
+class Counter(Metric):
+    """Compteur monotone."""
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0, *labels: Any) -> None:
+        """
+        Incrémente le compteur (no-op si les métriques sont désactivées).
+        Args:
+            amount (float): Incrément.
+            labels: Valeurs d'étiquettes, dans l'ordre de déclaration.
+        """
+        if not self.registry.enabled:
+            return
+        (self.labels(*labels) if labels else self._default).inc(amount)
+
+
+class Histogram(Metric):
+    """Histogramme à buckets fixes (bornes supérieures incluses, comme Prometheus)."""
+    kind = 'histogram'
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, help: str = '',
+                 labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        super().__init__(registry, name, help, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float, *labels: Any) -> None:
+        """Enregistre une valeur (no-op si les métriques sont désactivées)."""
+        if not self.registry.enabled:
+            return
+        (self.labels(*labels) if labels else self._default).observe(value)
+
+    def time(self, *labels: Any):
+        """
+        Chronomètre un bloc `with`, en secondes. Avec un échantillonnage de N,
+        seul un appel sur N est mesuré ; désactivé, retourne un contexte inerte.
+        """
+        registry = self.registry
+        if not registry.enabled:
+            return _NULL
+        child = self.labels(*labels) if labels else self._default
+        if registry.sample_every > 1:
+            child.ticks += 1
+            if child.ticks % registry.sample_every:
+                return _NULL
+        return _Timer(child)
+
+
+def _env_enabled() -> bool:
+    return os.environ.get('MEMAPP_METRICS', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def _env_sample() -> int:
+    try:
+        return max(1, int(os.environ.get('MEMAPP_METRICS_SAMPLE', '1')))
+    except ValueError:
+        return 1
+
+
+class MetricsRegistry:
+    """
+    Registre des métriques du processus.
+    Les collecteurs enregistrés (`register_collector`) sont appelés à l'export et
+    retournent des tuples (nom, type, aide, valeur) : ils exposent des compteurs
+    déjà tenus ailleurs (ConfigCache.stats()) sans coût sur le chemin chaud.
+    """
+    def __init__(self, enabled: Optional[bool] = None, sample_every: Optional[int] = None):
+        self.enabled = _env_enabled() if enabled is None else enabled
+        self.sample_every = _env_sample() if sample_every is None else max(1, sample_every)
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, float]]]] = []
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: Iterable[str],
+                       **kwargs) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, help, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Métrique {name} déjà déclarée comme {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str = '', labelnames: Iterable[str] = ()) -> Counter:
+        """Déclare (ou retourne) un compteur."""
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def histogram(self, name: str, help: str = '', labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Déclare (ou retourne) un histogramme à buckets fixes."""
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_collector(self,
+                           collector: Callable[[], Iterable[Tuple[str, str, str, float]]]) -> None:
+        """Ajoute une source de valeurs lue à l'export."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def reset(self) -> None:
+        """Remet toutes les métriques à zéro (les déclarations sont conservées)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+    def _collected(self) -> List[Tuple[str, str, str, float]]:
+        samples = []
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                samples.extend(collector())
+            except Exception as e:
+                print(f"Metrics collector error: {e}")
+        return samples
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Exporte les métriques sous forme de dict.
+        Returns:
+            dict: nom -> {type, help, values}, `values` indexé par `étiquette=valeur,...`
+                ('' sans étiquette) ; un histogramme donne buckets (cumulés), sum et count.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        result = {}
+        for metric in metrics:
+            values = {}
+            for key, child in metric.children().items():
+                label = ','.join(f"{n}={v}" for n, v in zip(metric.labelnames, key))
+                if metric.kind == 'histogram':
+                    values[label] = {
+                        'buckets': dict(zip([*map(str, metric.buckets), '+Inf'],
+                                            child.cumulative())),
+                        'sum': child.sum,
+                        'count': child.count,
+                    }
+                else:
+                    values[label] = child.value
+            result[metric.name] = {'type': metric.kind, 'help': metric.help, 'values': values}
+        for name, kind, help, value in self._collected():
+            result[name] = {'type': kind, 'help': help, 'values': {'': value}}
+        return result
+
+    def to_prometheus(self) -> str:
+        """
+        Exporte les métriques au format texte Prometheus (version 0.0.4).
+        Returns:
+            str: Exposition texte.
+        """
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for key, child in sorted(metric.children().items()):
+                pairs = list(zip(metric.labelnames, key))
+                if metric.kind == 'histogram':
+                    bounds = [*map(_format_value, metric.buckets), '+Inf']
+                    for bound, total in zip(bounds, child.cumulative()):
+                        labels = _labels(pairs + [('le', bound)])
+                        lines.append(f"{metric.name}_bucket{labels} {total}")
+                    lines.append(f"{metric.name}_sum{_labels(pairs)} {_format_value(child.sum)}")
+                    lines.append(f"{metric.name}_count{_labels(pairs)} {child.count}")
+                else:
+                    lines.append(f"{metric.name}{_labels(pairs)} {_format_value(child.value)}")
+        for name, kind, help, value in self._collected():
+            lines.append(f"# HELP {name} {_escape_help(help)}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ''
+    body = ','.join('{}="{}"'.format(n, _escape_label(v)) for n, v in pairs)
+    return '{' + body + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, help: str = '', labelnames: Iterable[str] = ()) -> Counter:
+    """Déclare un compteur dans le registre du processus."""
+    return REGISTRY.counter(name, help, labelnames)
+
+
+def histogram(name: str, help: str = '', labelnames: Iterable[str] = (),
+              buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+    """Déclare un histogramme dans le registre du processus."""
+    return REGISTRY.histogram(name, help, labelnames, buckets)
+
+
+def enable(sample_every: Optional[int] = None) -> None:
+    """Active l'instrumentation, avec éventuellement un échantillonnage des chronométrages."""
+    REGISTRY.enabled = True
+    if sample_every is not None:
+        REGISTRY.sample_every = max(1, sample_every)
+
+
+def disable() -> None:
+    """Passe en mode no-op : les points de mesure ne font plus qu'un test de booléen."""
+    REGISTRY.enabled = False
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    return REGISTRY.snapshot()
+
+
+def to_prometheus() -> str:
+    return REGISTRY.to_prometheus()
+
+
+def create_app(registry: Optional[MetricsRegistry] = None):
+    """
+    Application Flask exposant `/metrics` (texte Prometheus) et `/metrics.json`.
+    Args:
+        registry (MetricsRegistry): Registre exporté (celui du processus par défaut).
+    Returns:
+        flask.Flask: Application à servir ou à monter.
+    """
+    from flask import Flask, Response, jsonify  # import différé : coût de démarrage
+    registry = registry or REGISTRY
+    app = Flask('memapp-metrics')
+
+    @app.route('/metrics')
+    def prometheus():
+        return Response(registry.to_prometheus(), mimetype=None,
+                        content_type=PROMETHEUS_CONTENT_TYPE)
+
+    @app.route('/metrics.json')
+    def as_json():
+        return jsonify(registry.snapshot())
+
+    return app
+
+
+def serve(host: str = '127.0.0.1', port: int = 9464, registry: Optional[MetricsRegistry] = None,
+          background: bool = True) -> Optional[threading.Thread]:
+    """
+    Sert les métriques en HTTP, par défaut sur l'interface locale uniquement.
+    Args:
+        host (str): Adresse d'écoute.
+        port (int): Port d'écoute.
+        registry (MetricsRegistry): Registre exporté.
+        background (bool): Servir depuis un thread démon (sinon appel bloquant).
+    Returns:
+        threading.Thread: Thread du serveur, ou None si bloquant.
+    """
+    app = create_app(registry)
+    if not background:
+        app.run(host=host, port=port, use_reloader=False)
+        return None
+    thread = threading.Thread(target=app.run, name='memapp-metrics',
+                              kwargs={'host': host, 'port': port, 'use_reloader': False},
+                              daemon=True)
+    thread.start()
+    return thread
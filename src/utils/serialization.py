@@ -0,0 +1,243 @@
+# Backend de sérialisation YAML commun à ConfigManager, ConfigMerge et yaml_tools.
+# - utilise les classes libyaml (CSafeLoader/CSafeDumper) si disponibles,
+#   sinon l'implémentation Python pure (SafeLoader/SafeDumper)
+# - MEMAPP_YAML_BACKEND=python force l'implémentation Python pure
+# - MEMAPP_YAML_SIDECAR=1 active un cache JSON à côté de chaque fichier parsé
+#   (`.<nom>.json`), réutilisé tant que l'empreinte du YAML correspond
+
+import os
+import json
+import atexit
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Union
+import yaml
+from .frozen import FrozenDict, FrozenList
+
+YAMLError = yaml.YAMLError
+
+_FORCE_PURE = os.environ.get('MEMAPP_YAML_BACKEND', '').lower() == 'python'
+_LIBYAML = bool(getattr(yaml, '__with_libyaml__', False)) and not _FORCE_PURE
+
+Loader = yaml.CSafeLoader if _LIBYAML else yaml.SafeLoader
+Dumper = yaml.CSafeDumper if _LIBYAML else yaml.SafeDumper
+
+# Les arbres gelés (cache) s'écrivent comme des dict/list ordinaires
+for _dumper in {Dumper, yaml.SafeDumper}:
+    _dumper.add_representer(FrozenDict, yaml.representer.SafeRepresenter.represent_dict)
+    _dumper.add_representer(FrozenList, yaml.representer.SafeRepresenter.represent_list)
+
+_sidecar = os.environ.get('MEMAPP_YAML_SIDECAR', '').lower() in ('1', 'true', 'yes')
+_stats = {'parses': 0, 'sidecar_hits': 0, 'sidecar_writes': 0}
+
+
+def backend_info() -> Dict[str, Any]:
+    """
+    Décrit le backend actif, pour vérifier en production que le chemin rapide est utilisé.
+    Returns:
+        dict: loader, dumper, libyaml (bool), sidecar (bool) et compteurs.
+    """
+    info = {
+        'loader': Loader.__name__,
+        'dumper': Dumper.__name__,
+        'libyaml': _LIBYAML,
+        'sidecar': _sidecar,
+    }
+    info.update(_stats)
+    return info
+
+
+def set_sidecar(enabled: bool) -> None:
+    """Active ou désactive le cache JSON des fichiers parsés."""
+    global _sidecar
+    _sidecar = bool(enabled)
+
+
+def sidecar_path(path: str) -> str:
+    directory, name = os.path.split(path)
+    return os.path.join(directory, '.' + name + '.json')
+
+
+def json_safe(data: Any) -> bool:
+    """Vrai si les données survivent à un aller-retour JSON à l'identique."""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if not all(isinstance(k, str) for k in node):
+                return False
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif not (node is None or isinstance(node, (str, bool, int, float))):
+            return False
+    return True
+
+
+def _read_sidecar(path: str, digest: str) -> Any:
+    try:
+        with open(sidecar_path(path), 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if isinstance(payload, dict) and payload.get('digest') == digest:
+        _stats['sidecar_hits'] += 1
+        return payload
+    return None
+
+
+def _write_sidecar(path: str, digest: str, data: Any) -> None:
+    if not json_safe(data):
+        return
+    from .file_tools import atomic_write
+    try:
+        payload = json.dumps({'digest': digest, 'data': data}, ensure_ascii=False)
+        atomic_write(sidecar_path(path), payload)
+        _stats['sidecar_writes'] += 1
+    except OSError:
+        pass
+
+
+def loads(text: Union[str, bytes]) -> Any:
+    """
+    Parse un document YAML avec le loader sûr le plus rapide disponible.
+    Raises:
+        yaml.YAMLError: si le contenu est invalide.
+    """
+    _stats['parses'] += 1
+    return yaml.load(text, Loader=Loader)
+
+
+def load_bytes(raw: bytes, path: Optional[str] = None, digest: Optional[str] = None) -> Any:
+    """
+    Parse le contenu d'un fichier YAML, via son cache JSON s'il est actif et à jour.
+    Args:
+        raw (bytes): Contenu du fichier.
+        path (str): Chemin du fichier (nécessaire au cache JSON).
+        digest (str): Empreinte SHA-1 du contenu, si déjà calculée.
+    Returns:
+        Any: Données parsées.
+    """
+    if not (_sidecar and path):
+        return loads(raw.decode('utf-8'))
+    digest = digest or hashlib.sha1(raw).hexdigest()
+    payload = _read_sidecar(path, digest)
+    if payload is not None:
+        return payload.get('data')
+    data = loads(raw.decode('utf-8'))
+    _write_sidecar(path, digest, data)
+    return data
+
+
+def load_file(path: str) -> Any:
+    """
+    Lit et parse un fichier YAML.
+    Raises:
+        OSError: si le fichier est illisible.
+        yaml.YAMLError: si le contenu est invalide.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return load_bytes(raw, path)
+
+
+def dumps(data: Any, **kwargs) -> str:
+    """
+    Sérialise en YAML avec le dumper sûr le plus rapide disponible
+    (mêmes options par défaut que yaml.safe_dump).
+    """
+    return yaml.dump(data, Dumper=Dumper, **kwargs)
+
+
+def dump_file(data: Any, path: str, **kwargs) -> None:
+    """
+    Sérialise en YAML dans un fichier.
+    Raises:
+        OSError: en cas d'erreur d'écriture.
+        yaml.YAMLError: si les données ne sont pas sérialisables.
+    """
+    text = dumps(data, **kwargs)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+# Parsing parallèle : MEMAPP_PARSE_WORKERS fixe la taille du pool (1 = séquentiel),
+# MEMAPP_PARSE_EXECUTOR choisit 'process', 'thread' ou 'auto' (threads avec libyaml).
+# Le pool de processus démarre ses workers en 'spawn' : le processus parent fait déjà tourner
+# des threads (watcher, dispatcher, journal) et un fork pourrait hériter d'un verrou détenu.
+PARALLEL_THRESHOLD = 8
+
+_executors: Dict[str, Any] = {}
+_executors_lock = threading.Lock()
+
+
+def parse_workers() -> int:
+    try:
+        return max(1, int(os.environ.get('MEMAPP_PARSE_WORKERS', '')))
+    except ValueError:
+        return max(1, min(8, os.cpu_count() or 1))
+
+
+def executor_kind() -> str:
+    kind = os.environ.get('MEMAPP_PARSE_EXECUTOR', 'auto').lower()
+    if kind in ('process', 'thread'):
+        return kind
+    return 'thread' if _LIBYAML else 'process'
+
+
+def _executor(kind: str, workers: int):
+    key = f"{kind}:{workers}"
+    executor = _executors.get(key)
+    if executor is not None:
+        return executor
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+            if kind == 'thread':
+                executor = ThreadPoolExecutor(max_workers=workers,
+                                              thread_name_prefix='memapp-parse')
+            else:
+                import multiprocessing  # import différé : coût de démarrage
+                executor = ProcessPoolExecutor(max_workers=workers,
+                                               mp_context=multiprocessing.get_context('spawn'))
+            if not _executors:
+                atexit.register(shutdown_executors)
+            _executors[key] = executor
+    return executor
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Arrête les pools de parsing (appelé automatiquement à la sortie du processus)."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+
+
+def _load_item(item):
+    raw, path, digest = item
+    return load_bytes(raw, path, digest)
+
+
+def load_many(items, workers: Optional[int] = None) -> list:
+    """
+    Parse plusieurs contenus YAML, en parallèle au-delà de PARALLEL_THRESHOLD fichiers.
+    Les résultats sont retournés dans l'ordre des entrées.
+    Args:
+        items (list): Tuples (contenu, chemin, empreinte).
+        workers (int): Taille du pool (par défaut MEMAPP_PARSE_WORKERS ou nombre de CPU).
+    Returns:
+        list: Données parsées, dans l'ordre.
+    """
+    items = list(items)
+    workers = workers or parse_workers()
+    if workers <= 1 or len(items) < PARALLEL_THRESHOLD:
+        return [_load_item(item) for item in items]
+    kind = executor_kind()
+    chunksize = max(1, len(items) // (workers * 4))
+    results = list(_executor(kind, workers).map(_load_item, items, chunksize=chunksize))
+    if kind == 'process':
+        _stats['parses'] += len(items)
+    return results
@@ -0,0 +1,25 @@
+import os
+import sys
+import shutil
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.core.config_manager import ConfigManager  # noqa: E402
+
+SOURCE_CONFIG = os.path.join(ROOT, 'src', 'config')
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    """Copie de src/config installée comme répertoire de configuration du processus."""
+    path = str(tmp_path / 'config')
+    shutil.copytree(SOURCE_CONFIG, path, ignore=shutil.ignore_patterns('*.bin', '*.lock', '.*.tmp'))
+    previous = ConfigManager.set_config_dir(path)
+    try:
+        yield path
+    finally:
+        ConfigManager.set_config_dir(previous)
@@ -0,0 +1,45 @@
+import os
+
+from src.core.config_manager import ConfigManager, binary
+
+
+def test_write_snapshot_generation_never_goes_backwards(tmp_path):
+    path = str(tmp_path / 'config_full.bin')
+    assert binary.write_snapshot({'a': 1}, path, 7) == 7
+    assert binary.write_snapshot({'a': 2}, path, 3) == 8
+    assert binary.write_snapshot({'a': 3}, path) == 9
+    assert binary.read_generation(path) == 9
+
+
+def test_refresh_follows_a_replaced_file_whatever_its_generation(tmp_path):
+    path = str(tmp_path / 'config_full.bin')
+    binary.write_snapshot({'port': 1}, path, 5)
+    reader = binary.BinarySnapshot(path)
+    os.unlink(path)
+    binary.write_snapshot({'port': 2}, path, 1)
+    assert reader.refresh()
+    assert reader.get('port') == 2
+    assert not reader.refresh()
+
+
+def test_binary_snapshot_carries_published_generation(config_dir):
+    ConfigManager.update_full_config()
+    reader = ConfigManager.attach_snapshot()
+    assert reader.generation == ConfigManager.generation()
+    ConfigManager.set_service_config_arg('memApp', 'memApp', 'bench', 1)
+    ConfigManager.update_full_config()
+    reader = ConfigManager.attach_snapshot()
+    assert reader.generation == ConfigManager.generation()
+    assert reader.get('memApp.bench') == 1
+
+
+def test_unencodable_tree_keeps_previous_image(config_dir, capsys):
+    ConfigManager.update_full_config()
+    reader = ConfigManager.attach_snapshot()
+    before = reader.generation
+    ConfigManager._write_binary_snapshot({1: 'non-text key'}, before + 1)
+    assert 'previous image kept' in capsys.readouterr().out
+    assert os.path.exists(os.path.join(config_dir, 'config_full.bin'))
+    ConfigManager._write_binary_snapshot({'ok': True}, before + 1)
+    assert ConfigManager.attach_snapshot().generation == before + 1
+    assert reader.get('ok') is True
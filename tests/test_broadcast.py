@@ -0,0 +1,278 @@
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import threading
+import subprocess
+
+import pytest
+
+from conftest import ROOT
+from src.core.config_manager import broadcast
+from src.core.config_manager.broadcast import ConfigBroadcast, encode_message, read_message
+from src.core.config_manager.reload import ConfigChangeEvent
+from src.core.exceptions import ConfigException
+from src.utils import serialization
+
+pytestmark = pytest.mark.skipif(broadcast.fcntl is None, reason="élection par flock (POSIX)")
+
+WORKER = """
+import os, sys, json, threading
+sys.path.insert(0, sys.argv[1])
+from src.core.config_manager import ConfigCache, ConfigManager
+ConfigManager.set_config_dir(sys.argv[2])
+ConfigManager.snapshot()
+baseline = ConfigCache.stats()['parses']
+lock = threading.Lock()
+
+def report(**fields):
+    with lock:
+        print(json.dumps(dict(fields, pid=os.getpid(), role=watch.role)), flush=True)
+
+def changed(event):
+    report(value=ConfigManager.snapshot().get('memApp.broadcast_marker'),
+           parses=ConfigCache.stats()['parses'] - baseline)
+
+watch = ConfigManager.reload_on_change(changed, debounce=0.05, shared=True)
+report(ready=True)
+sys.stdin.read()
+watch.stop(timeout=2)
+"""
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+class Node:
+    """Export/apply minimaux : une génération et un contenu par nœud."""
+    def __init__(self, payload=''):
+        self.generation = 1
+        self.payload = payload
+        self.applied = []
+
+    def export(self, services):
+        return {'generation': self.generation, 'services': services, 'payload': self.payload}
+
+    def apply(self, snapshot):
+        self.applied.append(snapshot)
+
+    def broadcast(self, config_dir, callback=None):
+        return ConfigBroadcast(callback, debounce=0.05, merge=dict, export=self.export,
+                               apply=self.apply, config_dir=str(config_dir))
+
+
+def test_follower_takes_over_when_leader_stops(tmp_path):
+    first, second = Node(), Node()
+    events = []
+    leader = first.broadcast(tmp_path).start()
+    follower = second.broadcast(tmp_path, lambda event: events.append(event)).start()
+    try:
+        assert leader.role == 'leader'
+        assert wait_for(lambda: follower.role == 'follower' and second.applied)
+        assert second.applied[0]['services'] is None  # rattrapage : snapshot complet
+
+        first.generation = 2
+        leader._changed(ConfigChangeEvent({}, ['memApp'], ['memApp'], 0))
+        assert wait_for(lambda: events)
+        assert events[0].generation == 2 and follower.generation == 2
+
+        leader.stop()
+        assert wait_for(lambda: follower.role == 'leader')
+        assert leader.role is None
+    finally:
+        follower.stop()
+        leader.stop()
+
+
+def test_slow_follower_does_not_stall_broadcast(tmp_path, monkeypatch):
+    monkeypatch.setattr(broadcast, 'MAX_PENDING', 4)
+    first, second = Node(payload='x' * (1 << 20)), Node()
+    leader = first.broadcast(tmp_path).start()
+    follower = second.broadcast(tmp_path).start()
+    stalled = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        assert wait_for(lambda: follower.role == 'follower')
+        stalled.connect(leader.socket_path)  # ne lit jamais
+        assert wait_for(lambda: len(leader._clients) == 2)
+
+        start = time.monotonic()
+        for generation in range(2, 12):
+            first.generation = generation
+            leader._changed(ConfigChangeEvent({}, [], [], 0))
+        assert time.monotonic() - start < 2.0
+        assert wait_for(lambda: follower.generation == 11)
+        assert len(leader._clients) == 1
+    finally:
+        stalled.close()
+        follower.stop()
+        leader.stop()
+
+
+def test_catch_up_frame_is_built_once_per_generation(tmp_path):
+    node = Node()
+    calls = []
+    export = node.export
+    node.export = lambda services: calls.append(services) or export(services)
+    leader = node.broadcast(tmp_path).start()
+    clients = []
+    try:
+        for _ in range(3):
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conn.connect(leader.socket_path)
+            clients.append(conn)
+            assert read_message(conn)['snapshot']['generation'] == 1
+        assert calls.count(None) == 2  # démarrage du leader + une trame de rattrapage
+
+        node.generation = 2
+        leader._changed(ConfigChangeEvent({}, [], [], 0))
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(leader.socket_path)
+        clients.append(conn)
+        assert read_message(conn)['snapshot']['generation'] == 2
+    finally:
+        for conn in clients:
+            conn.close()
+        leader.stop()
+
+
+@pytest.mark.parametrize('message', [
+    [1, 2],
+    {'event': None},
+    {'snapshot': {'services': None}},
+    {'snapshot': {'generation': '2'}},
+    {'snapshot': {'generation': True}},
+    {'snapshot': {'generation': 2}, 'event': 'changed'},
+    {'snapshot': {'generation': 2}, 'event': {'paths': {}, 'services': [], 'sections': []}},
+    {'snapshot': {'generation': 2},
+     'event': {'paths': [], 'services': [], 'sections': [], 'generation': 2}},
+])
+def test_malformed_frames_raise_config_exception(message):
+    writer, reader = socket.socketpair()
+    try:
+        writer.sendall(encode_message(message))
+        with pytest.raises(ConfigException):
+            read_message(reader)
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_follower_survives_malformed_frames(tmp_path):
+    node = Node()
+    follower = node.broadcast(tmp_path)
+    held = open(follower.lock_path, 'a')  # faux leader : verrou pris, socket servie par le test
+    broadcast.fcntl.flock(held.fileno(), broadcast.fcntl.LOCK_EX | broadcast.fcntl.LOCK_NB)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(follower.socket_path)
+    server.listen()
+    server.settimeout(5)
+    follower.apply = lambda snapshot: snapshot['config']  # snapshot incomplet : KeyError
+    follower.start()
+    try:
+        frames = [{'snapshot': {'generation': 2}, 'event': {'paths': {}}},
+                  {'snapshot': {'generation': 3}, 'event': None}]
+        for frame in frames:
+            conn, _ = server.accept()
+            conn.sendall(encode_message(frame))
+            conn.close()
+        conn, _ = server.accept()  # le follower s'est reconnecté
+        follower.apply = node.apply
+        conn.sendall(encode_message({'snapshot': {'generation': 4}, 'event': None}))
+        assert wait_for(lambda: node.applied)
+        assert follower.generation == 4 and follower._threads[0].is_alive()
+        conn.close()
+    finally:
+        follower.stop()
+        server.close()
+        held.close()
+        os.unlink(follower.socket_path)
+
+
+class Worker:
+    """Processus suivant le reload partagé ; ses rapports JSON sont lus par un thread."""
+    def __init__(self, config_dir):
+        self.proc = subprocess.Popen([sys.executable, '-c', WORKER, ROOT, config_dir],
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        self.reports = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.proc.stdout:
+            self.reports.put(json.loads(line))
+
+    def next(self, predicate, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                report = self.reports.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if predicate(report):
+                return report
+        return None
+
+    def stop(self):
+        if self.proc.poll() is None:
+            self.proc.stdin.close()
+            try:
+                self.proc.wait(5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        self.proc.wait()
+
+
+def set_marker(config_dir, value):
+    path = os.path.join(config_dir, 'memApp', 'config.yml')
+    tree = serialization.load_file(path)
+    tree['memApp']['broadcast_marker'] = value
+    serialization.dump_file(tree, path)
+
+
+def propagate(config_dir, workers, values):
+    """Modifie memApp jusqu'à ce que tous les workers accusent la même valeur."""
+    for value in values:
+        set_marker(config_dir, value)
+        acks = [w.next(lambda r, v=value: r.get('value') == v, timeout=2.0) for w in workers]
+        if all(acks):
+            return acks
+    return None
+
+
+def test_processes_share_one_leader_and_survive_its_death(config_dir):
+    from src.core.config_manager import ConfigManager
+
+    ConfigManager.update_full_config()
+    leader = Worker(config_dir)
+    workers = [leader]
+    try:
+        assert leader.next(lambda r: r.get('ready'))['role'] == 'leader'
+        followers = [Worker(config_dir), Worker(config_dir)]
+        workers += followers
+        for follower in followers:
+            assert follower.next(lambda r: r.get('ready'))['role'] in ('follower', None)
+
+        # Les followers appliquent le snapshot diffusé sans lire ni parser de fichier
+        acks = propagate(config_dir, workers, range(0, 10))
+        assert acks is not None
+        assert [ack['role'] for ack in acks] == ['leader', 'follower', 'follower']
+        assert acks[0]['parses'] > 0
+        assert [ack['parses'] for ack in acks[1:]] == [0, 0]
+
+        # Le leader est tué : un follower reprend le verrou et la surveillance
+        leader.proc.kill()
+        leader.proc.wait()
+        acks = propagate(config_dir, followers, range(10, 30))
+        assert acks is not None
+        assert sorted(ack['role'] for ack in acks) == ['follower', 'leader']
+        assert min(ack['parses'] for ack in acks) == 0
+    finally:
+        for worker in workers:
+            worker.stop()
@@ -0,0 +1,72 @@
+import os
+
+from src.core.config_manager.cache import ConfigCache
+
+
+def write(path, text, mtime_ns=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def parses():
+    return ConfigCache.stats()['parses']
+
+
+def test_unchanged_file_is_served_from_cache(tmp_path):
+    path = str(tmp_path / 'config.yml')
+    write(path, 'a: 1\n')
+    entry = ConfigCache.get_entry(path)
+    before = parses()
+    assert ConfigCache.get_entry(path) is entry
+    assert parses() == before
+
+
+def test_mtime_change_rereads_but_keeps_unchanged_content(tmp_path):
+    path = str(tmp_path / 'config.yml')
+    write(path, 'a: 1\n')
+    entry = ConfigCache.get_entry(path)
+    before = parses()
+    mtime = os.stat(path).st_mtime_ns + 1_000_000
+    os.utime(path, ns=(mtime, mtime))
+    assert ConfigCache.get_entry(path) is entry
+    assert entry.signature[0] == mtime
+    assert parses() == before
+
+
+def test_size_change_invalidates_even_with_same_mtime(tmp_path):
+    path = str(tmp_path / 'config.yml')
+    write(path, 'a: 1\n')
+    mtime = os.stat(path).st_mtime_ns
+    assert ConfigCache.load(path) == {'a': 1}
+    write(path, 'a: 10\n', mtime_ns=mtime)
+    assert ConfigCache.load(path) == {'a': 10}
+
+
+def test_inode_change_invalidates_even_with_same_mtime_and_size(tmp_path):
+    path = str(tmp_path / 'config.yml')
+    write(path, 'a: 1\n')
+    mtime = os.stat(path).st_mtime_ns
+    assert ConfigCache.load(path) == {'a': 1}
+    replacement = str(tmp_path / 'config.yml.tmp')
+    write(replacement, 'a: 2\n', mtime_ns=mtime)
+    keep = open(path, 'rb')  # garde l'ancien inode vivant : le nouveau fichier en diffère
+    try:
+        os.replace(replacement, path)
+        assert os.stat(path).st_ino != os.fstat(keep.fileno()).st_ino
+        assert ConfigCache.load(path) == {'a': 2}
+    finally:
+        keep.close()
+
+
+def test_invalidate_forces_a_reparse(tmp_path):
+    path = str(tmp_path / 'config.yml')
+    write(path, 'a: 1\n')
+    ConfigCache.load(path)
+    generation = ConfigCache.generation()
+    ConfigCache.invalidate(path)
+    assert ConfigCache.generation() > generation
+    before = parses()
+    assert ConfigCache.load(path) == {'a': 1}
+    assert parses() == before + 1
@@ -0,0 +1,39 @@
+import pytest
+
+from src.core.event_manager import Dispatcher, EventManager, SyncDispatcher, ThreadPoolDispatcher
+
+
+def test_incomplete_dispatcher_fails_at_instantiation():
+    class Incomplete(Dispatcher):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_sync_dispatcher_isolates_handler_errors():
+    reported = []
+    events = EventManager(SyncDispatcher(report=reported.append))
+    seen = []
+
+    def broken(data):
+        raise ValueError('boom')
+
+    events.subscribe('config.#', broken, priority=1)
+    events.subscribe('config.*', seen.append)
+    results = events.publish('config.memApp', 42)
+    assert seen == [42]
+    assert [r.ok for r in results] == [False, True]
+    assert isinstance(reported[0].error, ValueError)
+
+
+def test_thread_pool_dispatcher_runs_all_handlers():
+    events = EventManager(ThreadPoolDispatcher(max_workers=2))
+    seen = []
+    events.subscribe('jobs.#', seen.append)
+    for i in range(4):
+        events.subscribe(f'jobs.{i}', seen.append)
+    futures = [f for i in range(4) for f in events.publish(f'jobs.{i}', i)]
+    assert all(f.result().ok for f in futures)
+    events.shutdown()
+    assert sorted(seen) == [0, 0, 1, 1, 2, 2, 3, 3]
@@ -0,0 +1,95 @@
+import copy
+import pickle
+from functools import reduce
+
+import pytest
+
+from src.core.config_manager import ConfigManager
+from src.core.config_manager.merge import ConfigMerge
+from src.utils.frozen import FrozenDict, FrozenList, freeze, merge_many, thaw
+
+TREE = {
+    'memApp': {'database': {'port': 5432, 'hosts': ['a', {'b': [1, 2]}]}, 'debug': False},
+    'logs': [{'level': 'info'}, 'plain'],
+    'empty': {},
+}
+
+SOURCES = [
+    {'a': {'x': 1, 'y': {'z': 1}}, 'b': [1, 2], 'c': 1},
+    {'a': {'y': {'w': 2}, 'v': 3}, 'b': {'replaced': True}},
+    {'a': 'scalar', 'd': {'e': 1}},
+    {'a': {'again': 1}, 'd': {'f': [3]}, 'b': {'k': 1}},
+    {},
+    {'d': {'e': {'deep': {'er': 1}}}},
+]
+
+
+def test_thaw_of_freeze_round_trips():
+    frozen = freeze(TREE)
+    assert isinstance(frozen, FrozenDict) and isinstance(frozen['logs'], FrozenList)
+    assert frozen == TREE
+    thawed = thaw(frozen)
+    assert thawed == TREE
+    assert type(thawed) is dict and type(thawed['memApp']['database']['hosts']) is list
+    assert type(thawed['memApp']['database']['hosts'][1]) is dict
+    assert copy.deepcopy(frozen) == TREE and type(copy.deepcopy(frozen)) is dict
+    assert pickle.loads(pickle.dumps(frozen)) == TREE
+    assert freeze(frozen) is frozen
+    assert freeze(5) == 5 and thaw('x') == 'x'
+
+
+def test_frozen_containers_reject_mutation():
+    frozen = freeze(TREE)
+    mutations = [
+        lambda: frozen.__setitem__('new', 1),
+        lambda: frozen.__delitem__('empty'),
+        lambda: frozen.update(new=1),
+        lambda: frozen.setdefault('new', 1),
+        lambda: frozen.pop('empty'),
+        lambda: frozen.popitem(),
+        lambda: frozen.clear(),
+        lambda: frozen['memApp']['database'].__setitem__('port', 1),
+        lambda: frozen['logs'].append(1),
+        lambda: frozen['logs'].extend([1]),
+        lambda: frozen['logs'].insert(0, 1),
+        lambda: frozen['logs'].__setitem__(0, 1),
+        lambda: frozen['logs'].sort(),
+        lambda: frozen['logs'].pop(),
+    ]
+    for mutate in mutations:
+        with pytest.raises(TypeError):
+            mutate()
+    with pytest.raises(TypeError):
+        nested = frozen['logs']
+        nested += [1]
+    assert frozen == TREE
+    shallow = copy.copy(frozen)
+    shallow['new'] = 1
+    assert 'new' not in frozen
+
+
+@pytest.mark.parametrize('count', range(1, len(SOURCES) + 1))
+def test_merge_many_matches_pairwise_fold(count):
+    sources = SOURCES[:count]
+    expected = reduce(ConfigMerge.deep_merge_dicts, sources)
+    merged = merge_many(sources)
+    assert merged == expected
+    assert isinstance(merged, FrozenDict)
+    assert merge_many([]) is None
+
+
+def test_merge_many_shares_untouched_subtrees():
+    shared = freeze({'only': {'here': 1}})
+    merged = merge_many([{'a': 1}, FrozenDict({'b': shared})])
+    assert merged['b'] is shared
+
+
+def test_get_config_returns_read_only_trees(config_dir):
+    section = ConfigManager.get_config('memApp', section='memApp', with_section=False)
+    full = ConfigManager.get_config('memApp')
+    for tree in (section, full, full['memApp']):
+        with pytest.raises(TypeError):
+            tree['watchdog'] = {}
+    editable = thaw(section)
+    editable['watchdog'] = {}
+    assert ConfigManager.get_config('memApp', section='memApp')['memApp']['watchdog'] != {}
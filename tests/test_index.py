@@ -0,0 +1,67 @@
+from src.core.config_manager import ConfigManager
+from src.core.config_manager.index import ConfigIndex
+
+
+def traverse(tree, dotted):
+    node = tree
+    for part in dotted.split('.'):
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node
+
+
+def flat_sections(tree, key):
+    return [s for s, value in tree.items() if isinstance(value, dict) and key in value]
+
+
+def dotted_paths(tree, prefix=()):
+    for key, value in tree.items():
+        path = prefix + (key,)
+        yield '.'.join(map(str, path))
+        if isinstance(value, dict):
+            yield from dotted_paths(value, path)
+
+
+def assert_matches_traversal(index: ConfigIndex, tree: dict):
+    for dotted in dotted_paths(tree):
+        path = index.path(dotted)
+        assert path is not None and traverse(tree, '.'.join(path)) == traverse(tree, dotted)
+    keys = {k for value in tree.values() if isinstance(value, dict) for k in value}
+    for key in keys:
+        sections = flat_sections(tree, key)
+        assert index.sections(key) == sections
+        assert index.section_of(key) == sections[-1]
+    assert index.section_of('no-such-key') is None
+    assert index.path('no.such.path') is None
+
+
+def test_index_matches_dict_traversal(config_dir):
+    tree = ConfigManager._compiled_config('memApp').tree
+    assert_matches_traversal(ConfigManager.get_index('memApp'), tree)
+    full = ConfigManager._compiled_config().tree
+    assert_matches_traversal(ConfigManager.get_index(), full)
+
+
+def test_index_lookups_follow_a_reload(config_dir):
+    first = ConfigManager.get_index('memApp')
+    assert ConfigManager.get_index('memApp') is first
+    assert ConfigManager.get_config('memApp', keys=['memApp.database.port']) == {
+        'memApp.database.port': 5432}
+
+    ConfigManager.set_service_config_arg('memApp', 'memApp', 'database', {'port': 6543})
+    ConfigManager.update_full_config()
+    second = ConfigManager.get_index('memApp')
+    assert second is not first
+    tree = ConfigManager._compiled_config('memApp').tree
+    assert_matches_traversal(second, tree)
+    assert ConfigManager.get_config('memApp', keys=['memApp.database.port']) == {
+        'memApp.database.port': 6543}
+    assert ConfigManager.get_config('memApp', keys=['database'])['database'] == traverse(
+        tree, f"{second.section_of('database')}.database")
+
+
+def test_ambiguous_keys_are_reported():
+    index = ConfigIndex({'a': {'port': 1, 'host': 'x'}, 'b': {'port': 2}, 'c': 3})
+    assert index.ambiguous() == {'port': ['a', 'b']}
+    assert index.section_of('port') == 'b'
@@ -0,0 +1,83 @@
+import os
+import time
+import threading
+
+from src.core.event_manager import EventJournal, EventManager
+
+
+def test_torn_tail_is_truncated_on_reopen(tmp_path, capsys):
+    directory = str(tmp_path / 'journal')
+    with EventJournal(directory) as journal:
+        for i in range(5):
+            journal.append('jobs.done', {'i': i})
+        journal.flush()
+        path = journal.segments()[-1]
+    size = os.path.getsize(path)
+    with open(path, 'ab') as f:
+        f.write(b'\x40\x00\x00\x00torn')  # arrêt brutal au milieu d'un enregistrement
+
+    with EventJournal(directory) as journal:
+        assert 'tronquée' in capsys.readouterr().out
+        assert os.path.getsize(path) == size
+        assert journal.next_offset == 5
+        assert journal.append('jobs.done', {'i': 5}, wait=True) == 5
+        with journal.cursor(0) as cursor:
+            assert [r.data['i'] for r in cursor] == list(range(6))
+
+
+def test_cursor_follows_rotation(tmp_path):
+    with EventJournal(str(tmp_path), segment_bytes=256, flush_interval=0) as journal:
+        for i in range(20):
+            journal.append('jobs.done', {'i': i}, wait=True)
+        assert len(journal.segments()) > 2
+        cursor = journal.cursor(3)
+        assert [r.offset for r in cursor.read(5)] == [3, 4, 5, 6, 7]
+        for i in range(20, 30):
+            journal.append('jobs.done', {'i': i}, wait=True)
+        assert [r.offset for r in cursor.read()] == list(range(8, 30))
+        assert cursor.offset == 30
+        cursor.close()
+
+
+def test_close_leaves_the_segment_to_a_busy_writer(tmp_path, monkeypatch):
+    journal = EventJournal(str(tmp_path))
+    release = threading.Event()
+    write = journal._write
+    monkeypatch.setattr(journal, '_write', lambda *args: release.wait(5) and write(*args))
+    journal.append('jobs.done', 1)
+    time.sleep(0.05)
+    journal.close(timeout=0.05)
+    os.fstat(journal._fd)  # toujours ouvert : le thread écrit encore
+    release.set()
+    journal._thread.join(5)
+    assert journal.durable_offset == 0
+    assert journal._stopped and journal._detached
+
+
+def test_replay_then_live_without_duplicates_or_gaps(tmp_path):
+    events = EventManager(journal=EventJournal(str(tmp_path), flush_interval=0.001))
+    stop = threading.Event()
+    published = []
+
+    def publish():
+        i = 0
+        while not stop.is_set():
+            events.publish('jobs.done', i)
+            published.append(i)
+            i += 1
+
+    seen = []
+    for i in range(-200, 0):
+        events.publish('jobs.done', i)
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    try:
+        time.sleep(0.02)
+        events.subscribe('jobs.#', seen.append, replay_from=0)
+        time.sleep(0.05)
+    finally:
+        stop.set()
+        publisher.join()
+        events.shutdown()
+    assert published
+    assert seen == list(range(-200, 0)) + published
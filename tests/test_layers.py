@@ -0,0 +1,102 @@
+import os
+
+import pytest
+
+from src.core.config_manager import ConfigManager
+from src.core.config_manager.discovery import ConfigDiscovery
+from src.core.config_manager.layers import LayeredView
+from src.core.config_manager.merge import ConfigMerge
+
+
+def test_layers_reuse_the_resolver_without_walking(config_dir, monkeypatch):
+    first = ConfigManager.layers()
+    walks = []
+    walk = ConfigDiscovery._walk
+    monkeypatch.setattr(ConfigDiscovery, '_walk',
+                        staticmethod(lambda path: walks.append(path) or walk(path)))
+    for _ in range(5):
+        assert ConfigManager.layers() is first
+        ConfigManager.explain('memApp')
+    assert walks == []
+
+
+def test_layers_rebuild_on_new_generation(config_dir):
+    first = ConfigManager.layers()
+    ConfigManager.set_service_config_arg('memApp', 'memApp', 'bench', 1)
+    ConfigManager.update_full_config()
+    second = ConfigManager.layers()
+    assert second is not first
+    assert second.get('memApp.bench') == 1
+    assert second.source('memApp.bench') == 'config'
+
+
+def test_layers_rebuild_when_a_defaults_file_appears(config_dir):
+    first = ConfigManager.layers()
+    service = os.path.join(config_dir, 'extra')
+    os.makedirs(service)
+    with open(os.path.join(service, 'defaults.yml'), 'w', encoding='utf-8') as f:
+        f.write('extra:\n  level: 3\n')
+    second = ConfigManager.layers()
+    assert second is not first
+    assert second.get('extra.level') == 3
+    assert second.source('extra.level') == 'defaults'
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink'), reason="liens symboliques indisponibles")
+def test_discovery_does_not_follow_directory_symlinks(tmp_path):
+    service = tmp_path / 'memApp'
+    service.mkdir()
+    (service / 'config.yml').write_text('memApp: {}\n', encoding='utf-8')
+    os.symlink(str(tmp_path), str(service / 'loop'))  # cycle memApp/loop -> racine
+    os.symlink(str(service), str(tmp_path / 'alias'))
+    stamps, found = ConfigDiscovery._walk(str(tmp_path))
+    assert found.config == [str(service / 'config.yml')]
+    assert [path for path, _ in stamps] == [str(tmp_path), str(service)]
+
+
+def test_layers_pick_up_an_in_place_defaults_edit(config_dir):
+    service = os.path.join(config_dir, 'memApp')
+    path = os.path.join(service, 'defaults.yml')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('  cache:\n    size: 10\n')
+    first = ConfigManager.layers()
+    assert first.get('memApp.cache.size') == 10
+    stamp = os.stat(service).st_mtime_ns
+    with open(path, 'r+', encoding='utf-8') as f:  # réécriture sur place, même taille
+        text = f.read()
+        f.seek(0)
+        f.write(text.replace('size: 10', 'size: 20'))
+    os.utime(service, ns=(stamp, stamp))  # seul le fichier change, pas le répertoire
+    second = ConfigManager.layers()
+    assert second is not first
+    assert second.get('memApp.cache.size') == 20
+    assert second.source('memApp.cache.size') == 'defaults'
+    assert ConfigManager.layers() is second
+
+
+def test_get_config_defaults_are_a_lazy_lowest_layer(config_dir, monkeypatch):
+    defaults = {'memApp': {'database': {'port': 1, 'pool': 4}, 'cache': {'size': 8}},
+                'other': {'x': 1}}
+    merged = ConfigMerge.deep_merge_dicts(defaults, ConfigManager.get_config('memApp'))
+    cases = [
+        (dict(), merged),
+        (dict(section='memApp'), {'memApp': merged['memApp']}),
+        (dict(section='other', with_section=False), {'x': 1}),
+        (dict(multi_sections=['memApp', 'other'], keys=['database', 'cache', 'x']),
+         {'memApp': {'database': merged['memApp']['database'], 'cache': {'size': 8}},
+          'other': {'x': 1}}),
+        (dict(keys=['database', 'memApp.database.pool', 'x']),
+         {'database': merged['memApp']['database'], 'memApp.database.pool': 4, 'x': 1}),
+    ]
+
+    def no_merge(*args):
+        raise AssertionError('fusion sur le chemin de lecture')
+
+    monkeypatch.setattr(ConfigMerge, 'deep_merge_dicts', staticmethod(no_merge))
+    for case, expected in cases:
+        assert ConfigManager.get_config('memApp', defaults=defaults, **case) == expected, case
+    config = ConfigManager.get_config('memApp', defaults=defaults)
+    assert isinstance(config, LayeredView)
+    assert config['memApp']['database']['port'] == 5432
+    assert config.source('memApp.database.pool') == 'defaults'
+    assert config.source('memApp.database.port') == 'config'
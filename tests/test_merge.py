@@ -0,0 +1,67 @@
+import os
+from functools import reduce
+
+import yaml
+
+from src.core.config_manager.merge import ConfigMerge, IncrementalMerge
+from src.utils.frozen import FrozenDict
+
+
+def write(directory, service, tree):
+    path = os.path.join(directory, service, 'config.yml')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(tree, f)
+    return path
+
+
+def full_merge(files):
+    trees = []
+    for path in files:
+        with open(path, encoding='utf-8') as f:
+            trees.append(yaml.safe_load(f) or {})
+    return reduce(ConfigMerge.deep_merge_dicts, trees, FrozenDict())
+
+
+def test_incremental_merge_matches_full_merge(tmp_path):
+    directory = str(tmp_path)
+    files = [
+        write(directory, 'alpha', {'alpha': {'port': 1}, 'shared': {'a': 1, 'level': 'alpha'}}),
+        write(directory, 'beta', {'beta': {'hosts': ['x']}, 'shared': {'b': 2, 'level': 'beta'}}),
+        write(directory, 'gamma', {'gamma': {'on': True}}),
+    ]
+    engine = IncrementalMerge()
+    merged, changed = engine.merge(files)
+    assert changed and merged == full_merge(files)
+
+    # Un service modifié
+    write(directory, 'beta', {'beta': {'hosts': ['y', 'z']}, 'shared': {'level': 'beta2'}})
+    merged, changed = engine.merge(files)
+    assert changed and merged == full_merge(files)
+    assert merged['shared'] == {'a': 1, 'level': 'beta2'}
+
+    # Un service supprimé
+    os.unlink(files[0])
+    files = files[1:]
+    merged, changed = engine.merge(files)
+    assert changed and merged == full_merge(files)
+    assert 'alpha' not in merged and 'a' not in merged['shared']
+
+    # Un service ajouté
+    files.append(write(directory, 'delta', {'delta': {}, 'shared': {'level': 'delta', 'd': 4}}))
+    merged, changed = engine.merge(files)
+    assert changed and merged == full_merge(files)
+
+    # Rien de modifié : même arbre, sans changement signalé
+    again, changed = engine.merge(files)
+    assert not changed and again is merged
+
+
+def test_reordered_files_are_fully_remerged(tmp_path):
+    directory = str(tmp_path)
+    files = [write(directory, 'one', {'shared': {'v': 1}}),
+             write(directory, 'two', {'shared': {'v': 2}})]
+    engine = IncrementalMerge()
+    assert engine.merge(files)[0] == {'shared': {'v': 2}}
+    merged, changed = engine.merge(files[::-1])
+    assert changed and merged == full_merge(files[::-1]) == {'shared': {'v': 1}}
@@ -0,0 +1,67 @@
+import threading
+
+from src.core.config_manager import merkle
+from src.utils.frozen import FrozenDict, FrozenList
+
+
+def tree(width, depth, seed=0):
+    if depth == 0:
+        return FrozenList([seed, str(seed)])
+    return FrozenDict({f"k{i}": tree(width, depth - 1, seed * width + i) for i in range(width)})
+
+
+def thaw(node):
+    if isinstance(node, dict):
+        return {k: thaw(v) for k, v in node.items()}
+    if isinstance(node, list):
+        return [thaw(v) for v in node]
+    return node
+
+
+def test_cached_children_survive_eviction_during_traversal(monkeypatch):
+    monkeypatch.setattr(merkle, 'MAX_CACHE', 4)
+    merkle._cache.clear()
+    shared = tree(2, 2)
+    merkle.digest(shared)  # enfants en cache
+    parent = FrozenDict(shared=shared, fresh=tree(3, 3, seed=7))
+    assert merkle.digest(parent) == merkle.digest(thaw(parent))
+    assert len(merkle._cache) <= 4
+    merkle._cache.clear()
+
+
+def test_cache_is_a_bounded_lru(monkeypatch):
+    monkeypatch.setattr(merkle, 'MAX_CACHE', 3)
+    merkle._cache.clear()
+    hot = FrozenDict(a=1)
+    merkle.digest(hot)
+    for i in range(5):
+        merkle.digest(FrozenDict(b=i))
+        merkle.digest(hot)
+    assert len(merkle._cache) == 3
+    assert merkle._cached(hot) is not None
+    merkle._cache.clear()
+
+
+def test_concurrent_digests_match(monkeypatch):
+    monkeypatch.setattr(merkle, 'MAX_CACHE', 16)
+    merkle._cache.clear()
+    trees = [tree(4, 3, seed=s) for s in range(4)]
+    expected = [merkle.digest(thaw(t)) for t in trees]
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(20):
+                for t, digest in zip(trees, expected):
+                    assert merkle.digest(t) == digest
+        except Exception as e:  # remonté au thread principal
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(merkle._cache) <= 16
+    merkle._cache.clear()
@@ -0,0 +1,33 @@
+import pytest
+
+from src.utils.metrics import Metric, MetricsRegistry
+
+
+def test_prometheus_exposition_escapes_labels_and_accumulates_buckets():
+    registry = MetricsRegistry()
+    counter = registry.counter('memapp_test_total', 'Test', ('path',))
+    counter.inc(2, 'a"b\nc\\d')
+    histogram = registry.histogram('memapp_test_seconds', 'Test', buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    text = registry.to_prometheus()
+    assert 'memapp_test_total{path="a\\"b\\nc\\\\d"} 2' in text
+    assert 'memapp_test_seconds_bucket{le="0.1"} 1' in text
+    assert 'memapp_test_seconds_bucket{le="1"} 2' in text
+    assert 'memapp_test_seconds_bucket{le="+Inf"} 2' in text
+    assert 'memapp_test_seconds_count 2' in text
+
+
+def test_label_count_is_checked():
+    registry = MetricsRegistry()
+    counter = registry.counter('memapp_labels_total', 'Test', ('a', 'b'))
+    with pytest.raises(ValueError):
+        counter.inc(1, 'only-one')
+
+
+def test_metric_without_child_factory_fails_at_instantiation():
+    class Incomplete(Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(MetricsRegistry(), 'memapp_incomplete')
@@ -0,0 +1,68 @@
+import os
+import time
+import threading
+
+from src.core.config_manager import ConfigManager
+from src.core.config_manager.reload import ConfigWatcher
+
+
+def test_debounce_is_bounded_by_max_wait():
+    watcher = ConfigWatcher(merge=dict, debounce=0.1, max_wait=0.3)
+    stop = threading.Event()
+
+    def rewrite():
+        while not stop.is_set():
+            watcher.notify('/cfg/memApp/config.yml', 'modified')
+            time.sleep(0.02)
+
+    writer = threading.Thread(target=rewrite)
+    writer.start()
+    try:
+        start = time.monotonic()
+        batch, rescan, first_event = watcher._next_batch()
+        elapsed = time.monotonic() - start
+    finally:
+        stop.set()
+        writer.join()
+    assert batch == {'/cfg/memApp/config.yml': 'modified'}
+    assert not rescan
+    assert 0.25 <= elapsed < 0.6
+
+
+def test_quiet_batch_flushes_after_debounce():
+    watcher = ConfigWatcher(merge=dict, debounce=0.05, max_wait=5.0)
+    watcher.notify('/cfg/logs/config.yml', 'created')
+    start = time.monotonic()
+    batch, _, _ = watcher._next_batch()
+    assert batch == {'/cfg/logs/config.yml': 'created'}
+    assert time.monotonic() - start < 1.0
+
+
+def test_config_manager_passes_max_wait_through(config_dir):
+    watcher = ConfigManager.reload_on_change(debounce=0.05, max_wait=0.7)
+    try:
+        assert watcher.max_wait == 0.7
+    finally:
+        watcher.stop()
+    shared = ConfigManager.reload_on_change(debounce=0.05, shared=True, max_wait=0.7)
+    try:
+        assert shared.max_wait == 0.7
+        if shared.role == 'leader':
+            assert shared._watcher.max_wait == 0.7
+    finally:
+        shared.stop()
+
+
+def test_defaults_edit_starts_a_reload_batch(config_dir):
+    merges = []
+    watcher = ConfigWatcher(merge=lambda: merges.append(1) or {}, debounce=0.05,
+                            config_dir=config_dir).start()
+    try:
+        with open(os.path.join(config_dir, 'memApp', 'defaults.yml'), 'a', encoding='utf-8') as f:
+            f.write('  cache:\n    size: 10\n')
+        deadline = time.monotonic() + 5
+        while len(merges) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert len(merges) >= 2  # fusion initiale, puis le lot du defaults.yml
+    finally:
+        watcher.stop()
@@ -0,0 +1,80 @@
+import gc
+
+from src.core.event_manager import TopicRouter
+
+
+def test_wildcards_match_one_or_many_segments():
+    router = TopicRouter()
+    calls = {name: (lambda data, name=name: name) for name in ('exact', 'single', 'multi', 'root')}
+    router.subscribe('config.memApp.watchdog', calls['exact'])
+    router.subscribe('config.*.watchdog', calls['single'])
+    router.subscribe('config.#', calls['multi'], priority=1)
+    router.subscribe('#', calls['root'], priority=-1)
+
+    assert router.handlers('config.memApp.watchdog') == [
+        calls['multi'], calls['exact'], calls['single'], calls['root']]
+    assert router.handlers('config') == [calls['multi'], calls['root']]
+    assert router.handlers('config.memApp') == [calls['multi'], calls['root']]
+    assert router.handlers('config.memApp.watchdog.extra') == [calls['multi'], calls['root']]
+    assert router.handlers('logs.memApp.watchdog') == [calls['root']]
+
+
+def test_single_wildcard_needs_exactly_one_segment():
+    router = TopicRouter()
+    handler = lambda data: None  # noqa: E731
+    router.subscribe('config.*', handler)
+    assert router.handlers('config.memApp') == [handler]
+    assert router.handlers('config') == []
+    assert router.handlers('config.memApp.watchdog') == []
+
+
+def test_collected_weak_handlers_are_purged():
+    class Listener:
+        def on_event(self, data):
+            pass
+
+    router = TopicRouter()
+    listener = Listener()
+    sub = router.subscribe('config.#', listener.on_event, weak=True)
+    assert router.handlers('config.memApp') == [listener.on_event]
+    del listener
+    gc.collect()
+    assert sub.handler() is None
+    assert router.resolve('config.memApp') == []
+    assert router.patterns() == {}
+
+
+def test_unsubscribe_removes_matching_handlers_and_prunes_the_trie():
+    router = TopicRouter()
+    first, second = (lambda data: 1), (lambda data: 2)
+    router.subscribe('config.memApp', first)
+    router.subscribe('config.memApp', second)
+    assert router.unsubscribe('config.memApp', first) == 1
+    assert router.handlers('config.memApp') == [second]
+    assert router.unsubscribe('config.memApp') == 1
+    assert router.unsubscribe('config.unknown') == 0
+    assert router._root.children == {}
+
+
+def test_route_cache_is_invalidated_on_subscribe_and_unsubscribe():
+    router = TopicRouter()
+    first, second = (lambda data: 1), (lambda data: 2)
+    router.subscribe('config.*', first)
+    resolved = router.resolve('config.memApp')
+    assert router.resolve('config.memApp') is resolved  # servi par le cache
+
+    router.subscribe('config.#', second)
+    assert router.handlers('config.memApp') == [first, second]
+    sub = router.resolve('config.memApp')[1]
+    assert router.remove(sub)
+    assert router.handlers('config.memApp') == [first]
+    router.unsubscribe('config.*', first)
+    assert router.handlers('config.memApp') == []
+
+
+def test_route_cache_is_bounded():
+    router = TopicRouter(cache_size=4)
+    router.subscribe('config.#', lambda data: None)
+    for i in range(10):
+        router.resolve(f'config.service{i}')
+    assert len(router._cache) <= 4
@@ -0,0 +1,24 @@
+import yaml
+
+from src.utils import serialization
+
+
+def documents(count):
+    return [(yaml.safe_dump({'service': i, 'values': list(range(5))}).encode('utf-8'),
+             f'/cfg/s{i}.yml', None) for i in range(count)]
+
+
+def test_load_many_keeps_input_order_with_thread_pool(monkeypatch):
+    monkeypatch.setenv('MEMAPP_PARSE_EXECUTOR', 'thread')
+    results = serialization.load_many(documents(20), workers=4)
+    assert [r['service'] for r in results] == list(range(20))
+
+
+def test_process_pool_uses_spawn_and_shuts_down(monkeypatch):
+    monkeypatch.setenv('MEMAPP_PARSE_EXECUTOR', 'process')
+    results = serialization.load_many(documents(16), workers=2)
+    assert [r['service'] for r in results] == list(range(16))
+    executor = serialization._executors['process:2']
+    assert executor._mp_context.get_start_method() == 'spawn'
+    serialization.shutdown_executors()
+    assert serialization._executors == {}
@@ -0,0 +1,80 @@
+import gzip
+import json
+import threading
+
+import pytest
+
+from src.core.config_manager import ConfigManager
+from src.core.config_manager.server import ConfigServer
+
+pytest.importorskip('flask')
+
+
+@pytest.fixture
+def server(config_dir):
+    ConfigManager.update_full_config()
+    server = ConfigServer()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(server):
+    return server.create_app().test_client()
+
+
+def test_config_200_then_304(client):
+    response = client.get('/config/memApp/database')
+    assert response.status_code == 200
+    assert response.get_json()['port'] == 5432
+    assert response.headers['X-Config-Generation'] == str(ConfigManager.generation())
+    etag = response.headers['ETag']
+    again = client.get('/config/memApp.database', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+
+
+def test_unknown_paths_are_404(client):
+    assert client.get('/config/memApp/nope').status_code == 404
+    assert client.get('/services/nope').status_code == 404
+
+
+def test_large_body_is_gzipped_on_request(client):
+    ConfigManager.set_service_config_arg('memApp', 'memApp', 'blob', 'x' * 4096)
+    ConfigManager.update_full_config()
+    plain = client.get('/services/memApp/memApp')
+    zipped = client.get('/services/memApp/memApp', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in plain.headers
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert zipped.headers['ETag'] != plain.headers['ETag']
+    assert json.loads(gzip.decompress(zipped.data)) == plain.get_json()
+
+
+def test_changes_long_poll_wakes_on_publish(client):
+    since = ConfigManager.generation()
+
+    def publish():
+        ConfigManager.set_service_config_arg('memApp', 'memApp', 'bench', 1)
+        ConfigManager.update_full_config()
+
+    timer = threading.Timer(0.2, publish)
+    timer.start()
+    try:
+        response = client.get(f'/changes?since={since}&timeout=10')
+    finally:
+        timer.join()
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['generation'] > since and body['complete']
+    assert any('memApp.bench' in entry['paths'] for entry in body['changes'])
+
+
+def test_changes_times_out_without_publish(client):
+    since = ConfigManager.generation()
+    body = client.get(f'/changes?since={since}&timeout=0.1').get_json()
+    assert body['generation'] == since and body['changes'] == []
+
+
+@pytest.mark.parametrize('query', ['since=abc', 'since=1&timeout=soon'])
+def test_changes_rejects_invalid_arguments(client, query):
+    assert client.get(f'/changes?{query}').status_code == 400
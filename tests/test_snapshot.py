@@ -0,0 +1,130 @@
+import threading
+
+from src.core.config_manager import ConfigManager
+from src.core.config_manager.reload import ConfigWatcher
+from src.core.config_manager.snapshot import SnapshotStore
+from src.utils.frozen import freeze
+
+
+def publish(store, value, digest=None, generation=None):
+    return store.publish(freeze({'value': value}), digest or f'd{value}', None,
+                         generation=generation)
+
+
+def test_generation_increases_only_for_new_content():
+    store = SnapshotStore()
+    first = publish(store, 1)
+    assert publish(store, 1, digest=first.digest).generation == first.generation
+    assert publish(store, 2).generation == first.generation + 1
+
+
+def test_forced_generation_never_goes_backwards():
+    store = SnapshotStore()
+    assert publish(store, 1, generation=10).generation == 10
+    stale = publish(store, 2, generation=4)
+    assert stale.generation == 10
+    assert publish(store, 3).generation == 11
+
+
+def test_reset_keeps_generations_increasing():
+    store = SnapshotStore()
+    before = publish(store, 1).generation
+    store.reset()
+    assert store.current() is None
+    assert publish(store, 2).generation > before
+
+
+def test_listeners_receive_old_and_new_snapshots():
+    seen = []
+    store = SnapshotStore([lambda old, new: seen.append((old.generation, new.generation))])
+    publish(store, 1)
+    publish(store, 2)
+    assert seen == [(1, 2)]
+
+
+def test_listeners_run_outside_the_publish_lock():
+    store = SnapshotStore()
+    acquired = []
+
+    def listener(old, new):
+        thread = threading.Thread(target=lambda: acquired.append(store.lock.acquire(timeout=1)
+                                                                 and store.lock.release() is None))
+        thread.start()
+        thread.join()
+
+    store.listeners.append(listener)
+    publish(store, 1)
+    publish(store, 2)
+    assert acquired == [True]
+
+
+def test_watch_callbacks_run_after_the_writer_released_the_lock(config_dir):
+    ConfigManager.update_full_config()
+    acquired = []
+
+    def callback(change):
+        thread = threading.Thread(target=lambda: acquired.append(
+            ConfigManager._snapshots.lock.acquire(timeout=1)
+            and ConfigManager._snapshots.lock.release() is None))
+        thread.start()
+        thread.join()
+
+    with ConfigManager.watch('memApp.bench', callback):
+        ConfigManager.set_service_config_arg('memApp', 'memApp', 'bench', 1)
+        ConfigManager.update_full_config()
+    assert acquired == [True]
+
+
+def test_listeners_follow_publication_order():
+    seen = []
+    store = SnapshotStore()
+
+    def listener(old, new):
+        seen.append((old.generation, new.generation))
+        if new.config['value'] == 2:
+            publish(store, 3)  # publication depuis un listener : notifiée après celle-ci
+            assert seen == [(1, 2)]
+
+    store.listeners.append(listener)
+    publish(store, 1)
+    publish(store, 2)
+    assert seen == [(1, 2), (2, 3)]
+
+    seen.clear()
+    threads = [threading.Thread(target=lambda i=i: [publish(store, 100 * i + n) for n in range(50)])
+               for i in range(1, 5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(seen) == 200
+    assert all(a[1] == b[0] for a, b in zip(seen, seen[1:]))
+    assert seen[-1][1] == store.current().generation
+
+
+def test_pin_is_per_thread_and_reentrant(config_dir):
+    ConfigManager.update_full_config()
+    with ConfigManager.pin() as outer:
+        with ConfigManager.pin() as inner:
+            assert inner is outer
+        ConfigManager.set_service_config_arg('memApp', 'memApp', 'pinned', 1)
+        ConfigManager.update_full_config()
+        assert ConfigManager.generation() == outer.generation
+        assert 'pinned' not in ConfigManager.get_full_config()['memApp']
+        other = []
+        thread = threading.Thread(target=lambda: other.append(ConfigManager.generation()))
+        thread.start()
+        thread.join()
+        assert other[0] > outer.generation
+    assert ConfigManager.generation() == other[0]
+    assert ConfigManager.get_full_config()['memApp']['pinned'] == 1
+
+
+def test_reload_event_carries_published_generation(config_dir):
+    events = []
+    watcher = ConfigWatcher(events.append, debounce=0, merge=ConfigManager._reload_merge,
+                            config_dir=config_dir, generation=ConfigManager.generation)
+    watcher._merged = ConfigManager._reload_merge()
+    ConfigManager.set_service_config_arg('memApp', 'memApp', 'reloaded', True)
+    watcher._process({f'{config_dir}/memApp/config.yml': 'modified'}, False)
+    assert events and events[0].generation == ConfigManager.generation()
@@ -0,0 +1,49 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+from conftest import ROOT
+from src.core.config_manager.storage import ConfigStorage, SqliteStorage
+from src.core.config_manager.transaction import ConfigTransaction
+
+WORKER = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from src.core.config_manager.storage import SqliteStorage
+from src.core.config_manager.transaction import ConfigTransaction
+storage = SqliteStorage(sys.argv[2])
+for _ in range(int(sys.argv[3])):
+    with ConfigTransaction(['memApp'], sys.argv[4], storage=storage) as tx:
+        tx.set('memApp', 'counter', tx.get('memApp', 'counter') + 1)
+"""
+
+
+def test_storage_interface_is_abstract():
+    with pytest.raises(TypeError):
+        ConfigStorage()
+
+    class Partial(ConfigStorage):
+        def services(self):
+            return []
+
+        def load(self, service):
+            return {}
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="verrou inter-processus par flock")
+def test_concurrent_process_transactions_lose_no_update(config_dir, tmp_path):
+    db = str(tmp_path / 'config.db')
+    storage = SqliteStorage(db).import_yaml(config_dir)
+    with ConfigTransaction(['memApp'], config_dir, storage=storage) as tx:
+        tx.set('memApp', 'counter', 0)
+    workers, rounds = 3, 40
+    procs = [subprocess.Popen([sys.executable, '-c', WORKER, ROOT, db, str(rounds), config_dir])
+             for _ in range(workers)]
+    assert all(proc.wait(timeout=120) == 0 for proc in procs)
+    assert storage.get('memApp', 'memApp', 'counter') == workers * rounds
+    assert os.path.exists(f"{db}.memApp.lock")
@@ -0,0 +1,47 @@
+import pytest
+
+from src.core.config_manager.substitution import MISSING, CompiledSubstitution, Template
+from src.utils.frozen import freeze
+
+
+@pytest.fixture
+def env(monkeypatch):
+    for name in ('MEMAPP_TEST_HOST', 'MEMAPP_TEST_PORT'):
+        monkeypatch.delenv(name, raising=False)
+    return monkeypatch
+
+
+def test_braced_default_is_used_when_variable_is_unset(env):
+    assert Template('${MEMAPP_TEST_HOST:-localhost}').render() == 'localhost'
+    assert Template('db://${MEMAPP_TEST_HOST:-localhost}:${MEMAPP_TEST_PORT:-5432}/app').render() \
+        == 'db://localhost:5432/app'
+
+
+def test_braced_variable_overrides_default(env):
+    env.setenv('MEMAPP_TEST_HOST', 'db.internal')
+    assert Template('db://${MEMAPP_TEST_HOST:-localhost}/app').render() == 'db://db.internal/app'
+
+
+def test_empty_default_and_unresolved_references(env):
+    assert Template('x${MEMAPP_TEST_HOST:-}y').render() == 'xy'
+    assert Template('${MEMAPP_TEST_HOST}').render() == '${MEMAPP_TEST_HOST}'
+    assert Template('$MEMAPP_TEST_HOST').render() == '$MEMAPP_TEST_HOST'
+    env.setenv('MEMAPP_TEST_HOST', 'h')
+    assert Template('$MEMAPP_TEST_HOST').render() == 'h'
+
+
+def test_compiled_resolution_follows_environment_and_shares_static_subtrees(env):
+    tree = freeze({
+        'database': {'host': '${MEMAPP_TEST_HOST:-localhost}', 'port': 5432},
+        'static': {'level': 'INFO'},
+        'hosts': ['${MEMAPP_TEST_HOST:-a}', 'b'],
+    })
+    compiled = CompiledSubstitution(tree)
+    assert compiled.variables == {'MEMAPP_TEST_HOST'}
+    assert compiled.resolve(('database', 'host')) == 'localhost'
+    assert compiled.resolve(('hosts', 0)) == 'a'
+    assert compiled.resolve(('static',)) is tree['static']
+    env.setenv('MEMAPP_TEST_HOST', 'db.internal')
+    assert compiled.resolve(('database',)) == {'host': 'db.internal', 'port': 5432}
+    assert compiled.resolve(('missing',)) is MISSING
+    assert compiled.resolve(('missing',), default=None) is None
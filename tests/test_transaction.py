@@ -0,0 +1,71 @@
+import os
+
+import pytest
+import yaml
+
+from src.core.config_manager import ConfigManager
+from src.core.config_manager.transaction import CHANGE_TOPIC
+from src.core.exceptions import ConfigException
+
+
+@pytest.fixture
+def commits(config_dir):
+    received = []
+    subscription = ConfigManager.events.subscribe(CHANGE_TOPIC, received.append)
+    yield received
+    ConfigManager.events.router.remove(subscription)
+
+
+def read(config_dir, service):
+    with open(os.path.join(config_dir, service, 'config.yml'), 'rb') as f:
+        return f.read()
+
+
+def test_commit_writes_once_and_notifies(config_dir, commits):
+    with ConfigManager.transaction('memApp') as tx:
+        for i in range(10):
+            tx.set('memApp', f'k{i}', i)
+        tx.delete('memApp', 'k0')
+    config = yaml.safe_load(read(config_dir, 'memApp'))['memApp']
+    assert 'k0' not in config and config['k9'] == 9
+    assert len(commits) == 1
+    assert commits[0].services == ['memApp']
+    assert len(commits[0].changes) == 11
+
+
+def test_exception_in_block_rolls_back(config_dir, commits):
+    before = read(config_dir, 'memApp'), read(config_dir, 'logs')
+    with pytest.raises(RuntimeError):
+        with ConfigManager.transaction('memApp', 'logs') as tx:
+            tx.set('memApp', 'added', 1, service='memApp')
+            tx.delete('logs', service='logs')
+            raise RuntimeError('abandon')
+    assert (read(config_dir, 'memApp'), read(config_dir, 'logs')) == before
+    assert commits == []
+
+
+def test_validation_failure_rolls_back_and_releases_locks(config_dir, commits):
+    before = read(config_dir, 'memApp')
+    with pytest.raises(ConfigException):
+        with ConfigManager.transaction('memApp') as tx:
+            tx.set('watchdog', 'enabled', True)
+            tx.set('watchdog', 'interval', 'not-an-integer')
+    assert read(config_dir, 'memApp') == before
+    assert commits == []
+    with ConfigManager.transaction('memApp') as tx:
+        tx.set('watchdog', 'interval', 10)
+    assert yaml.safe_load(read(config_dir, 'memApp'))['watchdog']['interval'] == 10
+
+
+def test_working_copy_is_isolated_until_commit(config_dir):
+    with ConfigManager.transaction('memApp') as tx:
+        tx.set('memApp', 'pending', True)
+        assert tx.get('memApp', 'pending') is True
+        assert 'pending' not in ConfigManager.get_service_config('memApp')['memApp']
+    assert ConfigManager.get_service_config('memApp')['memApp']['pending'] is True
+
+
+def test_operations_outside_with_are_rejected(config_dir):
+    tx = ConfigManager.transaction('memApp')
+    with pytest.raises(ConfigException):
+        tx.set('memApp', 'x', 1)
@@ -0,0 +1,44 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+from src.core.config_manager import ConfigManager
+from src.core.exceptions import ConfigException
+
+from conftest import ROOT
+
+
+def test_plain_reads_do_not_import_pydantic(config_dir):
+    script = (
+        "import sys\n"
+        "from src.core.config_manager import ConfigManager\n"
+        f"ConfigManager.set_config_dir({config_dir!r})\n"
+        "ConfigManager.get_config(service='memApp')\n"
+        "ConfigManager.get_service_config('watchdog')\n"
+        "print('pydantic' in sys.modules)\n"
+    )
+    out = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True,
+                         check=True)
+    assert out.stdout.strip() == 'False'
+
+
+def test_invalid_file_is_reported_by_validate_not_by_reads(config_dir, capsys):
+    path = os.path.join(config_dir, 'memApp', 'config.yml')
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text.replace('interval: 5', 'interval: not-an-integer'))
+    config = ConfigManager.get_service_config('memApp')
+    assert config['memApp']['watchdog']['interval'] == 'not-an-integer'
+    assert capsys.readouterr().out == ''
+    with pytest.raises(ConfigException):
+        ConfigManager.validate('memApp')
+
+
+def test_get_typed_exposes_attributes(config_dir):
+    assert ConfigManager.validate('memApp')
+    typed = ConfigManager.get_typed('memApp')
+    assert typed.memApp.database.port == 5432
+    assert ConfigManager.get_typed('memApp', 'memApp.database.host') == 'localhost'
@@ -0,0 +1,53 @@
+import pytest
+
+from src.core.config_manager.validation import ConfigValidation
+from src.core.exceptions import ConfigException
+
+pytest.importorskip('cerberus')
+
+SCHEMA = {
+    'port': {'type': 'integer', 'min': 1},
+    'host': {'type': 'string'},
+    'debug': {'type': 'boolean'},
+}
+
+
+def test_registry_reuses_the_compiled_validator():
+    ConfigValidation.clear_cache()
+    first = ConfigValidation.get_validator(SCHEMA)
+    assert ConfigValidation.validate_config({'port': 80}, dict(SCHEMA))
+    assert ConfigValidation.get_validator({k: dict(v) for k, v in SCHEMA.items()}) is first
+    assert ConfigValidation.cache_size() == 1
+    ConfigValidation.get_validator({'other': {'type': 'string'}})
+    assert ConfigValidation.cache_size() == 2
+
+
+def test_validate_many_reports_one_error_per_key():
+    configs = [
+        {'port': 80, 'host': 'a'},
+        {'port': 0, 'host': 1, 'debug': 'yes'},
+        {'port': 'x'},
+    ]
+    errors = ConfigValidation.validate_many(configs, SCHEMA)
+    assert set(errors) == {1, 2}
+    assert set(errors[1]) == {'port', 'host', 'debug'}
+    assert all(len(messages) == 1 for messages in errors[1].values())
+    assert set(errors[2]) == {'port'}
+
+
+def test_tree_schema_validates_the_merged_tree_in_one_pass():
+    tree_schema = {'memApp': {'database': SCHEMA}}
+    compiled = ConfigValidation.compile_tree_schema(tree_schema)
+    assert compiled['memApp']['type'] == 'dict' and compiled['memApp']['allow_unknown']
+    assert compiled['memApp']['schema']['database'] == {'type': 'dict', 'schema': SCHEMA}
+
+    merged = {'memApp': {'database': {'port': 5432}, 'extra': 1}, 'logs': {}}
+    assert ConfigValidation.validate_many(merged, tree_schema) == {}
+    merged = {'memApp': {'database': {'port': -1, 'unknown': True}}}
+    errors = ConfigValidation.validate_many(merged, tree_schema)
+    assert set(errors) == {'memApp'}
+
+
+def test_invalid_schema_raises_config_exception():
+    with pytest.raises(ConfigException):
+        ConfigValidation.get_validator({'port': {'type': 'no-such-type'}})